@@ -0,0 +1,71 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+
+# Measures scene sync time of final render with INFO and DEBUG log levels.
+# Usage: blender -b <scene.blend> --python cmd_tools/benchmark_logging.py -- [renders count]
+
+import sys
+import time
+import statistics
+from pathlib import Path
+
+import bpy
+
+addon_script_path = Path(__file__).parent.parent/'src/tools/load_addon.py'
+
+filepath = str(addon_script_path)
+global_namespace = {"__file__": filepath, "__name__": "__main__"}
+with open(filepath, 'rb') as file:
+    exec(compile(file.read(), filepath, 'exec'), global_namespace)
+
+from rprblender.engine.render_engine import RenderEngine
+
+
+args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+renders_count = int(args[0]) if args else 5
+
+sync_times = []
+engine_sync = RenderEngine.sync
+
+
+def timed_sync(self, depsgraph):
+    time_begin = time.perf_counter()
+    engine_sync(self, depsgraph)
+    sync_times.append(time.perf_counter() - time_begin)
+
+
+RenderEngine.sync = timed_sync
+
+scene = bpy.context.scene
+scene.render.engine = 'RPR'
+scene.rpr.limits.min_samples = 1
+scene.rpr.limits.max_samples = 1
+
+results = {}
+for level in ('INFO', 'DEBUG'):
+    scene.rpr.log_min_level = level
+
+    sync_times.clear()
+    for _ in range(renders_count):
+        bpy.ops.render.render()
+
+    results[level] = statistics.median(sync_times)
+
+RenderEngine.sync = engine_sync
+
+for level, sync_time in results.items():
+    print(f"Log level {level}: median sync time {sync_time:.3f} sec ({renders_count} renders)")
+
+print(f"DEBUG logging overhead: {(results['DEBUG'] / results['INFO'] - 1.0) * 100:.1f}%")
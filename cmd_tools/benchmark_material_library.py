@@ -0,0 +1,58 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+
+# Measures bulk import throughput of material library materials.
+# The first import parses xml files and copies textures, the next one reuses parsed xml cache.
+# Usage: blender -b --python cmd_tools/benchmark_material_library.py -- [materials count] [--copy-textures]
+
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+addon_script_path = Path(__file__).parent.parent/'src/tools/load_addon.py'
+
+filepath = str(addon_script_path)
+global_namespace = {"__file__": filepath, "__name__": "__main__"}
+with open(filepath, 'rb') as file:
+    exec(compile(file.read(), filepath, 'exec'), global_namespace)
+
+from rprblender import material_library
+
+
+args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+materials_count = int(args[0]) if args and args[0].isdigit() else 50
+copy_textures = '--copy-textures' in args
+
+library = material_library.rpr_material_library
+if not library or not library.is_valid:
+    print("Material library isn't found")
+    sys.exit(1)
+
+# materials are created in the slot of active object
+bpy.ops.mesh.primitive_cube_add()
+
+entries = list(library.materials.values())[:materials_count]
+materials_info = [(None, entry.name, str(Path(library.path, entry.file_name, entry.file_name + ".xml")))
+                  for entry in entries]
+
+for title in ("First import", "Cached xml import"):
+    time_begin = time.perf_counter()
+    materials = material_library.import_xml_materials(materials_info, copy_textures)
+    import_time = time.perf_counter() - time_begin
+
+    print(f"{title}: {len(materials)} materials in {import_time:.3f} sec, "
+          f"{len(materials) / max(import_time, 1e-6):.1f} materials/sec")
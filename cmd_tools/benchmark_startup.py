@@ -0,0 +1,68 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+
+# Measures addon import and registration time in background Blender.
+# Fails with exit code 1 if median registration time exceeds the budget.
+# Usage: python cmd_tools/benchmark_startup.py <blender executable> [runs count] [budget in sec]
+
+import sys
+import subprocess
+import statistics
+import time
+from pathlib import Path
+
+
+STARTUP_TIME_BUDGET = 3.0   # seconds
+
+src_dir = Path(__file__).parent.parent / 'src'
+
+blender_exe = sys.argv[1]
+runs_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+budget = float(sys.argv[3]) if len(sys.argv) > 3 else STARTUP_TIME_BUDGET
+
+python_expr = f"""
+import sys, time
+sys.path.append({str(src_dir)!r})
+time_begin = time.perf_counter()
+import rprblender
+rprblender.register()
+print('RPR_STARTUP_TIME', time.perf_counter() - time_begin)
+print('RPR_ENGINE_MODULES', len([m for m in sys.modules if m.startswith('rprblender.engine.')]))
+"""
+
+startup_times = []
+process_times = []
+for i in range(runs_count):
+    time_begin = time.perf_counter()
+    output = subprocess.run(
+        [blender_exe, '-b', '--factory-startup', '-noaudio', '--python-exit-code', '1',
+         '--python-expr', python_expr],
+        check=True, capture_output=True, text=True
+    ).stdout
+    process_times.append(time.perf_counter() - time_begin)
+
+    values = dict(line.split() for line in output.splitlines() if line.startswith('RPR_'))
+    startup_times.append(float(values['RPR_STARTUP_TIME']))
+    print(f"Run {i + 1}: addon registration {startup_times[-1]:.3f} sec, "
+          f"Blender process {process_times[-1]:.3f} sec, "
+          f"loaded engine modules: {values['RPR_ENGINE_MODULES']}")
+
+startup_time = statistics.median(startup_times)
+print(f"Median addon registration time {startup_time:.3f} sec, "
+      f"Blender process {statistics.median(process_times):.3f} sec ({runs_count} runs)")
+
+if startup_time > budget:
+    print(f"FAILED: registration time exceeds budget {budget:.3f} sec")
+    sys.exit(1)
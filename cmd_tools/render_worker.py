@@ -0,0 +1,151 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+
+# Long running batch render worker. Blender is started and addon is registered once for all jobs.
+# Every render creates its own core context, so render settings of previous job don't affect next jobs.
+#
+# Usage: blender -b --python cmd_tools/render_worker.py -- <queue dir> [--once]
+#
+# Jobs are JSON files put to <queue dir>:
+#   {
+#       "blend_file": "/path/scene.blend",
+#       "scene": "Scene",                           (optional, active scene by default)
+#       "frame_start": 1, "frame_end": 10,          (optional, current frame by default)
+#       "frame_step": 1,                            (optional)
+#       "output": "/path/render/frame_####",        (optional, scene output path by default)
+#       "overrides": {"rpr.limits.max_samples": 64, "render.resolution_x": 1280}   (scene data paths)
+#   }
+# Worker takes jobs in name order, renames job file to <name>.running while rendering and then to
+# <name>.done or <name>.failed, job timings are written to <name>.result.json.
+# Worker stops when <queue dir>/stop file appears, with --once it stops when queue is empty.
+
+import sys
+import json
+import time
+import traceback
+from pathlib import Path
+
+import bpy
+
+addon_script_path = Path(__file__).parent.parent/'src/tools/load_addon.py'
+
+filepath = str(addon_script_path)
+global_namespace = {"__file__": filepath, "__name__": "__main__"}
+with open(filepath, 'rb') as file:
+    exec(compile(file.read(), filepath, 'exec'), global_namespace)
+
+
+POLL_INTERVAL = 1.0     # seconds
+
+
+def set_override(scene, data_path, value):
+    """ Sets scene property by data path relative to scene, like 'rpr.limits.max_samples' """
+    owner_path, _, prop_name = data_path.rpartition('.')
+    owner = scene.path_resolve(owner_path) if owner_path else scene
+    setattr(owner, prop_name, value)
+
+
+def render_job(job: dict):
+    """ Renders job frames, returns job timings """
+    timings = {}
+
+    time_begin = time.perf_counter()
+    bpy.ops.wm.open_mainfile(filepath=job['blend_file'])
+    scene = bpy.data.scenes[job['scene']] if 'scene' in job else bpy.context.scene
+    if bpy.context.window:
+        bpy.context.window.scene = scene
+    timings['load'] = time.perf_counter() - time_begin
+
+    scene.render.engine = 'RPR'
+    for data_path, value in job.get('overrides', {}).items():
+        set_override(scene, data_path, value)
+
+    if 'output' in job:
+        scene.render.filepath = job['output']
+
+    scene.frame_start = job.get('frame_start', scene.frame_current)
+    scene.frame_end = job.get('frame_end', scene.frame_start)
+    scene.frame_step = job.get('frame_step', 1)
+
+    frame_times = {}
+    frame_begin = None
+
+    def on_render_pre(scene, *args):
+        nonlocal frame_begin
+        frame_begin = time.perf_counter()
+
+    def on_render_post(scene, *args):
+        frame_times[scene.frame_current] = time.perf_counter() - frame_begin
+
+    bpy.app.handlers.render_pre.append(on_render_pre)
+    bpy.app.handlers.render_post.append(on_render_post)
+    try:
+        time_begin = time.perf_counter()
+        bpy.ops.render.render(animation=True, scene=scene.name)
+        timings['render'] = time.perf_counter() - time_begin
+
+    finally:
+        bpy.app.handlers.render_pre.remove(on_render_pre)
+        bpy.app.handlers.render_post.remove(on_render_post)
+
+    timings['frames'] = frame_times
+    return timings
+
+
+def run(queue_dir: Path, once: bool):
+    while not (queue_dir / 'stop').exists():
+        job_file = next((f for f in sorted(queue_dir.glob('*.json'))
+                         if not f.name.endswith('.result.json')), None)
+
+        if not job_file:
+            if once:
+                break
+
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        # claiming job, rename fails if job was taken by other worker
+        running_file = job_file.with_suffix('.running')
+        try:
+            job_file.rename(running_file)
+        except OSError:
+            continue
+
+        print(f"Render worker: starting job {job_file.name}")
+        result = {'job': job_file.name}
+        time_begin = time.perf_counter()
+        try:
+            job = json.loads(running_file.read_text())
+            result['timings'] = render_job(job)
+            result['status'] = 'done'
+
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+            traceback.print_exc()
+
+        result['total'] = time.perf_counter() - time_begin
+
+        job_file.with_suffix('.result.json').write_text(json.dumps(result, indent=4))
+        running_file.rename(job_file.with_suffix(f".{result['status']}"))
+        print(f"Render worker: job {job_file.name} {result['status']} in {result['total']:.3f} sec")
+
+
+args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+if not args:
+    print("Usage: blender -b --python cmd_tools/render_worker.py -- <queue dir> [--once]")
+    sys.exit(1)
+
+run(Path(args[0]), '--once' in args[1:])
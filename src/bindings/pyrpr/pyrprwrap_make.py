@@ -52,6 +52,9 @@ def print_function_header(name, args_names, args_defaults, doc):
 
 print()
 print()
+print('# set by pyrpr.init(), raises CoreError for non-SUCCESS status returned by functions checked inline')
+print('_raise_core_error = None')
+print()
 
 constants_names = []
 
@@ -79,7 +82,11 @@ for name, t in api.types.items():
 
 print('_types_names =', repr(types_names))
 
+# functions which status shouldn't raise CoreError
+UNCHECKED_FUNCTIONS = ('RegisterPlugin',)
+
 functions_names = []
+checked_functions_names = []
 
 for name, t in api.functions.items():
     # print(name, [(arg.name, arg.type) for arg in t.args])
@@ -147,13 +154,22 @@ for name, t in api.functions.items():
             functions_names.append(n)
             print_function_header(n, args_names, args_defaults, t.docs if t.docs else api.functions[name].docs)
             if any(replace_args):
-                print('    return lib.' + name + '(' + ', '.join(
-                    get_arg(arg, replaced) for arg, replaced in zip(args_names, replace_args)) + ')')
-                print()
+                call_args = ', '.join(get_arg(arg, replaced) for arg, replaced in zip(args_names, replace_args))
             else:
                 # functions with dummy wrapper(so that we have intellisense
                 print(n, file=sys.stderr)
-                print('    return lib.' + name + '(' + ', '.join(args_names) + ')')
-                print()
+                call_args = ', '.join(args_names)
+
+            if n not in UNCHECKED_FUNCTIONS:
+                # status is checked right here instead of wrapping function once more in pyrpr.init()
+                checked_functions_names.append(n)
+                print('    status = lib.' + name + '(' + call_args + ')')
+                print('    if status != SUCCESS:')
+                print('        _raise_core_error(status, ' + repr(n) + ', (' + ''.join(a + ', ' for a in args_names) + '))')
+                print('    return status')
+            else:
+                print('    return lib.' + name + '(' + call_args + ')')
+            print()
 
 print('_functions_names =', repr(functions_names))
+print('_checked_functions_names =', repr(checked_functions_names))
@@ -271,6 +271,9 @@ class Curve:
     def set_name(self, name):
         self.name = name
 
+    def apply_name(self):
+        pass
+
 
 class HeteroVolume:
     def __init__(self, context):
@@ -288,6 +291,9 @@ class HeteroVolume:
     def set_name(self, name):
         self.name = name
 
+    def apply_name(self):
+        pass
+
 
 class Grid(pyrpr.HeteroVolume):
     def __init__(self, context):
@@ -313,6 +313,9 @@ class HeteroVolume:
     def set_name(self, name):
         self.name = name
 
+    def apply_name(self):
+        pass
+
 
 class Grid(pyrpr.HeteroVolume):
     def __init__(self, context):
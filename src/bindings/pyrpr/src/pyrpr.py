@@ -19,6 +19,8 @@ import ctypes
 import time
 import functools
 import sys
+import json
+import threading
 import numpy as np
 from typing import List
 
@@ -74,6 +76,10 @@ def wrap_core_check_success(f, module_name):
     return wrapped
 
 
+def raise_core_error(status, func_name, argv):
+    raise CoreError(status, func_name, argv, 'RPR')
+
+
 def wrap_core_log_call(f, log_fun, module_name):
     signature = inspect.signature(f)
 
@@ -88,15 +94,148 @@ def wrap_core_log_call(f, log_fun, module_name):
     return wrapped
 
 
+# parameters pairs of items count and item stride in bytes
+PROFILE_COUNT_STRIDE_PARAMS = (
+    ('num_vertices', 'vertex_stride'),
+    ('num_normals', 'normal_stride'),
+    ('num_texcoords', 'texcoord_stride'),
+    ('num_controlPoints', 'controlPointsStrideInBytes'),
+)
+
+
+def _get_args_bytes_func(signature):
+    """ Return function calculating bytes passed by buffer arguments of core call, None if there is no buffers """
+    names = tuple(signature.parameters)
+    getters = []
+
+    for i, name in enumerate(names):
+        if name.endswith('SizeByte'):
+            getters.append(lambda argv, i=i: argv[i])
+        elif name == 'image_desc':
+            getters.append(lambda argv, i=i: argv[i].image_row_pitch * max(argv[i].image_height, 1) *
+                                             max(argv[i].image_depth, 1))
+        elif name == 'buffer_desc':
+            getters.append(lambda argv, i=i: argv[i].nb_element * argv[i].element_channel_size * 4)
+
+    for count_name, stride_name in PROFILE_COUNT_STRIDE_PARAMS:
+        if count_name in names and stride_name in names:
+            getters.append(lambda argv, i=names.index(count_name), j=names.index(stride_name): argv[i] * argv[j])
+
+    if not getters:
+        return None
+
+    def args_bytes(argv):
+        try:
+            return sum(getter(argv) for getter in getters)
+        except (IndexError, TypeError, AttributeError):
+            return 0
+
+    return args_bytes
+
+
+class CallProfiler:
+    """
+    Collects per function core calls count, total and max time and bytes passed by buffer arguments
+    in preallocated counters. Optionally records calls timeline for Chrome trace export
+    """
+
+    def __init__(self, names, trace_max_events=0):
+        self.names = tuple(names)
+        self.trace_max_events = trace_max_events
+
+        size = len(self.names)
+        self.counts = [0] * size
+        self.total_times = [0.0] * size
+        self.max_times = [0.0] * size
+        self.bytes = [0] * size
+
+        self.trace = []     # (function index, begin time, duration, thread id)
+        self.time_begin = time.perf_counter()
+
+    def reset(self):
+        """ Reset counters in place, wrapped functions keep references to them """
+        size = len(self.names)
+        self.counts[:] = [0] * size
+        self.total_times[:] = [0.0] * size
+        self.max_times[:] = [0.0] * size
+        self.bytes[:] = [0] * size
+
+        self.trace.clear()
+        self.time_begin = time.perf_counter()
+
+    def wrap(self, f, index):
+        counts, total_times, max_times, bytes_counts = self.counts, self.total_times, self.max_times, self.bytes
+        trace, trace_max_events = self.trace, self.trace_max_events
+        args_bytes = _get_args_bytes_func(inspect.signature(f))
+        perf_counter, get_ident = time.perf_counter, threading.get_ident
+
+        @functools.wraps(f)
+        def wrapped(*argv):
+            time_begin = perf_counter()
+            result = f(*argv)
+            duration = perf_counter() - time_begin
+
+            counts[index] += 1
+            total_times[index] += duration
+            if duration > max_times[index]:
+                max_times[index] = duration
+            if args_bytes:
+                bytes_counts[index] += args_bytes(argv)
+            if len(trace) < trace_max_events:
+                trace.append((index, time_begin, duration, get_ident()))
+
+            return result
+
+        return wrapped
+
+    def report(self, title="", max_lines=30) -> str:
+        """ Return report of called functions sorted by total time """
+        indices = sorted((i for i, count in enumerate(self.counts) if count),
+                         key=lambda i: self.total_times[i], reverse=True)
+
+        lines = [f"Core calls profile {title}: {sum(self.counts)} calls, "
+                 f"{sum(self.total_times) * 1000:.1f} ms, {sum(self.bytes) / 1024 ** 2:.1f} MB",
+                 f"{'function':<40} {'calls':>10} {'total ms':>10} {'avg us':>10} {'max ms':>10} {'MB':>10}"]
+        for i in indices[:max_lines]:
+            lines.append(f"{self.names[i]:<40} {self.counts[i]:>10} {self.total_times[i] * 1000:>10.2f} "
+                         f"{self.total_times[i] / self.counts[i] * 1e6:>10.1f} {self.max_times[i] * 1000:>10.2f} "
+                         f"{self.bytes[i] / 1024 ** 2:>10.2f}")
+
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, file_path):
+        """ Save recorded calls timeline in Chrome trace format, it could be opened in chrome://tracing """
+        events = [{
+            'name': self.names[index],
+            'cat': 'core',
+            'ph': 'X',
+            'ts': (time_begin - self.time_begin) * 1e6,
+            'dur': duration * 1e6,
+            'pid': 0,
+            'tid': thread_id,
+        } for index, time_begin, duration, thread_id in self.trace]
+
+        with open(file_path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
 class _init_data:
     log_fun = None
     lib_wrapped_log_calls = False
 
 
-def init(lib_dir, log_fun, lib_wrapped_log_calls):
+# core calls profiler, created by init() if calls profiling is enabled
+profiler = None
+
+
+def init(lib_dir, log_fun, lib_wrapped_log_calls, profile_calls=False, profile_trace_max_events=0):
     _init_data.log_fun = log_fun
     _init_data.lib_wrapped_log_calls = lib_wrapped_log_calls
 
+    global profiler
+    if profile_calls:
+        profiler = CallProfiler(pyrprwrap._functions_names, profile_trace_max_events)
+
     lib_name = {
         'Windows': "RadeonProRender64.dll",
         'Linux': "libRadeonProRender64.so",
@@ -119,15 +258,22 @@ def init(lib_dir, log_fun, lib_wrapped_log_calls):
 
     for name in pyrprwrap._constants_names:
         setattr(_module, name, getattr(pyrprwrap, name))
-    
-    for name in pyrprwrap._functions_names:
+
+    # generated functions check returned status themselves, bindings generated by older
+    # pyrprwrap_make.py don't have it and are wrapped with wrap_core_check_success() below
+    pyrprwrap._raise_core_error = raise_core_error
+    checked_names = set(getattr(pyrprwrap, '_checked_functions_names', ()))
+
+    for index, name in enumerate(pyrprwrap._functions_names):
     
         wrapped = getattr(pyrprwrap, name)
-        # wrap all functions here(for more flexilibity) to log call, if enabled
+        # wrap functions here(for more flexilibity) to log call and profile it, if enabled
         # and to assert that SUCCESS is returned from them
+        if profiler:
+            wrapped = profiler.wrap(wrapped, index)
         if lib_wrapped_log_calls:
             wrapped = wrap_core_log_call(wrapped, log_fun, 'RPR')
-        if wrapped.__name__ != 'RegisterPlugin':
+        if name not in checked_names and wrapped.__name__ != 'RegisterPlugin':
             wrapped = wrap_core_check_success(wrapped, 'RPR')
         setattr(_module, name, wrapped)
 
@@ -182,9 +328,20 @@ class Object:
         return self._handle_ptr[0]
 
     def set_name(self, name):
-        ObjectSetName(self._get_handle(), encode(name))
+        """
+        Sets object name, name could be any object converted to str when it is set to core.
+        If object context has lazy_names then name is set to core only by apply_name()
+        """
         self.name = name
 
+        context = getattr(self, 'context', None)
+        if context is None or not context.lazy_names:
+            self.apply_name()
+
+    def apply_name(self):
+        if self.name is not None:
+            ObjectSetName(self._get_handle(), encode(str(self.name)))
+
 
 class Context(Object):
     ''' Context wraps the rpr_context type with useful methods '''
@@ -192,6 +349,9 @@ class Context(Object):
 
     plugin_id = -1
     cache_path = None
+
+    # if True names of context objects aren't set to core by Object.set_name()
+    lazy_names = False
     cpu_device = None
     gpu_devices = []
 
@@ -331,6 +491,17 @@ class Context(Object):
         ContextGetInfo(self, context_info, sys.getsizeof(val), val, ffi.NULL)
         return val[0]
 
+    def get_render_statistics(self):
+        """ Returns dict of core memory usage statistics in bytes """
+        stats = ffi.new('rpr_render_statistics *')
+        ContextGetInfo(self, CONTEXT_RENDER_STATISTICS, ffi.sizeof('rpr_render_statistics'), stats, ffi.NULL)
+        return {
+            'gpumem_usage': stats.gpumem_usage,
+            'gpumem_total': stats.gpumem_total,
+            'gpumem_max_allocation': stats.gpumem_max_allocation,
+            'sysmem_usage': stats.sysmem_usage,
+        }
+
 
 class Scene(Object):
     core_type_name = 'rpr_scene'
@@ -366,6 +537,22 @@ class Scene(Object):
 
         self.objects.add(obj)
 
+    def attach_shapes(self, shapes):
+        """ Attaches list of shapes, faster than calling attach() for each of them """
+        if _is_fast_batch_call():
+            attach_shape = pyrprwrap.lib.rprSceneAttachShape
+            scene_handle = self._get_handle()
+            for shape in shapes:
+                status = attach_shape(scene_handle, shape._get_handle())
+                if status != SUCCESS:
+                    raise_core_error(status, 'SceneAttachShape', (self, shape))
+
+        else:
+            for shape in shapes:
+                SceneAttachShape(self, shape)
+
+        self.objects.update(shapes)
+
     def detach(self, obj):
         if isinstance(obj, Shape):
             SceneDetachShape(self, obj)
@@ -428,6 +615,21 @@ class Scene(Object):
         del self.environment_overrides[core_id]
 
 
+# visibility types used by Shape.set_visibility_ex()
+SHAPE_VISIBILITY_FLAGS = {
+    "visible.light": SHAPE_VISIBILITY_LIGHT,
+    "visible.refraction.glossy": SHAPE_VISIBILITY_GLOSSY_REFRACTION,
+    "visible.reflection.glossy": SHAPE_VISIBILITY_GLOSSY_REFLECTION,
+    "visible.diffuse": SHAPE_VISIBILITY_DIFFUSE,
+    "visible.transparent": SHAPE_VISIBILITY_TRANSPARENT,
+    "visible.refraction": SHAPE_VISIBILITY_REFRACTION,
+    "visible.reflection": SHAPE_VISIBILITY_REFLECTION,
+    "visible.shadow": SHAPE_VISIBILITY_SHADOW,
+    "visible.receive_shadow": SHAPE_VISIBILITY_RECEIVE_SHADOW,
+    "visible.primary": SHAPE_VISIBILITY_PRIMARY_ONLY_FLAG,
+}
+
+
 class Shape(Object):
     core_type_name = 'rpr_shape'
 
@@ -512,19 +714,7 @@ class Shape(Object):
         ShapeSetVisibility(self, visible)
 
     def set_visibility_ex(self, visibility_type, visible):
-        flags = {
-            "visible.light": SHAPE_VISIBILITY_LIGHT,
-            "visible.refraction.glossy": SHAPE_VISIBILITY_GLOSSY_REFRACTION,
-            "visible.reflection.glossy": SHAPE_VISIBILITY_GLOSSY_REFLECTION,
-            "visible.diffuse": SHAPE_VISIBILITY_DIFFUSE,
-            "visible.transparent": SHAPE_VISIBILITY_TRANSPARENT,
-            "visible.refraction": SHAPE_VISIBILITY_REFRACTION,
-            "visible.reflection": SHAPE_VISIBILITY_REFLECTION,
-            "visible.shadow": SHAPE_VISIBILITY_SHADOW,
-            "visible.receive_shadow": SHAPE_VISIBILITY_RECEIVE_SHADOW,
-            "visible.primary": SHAPE_VISIBILITY_PRIMARY_ONLY_FLAG,
-            }
-        ShapeSetVisibilityFlag(self, flags[visibility_type], visible)
+        ShapeSetVisibilityFlag(self, SHAPE_VISIBILITY_FLAGS[visibility_type], visible)
 
     def set_visibility_in_specular(self, visible):
         ShapeSetVisibilityInSpecular(self, visible)
@@ -575,6 +765,45 @@ class Shape(Object):
         ShapeSetContourIgnore(self, ignore_in_contour)
 
 
+def _is_fast_batch_call():
+    """ Batched calls go to lib directly unless core calls are logged or profiled """
+    return not (profiler or _init_data.lib_wrapped_log_calls)
+
+
+def shapes_set_transform(shapes, transforms: np.array, transpose=True): # Blender needs matrix to be transposed
+    """ Sets transforms of shapes, transforms is (len(shapes), 4, 4) array """
+    transforms = np.ascontiguousarray(transforms, dtype=np.float32).reshape(-1, 16)
+    if len(transforms) != len(shapes):
+        raise ValueError("Transforms count doesn't match shapes count", len(transforms), len(shapes))
+
+    transforms_ptr = ffi.cast('float*', transforms.ctypes.data)
+    if _is_fast_batch_call():
+        set_transform = pyrprwrap.lib.rprShapeSetTransform
+        for i, shape in enumerate(shapes):
+            status = set_transform(shape._get_handle(), transpose, transforms_ptr + i * 16)
+            if status != SUCCESS:
+                raise_core_error(status, 'ShapeSetTransform', (shape, transpose, transforms[i]))
+
+    else:
+        for i, shape in enumerate(shapes):
+            ShapeSetTransform(shape, transpose, transforms_ptr + i * 16)
+
+
+def shapes_set_visibility_flag(shapes, visibility_flag, visible):
+    """ Sets visibility flag of shapes, visible is bool or array of bools per shape """
+    visible = np.broadcast_to(np.asarray(visible, dtype=bool), (len(shapes),)).tolist()
+    if _is_fast_batch_call():
+        set_visibility_flag = pyrprwrap.lib.rprShapeSetVisibilityFlag
+        for shape, shape_visible in zip(shapes, visible):
+            status = set_visibility_flag(shape._get_handle(), visibility_flag, shape_visible)
+            if status != SUCCESS:
+                raise_core_error(status, 'ShapeSetVisibilityFlag', (shape, visibility_flag, shape_visible))
+
+    else:
+        for shape, shape_visible in zip(shapes, visible):
+            ShapeSetVisibilityFlag(shape, visibility_flag, shape_visible)
+
+
 class Curve(Object):
     core_type_name = 'rpr_curve'
 
@@ -669,6 +898,8 @@ class Mesh(Shape):
         super().__init__(context)
 
         self.poly_count = 0 if vertices is None else len(num_face_vertices) 
+        # every polygon of n vertices is rendered as n - 2 triangles
+        self.triangle_count = 0 if vertices is None else len(vertex_indices) - 2 * self.poly_count
 
         mesh_info_ptr = ffi.NULL
         if mesh_info:
@@ -1287,6 +1518,9 @@ class AreaLight(Light):
         self.name = name
         self.mesh.set_name(name)
 
+    def apply_name(self):
+        self.mesh.apply_name()
+
     def set_radiant_power(self, r, g, b):
         self.color_node.set_input(MATERIAL_INPUT_COLOR0, (r, g, b))
 
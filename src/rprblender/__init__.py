@@ -13,6 +13,7 @@
 # limitations under the License.
 #********************************************************************
 import traceback
+import importlib
 
 import bpy
 
@@ -35,7 +36,6 @@ version_build = ""
 
 
 from .utils import logging, version_updater
-from .utils import install_libs
 
 from .engine.engine import Engine
 from . import (
@@ -46,49 +46,45 @@ from . import (
     material_library,
 )
 
-from .engine.render_engine import RenderEngine
-from .engine.render_engine_2 import RenderEngine2
-from .engine.preview_engine import PreviewEngine
-from .engine.viewport_engine import ViewportEngine
-from .engine.viewport_engine_2 import ViewportEngine2
-from .engine.animation_engine import AnimationEngine, AnimationEngine2
-
-from .engine.render_engine_hybrid import RenderEngine as RenderEngineHybrid
-from .engine.viewport_engine_hybrid import ViewportEngine as ViewportEngineHybrid
-from .engine.animation_engine_hybrid import AnimationEngine as AnimationEngineHybrid
-
-from .engine.render_engine_hybridpro import RenderEngine as RenderEngineHybridPro
-from .engine.viewport_engine_hybridpro import ViewportEngine as ViewportEngineHybridPro
-from .engine.animation_engine_hybridpro import AnimationEngine as AnimationEngineHybridPro
-
 log = logging.Log(tag='init')
 log("Loading RPR addon {}".format(bl_info['version']))
 
 
+# Engine classes are set as '<module>.<class>' of rprblender.engine package and imported on first use
+# by get_engine_cls(), so addon registration doesn't load engine modules of all render modes.
+# Core libraries are still loaded at registration by rprblender.engine package and render contexts imports
 render_engine_cls = {
-    'FULL': RenderEngine,
-    'HIGH': RenderEngineHybrid,
-    'MEDIUM': RenderEngineHybrid,
-    'LOW': RenderEngineHybrid,
-    'FULL2': RenderEngine2,
-    'HYBRIDPRO': RenderEngineHybridPro,
+    'FULL': 'render_engine.RenderEngine',
+    'HIGH': 'render_engine_hybrid.RenderEngine',
+    'MEDIUM': 'render_engine_hybrid.RenderEngine',
+    'LOW': 'render_engine_hybrid.RenderEngine',
+    'FULL2': 'render_engine_2.RenderEngine2',
+    'HYBRIDPRO': 'render_engine_hybridpro.RenderEngine',
 }
 animation_engine_cls = {
-    'FULL': AnimationEngine,
-    'HIGH': AnimationEngineHybrid,
-    'MEDIUM': AnimationEngineHybrid,
-    'LOW': AnimationEngineHybrid,
-    'FULL2': AnimationEngine2,
-    'HYBRIDPRO': AnimationEngineHybridPro,
+    'FULL': 'animation_engine.AnimationEngine',
+    'HIGH': 'animation_engine_hybrid.AnimationEngine',
+    'MEDIUM': 'animation_engine_hybrid.AnimationEngine',
+    'LOW': 'animation_engine_hybrid.AnimationEngine',
+    'FULL2': 'animation_engine.AnimationEngine2',
+    'HYBRIDPRO': 'animation_engine_hybridpro.AnimationEngine',
 }
 viewport_engine_cls = {
-    'FULL': ViewportEngine,
-    'HIGH': ViewportEngineHybrid,
-    'MEDIUM': ViewportEngineHybrid,
-    'LOW': ViewportEngineHybrid,
-    'FULL2': ViewportEngine2,
-    'HYBRIDPRO': ViewportEngineHybridPro,
+    'FULL': 'viewport_engine.ViewportEngine',
+    'HIGH': 'viewport_engine_hybrid.ViewportEngine',
+    'MEDIUM': 'viewport_engine_hybrid.ViewportEngine',
+    'LOW': 'viewport_engine_hybrid.ViewportEngine',
+    'FULL2': 'viewport_engine_2.ViewportEngine2',
+    'HYBRIDPRO': 'viewport_engine_hybridpro.ViewportEngine',
 }
+preview_engine_cls = 'preview_engine.PreviewEngine'
+
+
+def get_engine_cls(cls_path: str):
+    """ Returns engine class by its '<module>.<class>' path, engine module is imported on first call """
+    module_name, cls_name = cls_path.rsplit('.', 1)
+    module = importlib.import_module(f'.engine.{module_name}', __name__)
+    return getattr(module, cls_name)
 
 
 class RPREngine(bpy.types.RenderEngine):
@@ -105,7 +101,7 @@ class RPREngine(bpy.types.RenderEngine):
     engine: Engine = None
 
     def __del__(self):
-        if isinstance(self.engine, ViewportEngine):
+        if self.engine and self.engine.TYPE == 'VIEWPORT':
             self.engine.stop_render()
 
         log('__del__', self.as_pointer())
@@ -116,16 +112,27 @@ class RPREngine(bpy.types.RenderEngine):
         """ Called for final render """
         log('update', self.as_pointer())
 
-        # TODO: We create for every view layer separate Engine. We should improve this by implementing sync_update()
         try:
             if self.is_preview:
-                engine_cls = PreviewEngine
+                engine_cls = get_engine_cls(preview_engine_cls)
 
             elif self.is_animation:
-                engine_cls = animation_engine_cls[depsgraph.scene.rpr.final_render_mode]
+                engine_cls = get_engine_cls(animation_engine_cls[depsgraph.scene.rpr.final_render_mode])
+
+                # with persistent data engine of the previous frame syncs only depsgraph updates
+                if type(self.engine) == engine_cls and hasattr(self.engine, 'can_sync_update') \
+                        and self.engine.can_sync_update(depsgraph):
+                    self.engine.sync_update(depsgraph)
+                    return
 
             else:
-                engine_cls = render_engine_cls[depsgraph.scene.rpr.final_render_mode]
+                engine_cls = get_engine_cls(render_engine_cls[depsgraph.scene.rpr.final_render_mode])
+
+            # next view layer of the same frame reuses scene synced for the previous view layer
+            if type(self.engine) == engine_cls and hasattr(self.engine, 'can_sync_view_layer') \
+                    and self.engine.can_sync_view_layer(depsgraph):
+                self.engine.sync_view_layer(depsgraph)
+                return
 
             self.engine = engine_cls(self)
             self.engine.sync(depsgraph)
@@ -155,7 +162,7 @@ class RPREngine(bpy.types.RenderEngine):
 
         try:
             # if there is no engine set, create it and do the initial sync
-            engine_cls = viewport_engine_cls[depsgraph.scene.rpr.viewport_render_mode]
+            engine_cls = get_engine_cls(viewport_engine_cls[depsgraph.scene.rpr.viewport_render_mode])
 
             if self.engine and type(self.engine) == engine_cls:
                 self.engine.sync_update(context, depsgraph)
@@ -252,8 +259,8 @@ def on_load_pre(*args, **kwargs):
 
 def register():
     """ Register all addon classes in Blender """
+    logging.start_file_log()
     log("register")
-    install_libs.ensure_boto3()
 
     bpy.utils.register_class(RPREngine)
     material_library.register()
@@ -281,3 +288,5 @@ def unregister():
     properties.unregister()
     material_library.unregister()
     bpy.utils.unregister_class(RPREngine)
+
+    logging.stop_file_log()
@@ -17,6 +17,8 @@ from .utils import logging
 logging.limit_log('', level_show_min=logging.INFO)
 
 pyrpr_log_calls = False
+pyrpr_profile_calls = False     # collect core calls statistics, report is logged after sync and render
+pyrpr_profile_trace_events = 0  # max core calls to record for Chrome trace export, 0 - disabled
 pyrprimagefilters_log_calls = False
 pyrprgltf_log_calls = False
 hybrid_unsupported_log_warn = False
@@ -40,6 +42,9 @@ try:
     # from . import config
     # # log all core calls
     # config.pyrpr_log_calls = True
+    # # profile core calls and save timeline of first 100000 calls
+    # config.pyrpr_profile_calls = True
+    # config.pyrpr_profile_trace_events = 100000
 
     from . import configdev
     logging.info('loaded configdev', tag='')
@@ -52,7 +52,8 @@ import pyhybrid
 import pyhybridpro
 import pyrpr2
 
-pyrpr.init(rpr_lib_dir, logging.Log(tag='core'), config.pyrpr_log_calls)
+pyrpr.init(rpr_lib_dir, logging.Log(tag='core'), config.pyrpr_log_calls,
+           config.pyrpr_profile_calls, config.pyrpr_profile_trace_events)
 log.info("Core version:", utils.core_ver_str(full=True))
 
 import pyrpr_load_store
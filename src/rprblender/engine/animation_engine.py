@@ -12,13 +12,423 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #********************************************************************
+import time
+
+import bpy
+import pyrpr
+
+from .engine import ITERATED_OBJECT_TYPES
 from .render_engine import RenderEngine
 from .render_engine_2 import RenderEngine2
+from .context import RPRContext2
+from rprblender.export import camera, instance, material, object, volume, world
+from rprblender.utils import BLENDER_VERSION
+
+from rprblender.utils import logging
+log = logging.Log(tag='AnimationEngine')
 
 
 class AnimationEngine(RenderEngine):
-    pass
+    """
+    Final animation render engine. With scene persistent data RPREngine keeps the engine between frames,
+    then next frame syncs only depsgraph updates to existing RPR context by sync_update()
+    """
+
+    # Rolling window of motion blur data of synced frames of current animation render:
+    # {(scene name, view layer name, frame, subframe): (transform_cache, deformation_cache)}.
+    # Data of one frame is reused by the next one, it is kept in class
+    # because RPREngine creates engine again for every frame without persistent data
+    _blur_frames = {}
+
+    # Cryptomatte manifests of current animation render, they are updated incrementally between frames:
+    # {(scene name, view layer name): (object manifest, material manifest)}
+    _cryptomatte_manifests = {}
+
+    def __init__(self, rpr_engine):
+        super().__init__(rpr_engine)
+
+        self.is_last_frame = False
+        self.is_persistent = False
+        self.full_sync_time = None
+        self.world_data = None
+        self.frame_dependent_materials = None
+
+    def sync(self, depsgraph):
+        scene = depsgraph.scene
+        if scene.frame_current == scene.frame_start:
+            # new animation render, motion blur data and manifests of previous render could be outdated
+            self._blur_frames.clear()
+            self._cryptomatte_manifests.clear()
+
+        self.rpr_context.object_hashes, self.rpr_context.material_nodes_hashes = \
+            self._cryptomatte_manifests.setdefault(
+                (scene.name, depsgraph.view_layer.name),
+                (self.rpr_context.object_hashes, self.rpr_context.material_nodes_hashes))
+
+        super().sync(depsgraph)
+
+        self.is_last_frame = scene.frame_current + scene.frame_step > scene.frame_end
+        if self.is_synced and self.rpr_context.do_motion_blur:
+            self._update_blur_frames(depsgraph)
+
+        # motion blur, tiles and contour render are exported by full sync of every frame
+        self.is_persistent = self.is_synced and scene.render.use_persistent_data and \
+            not self.rpr_context.do_motion_blur and not scene.rpr.is_tile_render_available and \
+            not self.needs_contour_pass
+        if not self.is_persistent:
+            return
+
+        self.full_sync_time = self.sync_time
+        self.world_data = self._get_world_data(depsgraph)
+        self.frame_dependent_materials = None
+
+    @staticmethod
+    def _blur_frame_key(depsgraph, frame):
+        return (depsgraph.scene.name, depsgraph.view_layer.name, *frame)
+
+    def _get_next_blur_frames(self, scene):
+        """ Returns frames which motion blur data are needed for the next animation frame """
+        if scene.frame_current + scene.frame_step > scene.frame_end:
+            return ()
+
+        return tuple((frame + scene.frame_step, subframe) for frame, subframe in self.get_blur_frames(scene))
+
+    def cache_blur_data(self, depsgraph):
+        """
+        Caches motion blur data of the frame reusing data of the previous frame.
+        For START and CENTER positions shutter closing of previous frame is shutter opening of this frame,
+        its cached meshes are exported by mesh.sync() without data extraction.
+        For END position shutter opening of previous frame is shutter closing of this frame,
+        its data are reused without scene re-evaluation
+        """
+        scene = depsgraph.scene
+        from_frame, to_frame = self.get_blur_frames(scene)
+
+        blur_data = self._blur_frames.get(self._blur_frame_key(depsgraph, to_frame))
+        if blur_data:
+            log("Reusing motion blur data of frame", to_frame)
+            self.rpr_context.transform_cache = dict(blur_data[0])
+            self.rpr_context.deformation_cache = dict(blur_data[1])
+
+        else:
+            self._set_scene_frame(scene, *to_frame)
+            self._cache_frame_blur_data(depsgraph)
+            if to_frame in self._get_next_blur_frames(scene):
+                self._blur_frames[self._blur_frame_key(depsgraph, to_frame)] = \
+                    (dict(self.rpr_context.transform_cache), dict(self.rpr_context.deformation_cache))
+
+        self._set_scene_frame(scene, *from_frame)
+
+        # mesh data of exported frame are collected by mesh.sync(),
+        # meshes of frame cached as motion blur data of previous frame aren't extracted again
+        blur_data = self._blur_frames.get(self._blur_frame_key(depsgraph, from_frame))
+        self.rpr_context.mesh_data_cache = dict(blur_data[1]) if blur_data else {}
+
+    def _update_blur_frames(self, depsgraph):
+        """ Keeps motion blur data needed for the next frame and removes data of previous frames """
+        scene = depsgraph.scene
+        from_frame, _ = self.get_blur_frames(scene)
+        next_frames = self._get_next_blur_frames(scene)
+
+        if from_frame in next_frames and from_frame == (scene.frame_current, scene.frame_subframe):
+            self._blur_frames[self._blur_frame_key(depsgraph, from_frame)] = \
+                (self._get_frame_transforms(depsgraph), self.rpr_context.mesh_data_cache)
+
+        keys = tuple(self._blur_frame_key(depsgraph, frame) for frame in next_frames)
+        for key in tuple(self._blur_frames):
+            if key[:2] == (scene.name, depsgraph.view_layer.name) and key not in keys:
+                del self._blur_frames[key]
+
+    def _get_frame_transforms(self, depsgraph):
+        """
+        Returns transforms of current synced scene frame like they are cached by _cache_frame_blur_data(),
+        conditions of object.cache_blur_data() are repeated for every object type
+        """
+        is_rpr_context2 = isinstance(self.rpr_context, RPRContext2)
+
+        transforms = {}
+        for obj in self.depsgraph_objects(depsgraph, with_camera=True):
+            obj_key = object.key(obj)
+            if obj.type == 'CAMERA':
+                transforms[obj_key] = object.get_transform(obj)
+                continue
+
+            if obj.type not in ('MESH', 'CURVE', 'FONT', 'SURFACE', 'META') or not obj.rpr.motion_blur:
+                continue
+
+            # with deformation blur to_mesh.cache_blur_data() caches transform only if obj.to_mesh()
+            # returns mesh, then object is exported by to_mesh.sync() too
+            is_to_mesh = obj.type != 'MESH' or obj.mode != 'OBJECT'
+            if is_to_mesh and obj.rpr.deformation_blur and is_rpr_context2 and \
+                    obj_key not in self.rpr_context.objects:
+                continue
+
+            transforms[obj_key] = object.get_transform(obj)
+
+        for inst in self.depsgraph_instances(depsgraph):
+            if inst.parent.rpr.motion_blur:
+                transforms[instance.key(inst)] = instance.get_transform(inst)
+
+        return transforms
+
+    def _set_scene_frame(self, scene, frame, subframe=0.0):
+        # scene is already evaluated at this frame if motion blur data of previous frame were reused
+        if (scene.frame_current, scene.frame_subframe) == (frame, subframe):
+            return
+
+        super()._set_scene_frame(scene, frame, subframe)
+
+    def stop_render(self):
+        if self.is_last_frame or self.rpr_engine.test_break():
+            self._blur_frames.clear()
+            self._cryptomatte_manifests.clear()
+
+        super().stop_render()
+
+    @staticmethod
+    def _get_world_data(depsgraph):
+        scene = depsgraph.scene
+        if not scene.world:
+            return None
+
+        # for some reason World data can came in unevaluated
+        return world.WorldData.init_from_world(
+            scene.world if scene.world.is_evaluated else scene.world.evaluated_get(depsgraph))
+
+    def can_sync_update(self, depsgraph):
+        """ Checks if frame could be synced by sync_update() to RPR context of the previous frame """
+        if not self.is_persistent or not self.rpr_context:
+            return False
+
+        scene = depsgraph.scene
+        border, screen_width, screen_height = self._get_border_and_screen_size(scene)
+        return scene.render.use_persistent_data and scene.camera is not None and \
+            depsgraph.view_layer.name == self.render_layer_name and \
+            (self.width, self.height) == (int(screen_width * border[1][0]), int(screen_height * border[1][1]))
+
+    def sync_update(self, depsgraph):
+        """ Syncs depsgraph updates of the next animation frame """
+        log('Start sync_update')
+
+        self.is_synced = False
+        self.sync_time = time.perf_counter()
+
+        scene = depsgraph.scene
+        view_layer = depsgraph.view_layer
+        material_override = view_layer.material_override
+
+        self.frame_current = scene.frame_current
+        self.is_last_frame = scene.frame_current + scene.frame_step > scene.frame_end
+        self.status_title = f"{scene.name}: {self.render_layer_name}"
+        self.notify_status(0, "Start syncing")
+        self._start_metrics(scene, view_layer)
+
+        self.rpr_context.blender_data['depsgraph'] = depsgraph
+
+        # particles are exported from scratch every frame
+        self._remove_particles()
+
+        # OBJECTS
+        updated_objects = {}
+        updated_materials = set()
+        updated_lights = set()
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Object):
+                obj = update.id
+                updated_objects[obj.original] = (update.is_updated_geometry, update.is_updated_transform)
+                if obj.type not in ITERATED_OBJECT_TYPES:
+                    continue
+
+                indirect_only = obj.original.indirect_only_get(view_layer=view_layer)
+                object.sync_update(self.rpr_context, obj, update.is_updated_geometry, update.is_updated_transform,
+                                   indirect_only=indirect_only, material_override=material_override,
+                                   frame_current=self.frame_current)
+
+            elif isinstance(update.id, bpy.types.Material):
+                updated_materials.add(update.id.original)
+
+            elif isinstance(update.id, bpy.types.Light):
+                updated_lights.add(update.id.original)
+
+            elif isinstance(update.id, bpy.types.Collection) or \
+                    (BLENDER_VERSION >= '3.0' and isinstance(update.id, bpy.types.GeometryNodeTree)):
+                # collection and geometry nodes changes could change the set of frame dependent materials
+                self.frame_dependent_materials = None
+
+            if self.rpr_engine.test_break():
+                log.warn("Syncing stopped by user termination")
+                return
+
+        if updated_lights:
+            self._sync_update_lights(depsgraph, updated_lights, updated_materials)
+
+        self._sync_update_collection(depsgraph, updated_objects)
+
+        # MATERIALS
+        # depsgraph doesn't provide updates for auto refreshed image sequences and smoke domains materials
+        if self.frame_dependent_materials is None:
+            self.frame_dependent_materials = self._get_frame_dependent_materials(depsgraph)
+
+        sequence_materials, smoke_materials = self.frame_dependent_materials
+        for mat in updated_materials | sequence_materials | smoke_materials:
+            self.update_material_on_scene_objects(depsgraph.id_eval_get(mat), depsgraph)
+
+        # CAMERA
+        camera_key = object.key(scene.camera)
+        rpr_camera = self.rpr_context.objects.get(camera_key, None)
+        if not rpr_camera:
+            rpr_camera = self.rpr_context.create_camera(camera_key)
+            self.rpr_context.scene.set_camera(rpr_camera)
+
+        camera_obj = depsgraph.objects.get(camera_key, None)
+        if not camera_obj:
+            camera_obj = scene.camera
+
+        border, screen_width, screen_height = self._get_border_and_screen_size(scene)
+        self.camera_data = camera.CameraData.init_from_camera(
+            camera_obj.data, camera_obj.matrix_world, screen_width / screen_height, border)
+        self.camera_data.export(rpr_camera)
+
+        # WORLD
+        world_data = self._get_world_data(depsgraph)
+        if world_data != self.world_data:
+            self.world_data = world_data
+            if world_data:
+                world_data.export(self.rpr_context)
+                self.world_backplate = world_data.backplate
+            else:
+                world.remove_environment_lights(self.rpr_context)
+                self.world_backplate = None
+
+        # PARTICLES
+        self.notify_status(0, "Syncing particles")
+        if not self._sync_particles(depsgraph):
+            log.warn("Syncing stopped by user termination")
+            return
+
+        # frame dependent settings
+        self._sync_catchers(scene)
+
+        if scene.rpr.final_render_mode == 'FULL2':
+            scene.rpr.limits.set_random_seed(self.rpr_context)
+
+        if self.cryptomatte_allowed:
+            self.rpr_context.sync_cryptomatte_hash()
+
+        if scene.rpr.use_render_stamp:
+            self.render_stamp_text = self.prepare_scene_stamp_text(scene)
+
+        self.sync_time = time.perf_counter() - self.sync_time
+        self._finish_sync_metrics()
+
+        self.is_synced = True
+        self.notify_status(0, "Finish syncing")
+        log.info(f"Frame {self.frame_current} synced in {self.sync_time:.3f} sec "
+                 f"(full sync: {self.full_sync_time:.3f} sec)")
+
+        self.dump_core_profile('sync')
+
+    def _sync_update_lights(self, depsgraph, updated_lights, updated_materials):
+        """
+        Re-syncs objects of updated lights, adds materials linked to updated lights by RPRShaderNodeToon
+        to updated_materials, they keep pointer to rpr light
+        """
+        materials = set()
+        for obj in self.depsgraph_objects(depsgraph):
+            if obj.type == 'LIGHT' and obj.data.original in updated_lights:
+                object.sync_update(self.rpr_context, obj, True, False)
+
+            materials.update(material_slot.material.original for material_slot in obj.material_slots
+                             if material_slot.material)
+
+        for mat in materials - updated_materials:
+            if not mat.node_tree:
+                continue
+
+            for node in material.get_material_nodes_by_type(mat, 'RPRShaderNodeToon'):
+                if node.linked_light and node.linked_light.data.original in updated_lights:
+                    updated_materials.add(mat)
+                    break
+
+    def _sync_update_collection(self, depsgraph, updated_objects):
+        """
+        Removes objects which are not present in depsgraph anymore, exports new objects and instances,
+        updates instances of updated objects and instancers
+        """
+        view_layer = depsgraph.view_layer
+        material_override = view_layer.material_override
+
+        depsgraph_keys = set()
+        for obj in self.depsgraph_objects(depsgraph):
+            obj_key = object.key(obj)
+            depsgraph_keys.add(obj_key)
+            if obj_key not in self.rpr_context.objects:
+                indirect_only = obj.original.indirect_only_get(view_layer=view_layer)
+                object.sync(self.rpr_context, obj, indirect_only=indirect_only,
+                            material_override=material_override, frame_current=self.frame_current)
+
+        instances_batch = instance.InstancesBatch(self.rpr_context)
+        for inst in self.depsgraph_instances(depsgraph):
+            if not isinstance(inst.instance_object.original.data, type(inst.object.data)):
+                continue
+
+            inst_key = instance.key(inst)
+            depsgraph_keys.add(inst_key)
+            if inst_key not in self.rpr_context.objects:
+                indirect_only = inst.parent.original.indirect_only_get(view_layer=view_layer)
+                if not instances_batch.add(inst, indirect_only):
+                    instance.sync(self.rpr_context, inst, indirect_only=indirect_only,
+                                  material_override=material_override, frame_current=self.frame_current)
+                continue
+
+            is_updated_geometry, _ = updated_objects.get(inst.object.original, (False, False))
+            _, is_updated_transform = updated_objects.get(inst.parent.original, (False, False))
+            if is_updated_geometry or is_updated_transform or inst.object.original in updated_objects:
+                instance.sync_update(self.rpr_context, inst, is_updated_geometry, True)
+
+        instances_batch.flush()
+
+        # hidden objects are kept for their instances, cameras aren't synced as depsgraph objects
+        keys_to_remove = tuple(key for key, rpr_obj in self.rpr_context.objects.items()
+                               if key not in depsgraph_keys and not isinstance(rpr_obj, pyrpr.Camera)
+                               and (not isinstance(rpr_obj, pyrpr.Shape) or rpr_obj.is_visible))
+        for key in keys_to_remove:
+            if key in self.rpr_context.objects:
+                log("Removing object", key)
+                self.rpr_context.remove_object(key)
+
+        # hidden masters are removed when their instances are removed
+        instanced_meshes = {id(rpr_obj.mesh) for rpr_obj in self.rpr_context.objects.values()
+                            if isinstance(rpr_obj, pyrpr.Instance)}
+        keys_to_remove = tuple(key for key, rpr_obj in self.rpr_context.objects.items()
+                               if key not in depsgraph_keys and isinstance(rpr_obj, pyrpr.Mesh)
+                               and not rpr_obj.is_visible and id(rpr_obj) not in instanced_meshes)
+        for key in keys_to_remove:
+            log("Removing hidden master", key)
+            self.rpr_context.remove_object(key)
+
+    def keep_context(self):
+        # with persistent data RPR context is kept for the next frame
+        return super().keep_context() or \
+            (self.is_persistent and not self.is_last_frame and not self.rpr_engine.test_break())
+
+
+class AnimationEngine2(AnimationEngine, RenderEngine2):
+    def sync(self, depsgraph):
+        self._sync_with_vdb_prefetch(super().sync, depsgraph)
+
+    def sync_update(self, depsgraph):
+        self._sync_with_vdb_prefetch(super().sync_update, depsgraph)
 
+    @staticmethod
+    def _sync_with_vdb_prefetch(sync, depsgraph):
+        volume.vdb_prefetcher.begin_sync()
+        try:
+            sync(depsgraph)
 
-class AnimationEngine2(RenderEngine2):
-    pass
+        finally:
+            # start reading VDB sequences for next frames while this frame is rendered
+            scene = depsgraph.scene
+            frames = range(scene.frame_current + scene.frame_step, scene.frame_end + 1, scene.frame_step)
+            volume.vdb_prefetcher.end_sync(frames[:scene.rpr.vdb_prefetch_frames],
+                                           scene.rpr.vdb_prefetch_memory * 1024 ** 2)
@@ -13,11 +13,13 @@
 # limitations under the License.
 #********************************************************************
 import threading
+import numpy as np
 
 import pyrpr
 import pyrpr2
 
-from rprblender.utils.conversion import get_cryptomatte_name, get_cryptomatte_hash
+from rprblender.utils.conversion import CryptomatteManifest
+
 
 class RPRContext:
     """ Manager of pyrpr calls """
@@ -62,7 +64,7 @@ class RPRContext:
         self.scene = None
         self.objects = {}
         self.mesh_masters = {}
-        self.object_hashes = {}
+        self.object_hashes = CryptomatteManifest()
         self.curves = {}
         self.volumes = {}
 
@@ -72,10 +74,13 @@ class RPRContext:
         # motion data cache. each object key has a {transform: ... , deformation: ...}
         self.transform_cache = {}
         self.deformation_cache = {}
+        # MeshData of deformation blurred meshes at export frame, is collected if not None.
+        # AnimationEngine fills it with data cached as motion blur data of previous frame
+        self.mesh_data_cache = None
 
         # TODO: probably better make nodes more close to materials in one data structure
         self.material_nodes = {}
-        self.material_nodes_hashes = {}
+        self.material_nodes_hashes = CryptomatteManifest()
         self.materials = {}
 
         self.images = {}
@@ -93,6 +98,11 @@ class RPRContext:
         # texture compression used when images created
         self.texture_compression = False
 
+        # smoke domain grids sparse data cache for current frame: (object key, grid name) -> grid data
+        self.volume_grid_epsilon = 0.0
+        self.volume_grids_cache = {}
+        self.volume_grids_frame = None
+
     def init(self, context_flags, context_props):
         self.context = self._Context(context_flags, context_props)
         self.material_system = pyrpr.MaterialSystem(self.context)
@@ -115,6 +125,23 @@ class RPRContext:
         if self.context:
             self.disable_aovs()
 
+    def set_lazy_names(self, lazy_names):
+        """
+        With lazy_names object names are only stored by set_name() and aren't set to core,
+        they are needed only for .rpr export, cryptomatte object AOVs and debugging
+        """
+        self.context.lazy_names = lazy_names
+        if not lazy_names:
+            self.apply_names()
+
+    def apply_names(self):
+        """ Sets stored names of scene objects to core """
+        self.scene.apply_name()
+        for rpr_objects in (self.objects, self.images, self.curves, self.volumes):
+            for rpr_obj in rpr_objects.values():
+                if rpr_obj:
+                    rpr_obj.apply_name()
+
     def clear_frame_buffers(self):
         for fbs in self.frame_buffers_aovs.values():
             fbs['aov'].clear()
@@ -133,6 +160,8 @@ class RPRContext:
 
         self.transform_cache = {}
         self.deformation_cache = {}
+        self.mesh_data_cache = None
+        self.volume_grids_cache = {}
 
     def render(self, restart=False, tile=None):
         if restart:
@@ -194,6 +223,17 @@ class RPRContext:
         for aov_type in tuple(self.frame_buffers_aovs.keys()):
             self.disable_aov(aov_type)
 
+    def reset_aovs(self):
+        """ Disables all AOVs and catchers, they have to be enabled again by sync_catchers() """
+        if self.composite:
+            self._disable_catchers()
+
+        self.use_shadow_catcher = False
+        self.use_reflection_catcher = False
+        self.use_transparent_background = False
+
+        self.disable_aovs()
+
     def is_aov_enabled(self, aov_type):
         return aov_type in self.frame_buffers_aovs
 
@@ -225,17 +265,11 @@ class RPRContext:
             self._sync_obj_hash()
 
     def _sync_obj_hash(self):
-        for key, value in self.objects.items():
-            if not isinstance(value, (pyrpr.Mesh, pyrpr.Instance)):
-                continue
-
-            key = str(key)
-            self.object_hashes[get_cryptomatte_name(key)] = get_cryptomatte_hash(key)
+        self.object_hashes.update(key for key, value in self.objects.items()
+                                  if isinstance(value, (pyrpr.Mesh, pyrpr.Instance)))
 
     def _sync_mat_hash(self):
-        for key in self.material_nodes.keys():
-            key = str(key[0][0])
-            self.material_nodes_hashes[get_cryptomatte_name(key)] = get_cryptomatte_hash(key)
+        self.material_nodes_hashes.update(key[0][0] for key in self.material_nodes.keys())
 
     def sync_catchers(self, use_transparent_background=None):
         prev_state = (self.use_shadow_catcher, self.use_reflection_catcher,
@@ -358,6 +392,53 @@ class RPRContext:
             obj.set_subdivision_boundary_interop(obj.subdivision['boundary'])
             obj.set_subdivision_crease_weight(obj.subdivision['crease_weight'])
 
+    def render_views(self, views, render_view):
+        """
+        Renders synced scene from several cameras back to back.
+        Views are grouped by subdivision camera, so adaptive subdivision is recalculated
+        only when subdivision camera changes between views.
+        :param views: list of (camera_key, camera_data, subdivision_camera_data) tuples, where camera_data
+            and subdivision_camera_data are export.camera.CameraData, subdivision_camera_data could be None
+            to calculate adaptive subdivision from view camera
+        :param render_view: function(view_index, rpr_camera) called after view camera is set to scene,
+            it has to render the view and read its results
+        """
+        groups = []
+        for i, (camera_key, camera_data, subdivision_data) in enumerate(views):
+            if subdivision_data is None:
+                subdivision_data = camera_data
+
+            group = next((g for g in groups if g[0] == subdivision_data), None)
+            if group:
+                group[1].append(i)
+            else:
+                groups.append((subdivision_data, [i]))
+
+        use_subdivision = bool(self._get_adaptive_subdivision_objects())
+        subdivision_camera = self.create_camera()
+        prev_subdivision_camera = self.scene.subdivision_camera
+        self.scene.set_subdivision_camera(subdivision_camera)
+
+        try:
+            for subdivision_data, view_indices in groups:
+                if use_subdivision:
+                    subdivision_data.export(subdivision_camera)
+                    self.sync_auto_adapt_subdivision()
+
+                for i in view_indices:
+                    camera_key, camera_data, _ = views[i]
+                    rpr_camera = self.objects.get(camera_key, None)
+                    if not rpr_camera:
+                        rpr_camera = self.create_camera(camera_key)
+
+                    camera_data.export(rpr_camera)
+                    self.scene.set_camera(rpr_camera)
+
+                    render_view(i, rpr_camera)
+
+        finally:
+            self.scene.set_subdivision_camera(prev_subdivision_camera)
+
     def _get_adaptive_subdivision_objects(self):
         return tuple(obj for obj in self.scene.objects
                      if isinstance(obj, pyrpr.Shape) and obj.subdivision is not None)
@@ -445,6 +526,31 @@ class RPRContext:
         self.objects[key] = instance
         return instance
 
+    def create_instances_batch(self, keys, mesh, transforms, visibility_flags=None):
+        """
+        Creates instances of mesh for each key in keys and attaches them to scene.
+        transforms is (len(keys), 4, 4) array, visibility_flags is {visibility_type: visible}
+        shared by all instances, see pyrpr.Shape.set_visibility_ex()
+        """
+        visibility_flags = visibility_flags or {}
+        instances = []
+        for key in keys:
+            instance = self._Instance(self.context, mesh)
+            instance.set_name(key)
+            self.objects[key] = instance
+            instances.append(instance)
+
+        transforms = np.ascontiguousarray(transforms, dtype=np.float32).reshape(-1, 4, 4)
+        self._export_instances_batch(instances, transforms, visibility_flags)
+        return instances
+
+    def _export_instances_batch(self, instances, transforms, visibility_flags):
+        pyrpr.shapes_set_transform(instances, transforms)
+        for visibility_type, visible in visibility_flags.items():
+            pyrpr.shapes_set_visibility_flag(instances, pyrpr.SHAPE_VISIBILITY_FLAGS[visibility_type], visible)
+
+        self.scene.attach_shapes(instances)
+
     def create_curve(self, key, control_points, points_radii, uvs):
         curve = self._Curve(self.context, control_points, points_radii, uvs)
         self.curves[key] = curve
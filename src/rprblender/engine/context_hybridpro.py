@@ -92,6 +92,15 @@ class RPRContext(context.RPRContext):
 
             raise
 
+    def _export_instances_batch(self, instances, transforms, visibility_flags):
+        # batched pyrpr calls don't ignore unsupported errors, exporting instances one by one
+        for instance, transform in zip(instances, transforms):
+            instance.set_transform(transform)
+            for visibility_type, visible in visibility_flags.items():
+                instance.set_visibility_ex(visibility_type, visible)
+
+            self.scene.attach(instance)
+
     def create_buffer(self, data, dtype):
         return None
 
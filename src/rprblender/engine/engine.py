@@ -20,16 +20,17 @@ Other modules in this directory could be viewport, etc.
 
 ''' main Render object '''
 
+import time
 import weakref
 
 import bpy
 import pyrpr
 
 from .context import RPRContext
-from rprblender.export import object, instance
+from rprblender.export import object, instance, material, volume
 from . import image_filter
 
-from rprblender.utils import logging, IS_LINUX
+from rprblender.utils import logging, IS_LINUX, get_temp_dir
 log = logging.Log(tag='Engine')
 
 
@@ -60,6 +61,21 @@ class Engine:
         self.background_filter = None
         self.upscale_filter = None
 
+    @staticmethod
+    def dump_core_profile(title):
+        """ Log core calls profile and save calls trace if profiling is enabled, then reset profiler """
+        if not pyrpr.profiler:
+            return
+
+        log.info(pyrpr.profiler.report(title))
+
+        if pyrpr.profiler.trace:
+            file_path = get_temp_dir() / f"core_trace_{title}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+            pyrpr.profiler.export_chrome_trace(file_path)
+            log.info("Core calls trace saved to", file_path)
+
+        pyrpr.profiler.reset()
+
     def depsgraph_objects(self, depsgraph: bpy.types.Depsgraph, with_camera=False):
         """ Iterates evaluated objects in depsgraph with ITERATED_OBJECT_TYPES """
 
@@ -78,8 +94,82 @@ class Engine:
             if instance.is_instance and instance.object.type in ITERATED_OBJECT_TYPES:
                 yield instance
 
-    def cache_blur_data(self, depsgraph: bpy.types.Depsgraph):
-        scene = depsgraph.scene
+    def _get_frame_dependent_materials(self, depsgraph):
+        """
+        Returns original materials which have to be re-exported on frame change:
+        - materials with auto refreshed image sequence, depsgraph doesn't provide updates for them
+        - materials of smoke domain objects
+        """
+        sequence_materials = set()
+        smoke_materials = set()
+        checked_materials = set()
+
+        for obj in self.depsgraph_objects(depsgraph):
+            is_smoke_domain = volume.get_smoke_modifier(obj) is not None
+
+            for material_slot in obj.material_slots:
+                mat = material_slot.material
+                if not mat:
+                    continue
+
+                mat = mat.original
+                if is_smoke_domain:
+                    smoke_materials.add(mat)
+
+                if mat in checked_materials:
+                    continue
+
+                checked_materials.add(mat)
+                if not mat.node_tree:
+                    continue
+
+                if any(node.image and node.image.source == 'SEQUENCE' and node.image_user.use_auto_refresh
+                       for node in material.get_material_nodes_by_type(mat, 'ShaderNodeTexImage')):
+                    sequence_materials.add(mat)
+
+        return sequence_materials, smoke_materials - sequence_materials
+
+    def update_material_on_scene_objects(self, mat, depsgraph):
+        """ Find all mesh material users and reapply material """
+        material_override = depsgraph.view_layer.material_override
+
+        if material_override and material_override.name == mat.name:
+            objects = self.depsgraph_objects(depsgraph)
+            active_mat = material_override
+        else:
+            # Geometry Nodes allowed to apply material via node tree, in that case slot name always ''
+            # it's needed to check material name instead
+            objects = tuple(obj for obj in self.depsgraph_objects(depsgraph)
+                            if mat.name in (getattr(ms.material, 'name', '') for ms in obj.material_slots))
+            active_mat = mat
+
+        updated = False
+        for obj in objects:
+            rpr_material = material.sync_update(self.rpr_context, active_mat, obj=obj)
+            rpr_volume = material.sync_update(self.rpr_context, active_mat, 'Volume', obj=obj)
+            rpr_displacement = material.sync_update(self.rpr_context, active_mat, 'Displacement', obj=obj)
+
+            if not rpr_material and not rpr_volume and not rpr_displacement:
+                continue
+
+            indirect_only = obj.original.indirect_only_get(view_layer=depsgraph.view_layer)
+
+            if object.key(obj) not in self.rpr_context.objects:
+                object.sync(self.rpr_context, obj, indirect_only=indirect_only,
+                            frame_current=self.frame_current)
+                updated = True
+                continue
+
+            updated |= object.sync_update(self.rpr_context, obj, False, False,
+                                          indirect_only=indirect_only,
+                                          material_override=material_override,
+                                          frame_current=self.frame_current)
+
+        return updated
+
+    @staticmethod
+    def get_blur_frames(scene):
+        """ Returns (frame, subframe) of scene export and of motion blur data for current frame """
         position = scene.cycles.motion_blur_position
 
         if position == 'END':  # shutter closes at the current frame, so [N-1 .. N]
@@ -92,17 +182,25 @@ class Engine:
             from_frame = (scene.frame_current - 1, 0.5)
             to_frame = (scene.frame_current, 0.5)
 
+        return from_frame, to_frame
+
+    def cache_blur_data(self, depsgraph: bpy.types.Depsgraph):
+        scene = depsgraph.scene
+        from_frame, to_frame = self.get_blur_frames(scene)
+
         # set to to_frame and cache blur data
         self._set_scene_frame(scene, *to_frame)
+        self._cache_frame_blur_data(depsgraph)
+        self._set_scene_frame(scene, *from_frame)
 
+    def _cache_frame_blur_data(self, depsgraph: bpy.types.Depsgraph):
+        """ Caches transforms and deformations of current scene frame to rpr_context """
         for obj in self.depsgraph_objects(depsgraph, with_camera=True):
             object.cache_blur_data(self.rpr_context, obj)
 
         for inst in self.depsgraph_instances(depsgraph):
             instance.cache_blur_data(self.rpr_context, inst)
 
-        self._set_scene_frame(scene, *from_frame)
-
     def _set_scene_frame(self, scene, frame, subframe=0.0):
         self.rpr_engine.frame_set(frame, subframe)
 
@@ -24,7 +24,8 @@ from rprblender.export import (
     object,
     particle,
     world,
-    camera
+    camera,
+    image
 )
 from .context import RPRContext, RPRContext2
 from .engine import Engine
@@ -45,14 +46,36 @@ class ExportEngine(Engine):
         """ Prepare scene for export """
         log('Start sync')
 
+        context.scene.rpr.init_rpr_context(self.rpr_context)
+        self.rpr_context.scene.set_name(context.scene.name)
+
+        self._sync_scene(context)
+
+        log('Finish sync')
+
+    def sync_frame(self, context):
+        """
+        Exports scene of current frame to already initialized RPR context.
+        Scene objects and materials are exported again, loaded images are reused
+        except frames of image sequences, they are different for every frame.
+        """
+        log('Start sync_frame')
+
+        images = {key: rpr_image for key, rpr_image in self.rpr_context.images.items()
+                  if not image.is_sequence_key(key)}
+        self.rpr_context.clear_scene()
+        self.rpr_context.images = images
+
+        self._sync_scene(context)
+
+        log('Finish sync_frame')
+
+    def _sync_scene(self, context):
         depsgraph = context.evaluated_depsgraph_get()
         self.rpr_context.blender_data['depsgraph'] = depsgraph
         scene = depsgraph.scene
         material_override = depsgraph.view_layer.material_override
 
-        scene.rpr.init_rpr_context(self.rpr_context)
-
-        self.rpr_context.scene.set_name(scene.name)
         self.rpr_context.width = int(scene.render.resolution_x * scene.render.resolution_percentage / 100)
         self.rpr_context.height = int(scene.render.resolution_y * scene.render.resolution_percentage / 100)
 
@@ -78,15 +101,20 @@ class ExportEngine(Engine):
                             frame_current=scene.frame_current)
 
             # instances
+            instances_batch = instance.InstancesBatch(self.rpr_context)
             for inst in self.depsgraph_instances(depsgraph):
                 indirect_only = inst.parent.original.indirect_only_get(view_layer=depsgraph.view_layer)
-                instance.sync(self.rpr_context, inst, indirect_only=indirect_only, material_override=material_override,
-                              frame_current=scene.frame_current)
+                if not instances_batch.add(inst, indirect_only):
+                    instance.sync(self.rpr_context, inst, indirect_only=indirect_only,
+                                  material_override=material_override, frame_current=scene.frame_current)
+
+            instances_batch.flush()
 
             # rpr_context parameters
             self.rpr_context.set_parameter(pyrpr.CONTEXT_PREVIEW, False)
             scene.rpr.export_ray_depth(self.rpr_context)
             self.rpr_context.texture_compression = scene.rpr.texture_compression
+            self.rpr_context.volume_grid_epsilon = scene.rpr.volume_grid_epsilon
 
             # EXPORT CAMERA
             camera_key = object.key(scene.camera)   # current camera key
@@ -118,8 +146,6 @@ class ExportEngine(Engine):
         # Exported scene will be rendered vertically flipped, flip it back
         self.rpr_context.set_parameter(pyrpr.CONTEXT_Y_FLIP, True)
 
-        log('Finish sync')
-
     def _set_scene_frame(self, scene, frame, subframe=0.0):
         scene.frame_set(frame, subframe=subframe)
 
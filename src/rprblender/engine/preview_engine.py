@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #********************************************************************
+import os
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
 import bpy
 import pyrpr
@@ -20,6 +24,8 @@ from .engine import Engine
 from rprblender.export import object, camera, world
 from .context import RPRContext2
 
+from rprblender import utils
+from rprblender.utils.user_settings import get_user_settings
 from rprblender.utils import logging, BLENDER_VERSION
 log = logging.Log(tag='PreviewEngine')
 
@@ -27,6 +33,290 @@ log = logging.Log(tag='PreviewEngine')
 
 CONTEXT_LIFETIME = 300.0    # 5 minutes in seconds
 
+PREVIEW_CACHE_MEMORY_SIZE = 256 * 1024 * 1024   # 256 MB of rendered previews kept in memory
+PREVIEW_CACHE_DISK_SIZE = 1024 * 1024 * 1024    # 1 GB of rendered previews kept on disk
+PREVIEW_CACHE_DISK_TRIM = 0.75                  # part of disk size left after removing least recently used files
+PREVIEW_UPDATE_BATCH_SIZE = 16                  # number of previews requested in one batch
+PREVIEW_UPDATE_INTERVAL = 0.5                   # seconds between preview batches
+
+# properties which don't affect preview rendering
+PREVIEW_HASH_SKIP_PROPERTIES = {
+    'rna_type', 'id_data', 'original', 'name', 'name_full', 'users', 'session_uid',
+    'tag', 'is_evaluated', 'is_runtime_data', 'use_fake_user', 'use_extra_user', 'is_embedded_data',
+    'is_missing', 'is_library_indirect', 'library_weak_reference', 'asset_data', 'override_library',
+    'preview', 'animation_data', 'is_dirty',
+}
+# node editor properties which don't affect preview rendering, they are skipped only for nodes
+# as the same names are used by render properties, e.g. Light.color and World.color
+PREVIEW_HASH_SKIP_NODE_PROPERTIES = {
+    'label', 'location', 'width', 'width_hidden', 'height', 'dimensions', 'select', 'hide',
+    'show_options', 'show_preview', 'show_texture', 'color', 'use_custom_color', 'parent',
+    'inputs', 'outputs', 'internal_links', 'bl_idname', 'bl_label', 'bl_description', 'bl_icon',
+    'bl_static_type', 'bl_width_default', 'bl_width_min', 'bl_width_max', 'bl_height_default',
+    'bl_height_min', 'bl_height_max',
+}
+
+
+def _to_hashable(value):
+    if isinstance(value, str):
+        return value
+
+    if isinstance(value, (set, frozenset)):
+        # enum flags, sorting to get the same hash in different sessions
+        return tuple(sorted(value))
+
+    if hasattr(value, '__len__'):
+        return tuple(_to_hashable(v) for v in value)
+
+    return value
+
+
+def _hash_id(hasher, id_data, visited):
+    """ Updates hasher with data of ID which is used in preview """
+    hasher.update(f"{type(id_data).__name__}:{id_data.name_full}".encode())
+
+    if id_data in visited:
+        return
+
+    visited.add(id_data)
+
+    if isinstance(id_data, bpy.types.Image):
+        filepath = bpy.path.abspath(id_data.filepath, library=id_data.library)
+        mtime = os.path.getmtime(filepath) if os.path.isfile(filepath) else None
+        hasher.update(f"{filepath}:{mtime}:{id_data.source}:{tuple(id_data.size)}:"
+                      f"{id_data.colorspace_settings.name}".encode())
+
+    elif isinstance(id_data, bpy.types.NodeTree):
+        for node in id_data.nodes:
+            hasher.update(node.name.encode())
+            _hash_struct(hasher, node, 1, visited)
+            for socket in node.inputs:
+                hasher.update(f"{socket.identifier}:{socket.is_linked}:"
+                              f"{_to_hashable(getattr(socket, 'default_value', None))}".encode())
+
+        for link in id_data.links:
+            hasher.update(f"{link.from_node.name}:{link.from_socket.identifier}:"
+                          f"{link.to_node.name}:{link.to_socket.identifier}:{link.is_muted}".encode())
+
+    elif isinstance(id_data, (bpy.types.Material, bpy.types.World, bpy.types.Light)):
+        _hash_struct(hasher, id_data, 1, visited)
+
+
+def _hash_struct(hasher, struct, depth, visited):
+    """ Updates hasher with struct properties, nested structs are hashed up to depth """
+    hasher.update(struct.bl_rna.identifier.encode())
+    is_node = isinstance(struct, bpy.types.Node)
+
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in PREVIEW_HASH_SKIP_PROPERTIES or \
+                (is_node and identifier in PREVIEW_HASH_SKIP_NODE_PROPERTIES):
+            continue
+
+        value = getattr(struct, identifier, None)
+
+        if prop.type == 'POINTER':
+            if value is None:
+                hasher.update(f"{identifier}=None".encode())
+            elif isinstance(value, bpy.types.ID):
+                _hash_id(hasher, value, visited)
+            elif depth > 0:
+                _hash_struct(hasher, value, depth - 1, visited)
+
+        elif prop.type == 'COLLECTION':
+            if depth > 0:
+                for item in value:
+                    if isinstance(item, bpy.types.ID):
+                        _hash_id(hasher, item, visited)
+                    else:
+                        _hash_struct(hasher, item, depth - 1, visited)
+
+        else:
+            hasher.update(f"{identifier}={_to_hashable(value)}".encode())
+
+
+def get_preview_key(depsgraph: bpy.types.Depsgraph, settings_scene: bpy.types.Scene):
+    """
+    Returns hash key of preview render: preview objects with their materials graphs,
+    preview world and render settings
+    """
+    from rprblender import bl_info
+
+    hasher = hashlib.md5()
+    visited = set()
+
+    scene = depsgraph.scene
+    hasher.update(f"{bl_info['version']}:{BLENDER_VERSION}:{utils.core_ver_str(full=True)}:"
+                  f"{scene.render.resolution_x}x{scene.render.resolution_y}".encode())
+
+    rpr = settings_scene.rpr
+    hasher.update(f"{rpr.viewport_limits.preview_samples}:{rpr.pixel_filter}:{rpr.pixel_filter_width}:"
+                  f"{rpr.legacy_toon_shader}:{rpr.texture_compression}:{rpr.final_render_mode}".encode())
+    _hash_struct(hasher, rpr.ray_depth, 0, visited)
+
+    use_preview_world = False
+    for obj in depsgraph.objects:
+        if obj.type not in ('MESH', 'LIGHT', 'CURVE', 'FONT', 'SURFACE', 'META', 'VOLUME', 'CURVES', 'CAMERA'):
+            continue
+
+        hasher.update(f"{obj.name_full}:{obj.type}:{_to_hashable(obj.matrix_world)}".encode())
+        if obj.type in ('LIGHT', 'CAMERA'):
+            _hash_struct(hasher, obj.data, 1, visited)
+
+        for material_slot in obj.material_slots:
+            if material_slot.material:
+                _hash_id(hasher, material_slot.material, visited)
+
+        if obj.name.startswith('preview_') and obj.active_material \
+                and obj.active_material.use_preview_world:
+            use_preview_world = True
+
+    if use_preview_world and settings_scene.world:
+        _hash_id(hasher, settings_scene.world, visited)
+
+    return hasher.hexdigest()
+
+
+class PreviewCache:
+    """
+    Cache of rendered previews keyed by get_preview_key().
+    Recently used previews are kept in memory and on disk, both are limited by size.
+    """
+
+    def __init__(self, cache_dir, memory_size, disk_size):
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+
+        self.images = OrderedDict()
+        self.images_size = 0
+
+        # size of cache files on disk, calculated on first save, cache dir could be shared by Blender instances
+        self.disk_usage = None
+
+    def _file_path(self, key):
+        return self.cache_dir / f"{key}.npy"
+
+    def _add_to_memory(self, key, image):
+        self.images[key] = image
+        self.images_size += image.nbytes
+
+        while self.images_size > self.memory_size and len(self.images) > 1:
+            _, removed_image = self.images.popitem(last=False)
+            self.images_size -= removed_image.nbytes
+
+    def get(self, key):
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+
+        file_path = self._file_path(key)
+        if not file_path.is_file():
+            return None
+
+        try:
+            image = np.load(file_path, allow_pickle=False)
+            os.utime(file_path)     # file modification time is used as last usage time
+        except (OSError, ValueError) as e:
+            log.warn("Unable to load cached preview", file_path, e)
+            return None
+
+        self._add_to_memory(key, image)
+        return image
+
+    def set(self, key, image):
+        self._add_to_memory(key, image)
+
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+
+            # writing to temporary file first, file is replaced only when fully written
+            tmp_path = self.cache_dir / f"{key}.{utils.PID}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, image, allow_pickle=False)
+            os.replace(tmp_path, self._file_path(key))
+
+            if self.disk_usage is None:
+                self._trim_disk()
+            else:
+                self.disk_usage += self._file_path(key).stat().st_size
+                if self.disk_usage > self.disk_size:
+                    self._trim_disk()
+
+        except OSError as e:
+            log.warn("Unable to save cached preview", key, e)
+
+    def _trim_disk(self):
+        """ Calculates disk usage, removes least recently used files if cache exceeds disk size """
+        files = []
+        for path in self.cache_dir.glob('*.npy'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        self.disk_usage = sum(size for _, size, _ in files)
+        if self.disk_usage <= self.disk_size:
+            return
+
+        files.sort()
+        for _, size, path in files:
+            if self.disk_usage <= self.disk_size * PREVIEW_CACHE_DISK_TRIM:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            self.disk_usage -= size
+
+        log(f"Preview cache trimmed to {self.disk_usage / 1024 ** 2:.1f} MB on disk")
+
+    def clear(self):
+        self.images.clear()
+        self.images_size = 0
+
+        if not self.cache_dir.is_dir():
+            return
+
+        for path in self.cache_dir.iterdir():
+            if path.suffix in ('.npy', '.tmp'):
+                os.remove(path)
+
+        self.disk_usage = 0
+
+
+preview_cache = PreviewCache(utils.preview_cache_dir(), PREVIEW_CACHE_MEMORY_SIZE, PREVIEW_CACHE_DISK_SIZE)
+
+
+def update_material_previews(materials, batch_size=PREVIEW_UPDATE_BATCH_SIZE):
+    """
+    Requests previews of materials in batches by timer. Blender renders requested previews
+    by its background jobs, batches prevent flooding jobs queue for big material libraries.
+    Previews are regenerated also for materials which already have them.
+    """
+    material_names = [mat.name_full for mat in materials]
+    log(f"Updating {len(material_names)} material previews")
+
+    def update_batch():
+        batch, material_names[:batch_size] = material_names[:batch_size], []
+        for name in batch:
+            mat = next((m for m in bpy.data.materials if m.name_full == name), None)
+            if not mat:
+                continue
+
+            # preview_ensure() only allocates preview data, rendering is started by the operator
+            with bpy.context.temp_override(id=mat):
+                bpy.ops.ed.lib_id_generate_preview()
+
+        return PREVIEW_UPDATE_INTERVAL if material_names else None
+
+    bpy.app.timers.register(update_batch)
+
 
 class PreviewEngine(Engine):
     """ Render engine for preview material, lights, environment """
@@ -43,6 +333,11 @@ class PreviewEngine(Engine):
         self.render_samples = 0
         self.render_update_samples = 1
 
+        self.width = 0
+        self.height = 0
+        self.preview_key = None
+        self.cached_image = None
+
     def _init_rpr_context(self, scene):
         if not PreviewEngine.rpr_context:
             log("Creating RPRContext")
@@ -60,13 +355,27 @@ class PreviewEngine(Engine):
             # Real deletion will be applied after all links be lost.
             PreviewEngine.rpr_context = None
 
+    def _render_cached(self):
+        log(f"Render cached preview {self.preview_key}")
+
+        result = self.rpr_engine.begin_result(0, 0, self.width, self.height)
+        try:
+            result.layers[0].passes.foreach_set('rect', self.cached_image)
+        finally:
+            self.rpr_engine.end_result(result)
+
     def render(self):
         if not self.is_synced:
             return
 
+        if self.cached_image is not None:
+            self._render_cached()
+            return
+
         log(f"Start render [{self.rpr_context.width}, {self.rpr_context.height}]")
         result = self.rpr_engine.begin_result(0, 0, self.rpr_context.width, self.rpr_context.height)
         sample = 0
+        image = None
 
         try:
             while sample < self.render_samples:
@@ -100,6 +409,9 @@ class PreviewEngine(Engine):
         finally:
             self.rpr_engine.end_result(result)
 
+        if self.preview_key and image is not None and sample >= self.render_samples:
+            preview_cache.set(self.preview_key, image)
+
         # clearing scene after finishing render
         self.rpr_context.clear_scene()
 
@@ -112,6 +424,19 @@ class PreviewEngine(Engine):
         scene = depsgraph.scene
         settings_scene = bpy.context.scene
 
+        self.width, self.height = scene.render.resolution_x, scene.render.resolution_y
+        self.preview_key = None
+        self.cached_image = None
+
+        if get_user_settings().use_preview_cache:
+            self.preview_key = get_preview_key(depsgraph, settings_scene)
+            self.cached_image = preview_cache.get(self.preview_key)
+            if self.cached_image is not None:
+                # previously rendered preview will be used, no need to sync scene
+                self.is_synced = True
+                log('Finish sync: cached preview', self.preview_key)
+                return
+
         self._init_rpr_context(scene)
         self.rpr_context.resize(scene.render.resolution_x, scene.render.resolution_y)
 
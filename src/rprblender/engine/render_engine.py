@@ -12,20 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #********************************************************************
+import os
 import socket
 import time
 import datetime
 import math
 import numpy as np
 import bpy
-import json
 
 import pyrpr
 
-from rprblender import utils
+from rprblender import utils, config
 from .engine import Engine
-from rprblender.export import world, camera, object, instance, particle
-from rprblender.utils import render_stamp, BLENDER_VERSION
+from rprblender.export import world, camera, object, instance, particle, mesh, hair, volume
+from rprblender.utils import render_stamp, render_metrics, BLENDER_VERSION
 from rprblender.utils.conversion import perfcounter_to_str, get_cryptomatte_hash
 from rprblender.utils.user_settings import get_user_settings
 from rprblender import bl_info
@@ -79,6 +79,18 @@ class RenderEngine(Engine):
 
         self.cryptomatte_allowed = False  # only Full mode supports cryptomatte AOVs
 
+        # keys of exported particle systems, particles are exported from scratch for each frame and view layer
+        self.particle_keys = set()
+
+        # view layers of the same frame share synced scene, see sync_view_layer()
+        self.frame_current = None
+        self.is_last_view_layer = True
+        self.hidden_keys = set()
+
+        # phases timings and scene counts of current view layer, saved to metrics_path after render
+        self.metrics = None
+        self.metrics_path = None
+
     def notify_status(self, progress, info):
         """ Display export/render status """
         self.rpr_engine.update_progress(progress)
@@ -185,12 +197,11 @@ class RenderEngine(Engine):
 
     def add_cryptomatte_metadata(self, pass_name, manifest, result):
         pass_hash = get_cryptomatte_hash(pass_name)
-        manifest = json.dumps(manifest)
 
         result.stamp_data_add_field(f"cryptomatte/{pass_hash}/name", pass_name)
         result.stamp_data_add_field(f"cryptomatte/{pass_hash}/hash", "MurmurHash3_32")
         result.stamp_data_add_field(f"cryptomatte/{pass_hash}/conversion", "uint32_to_float32")
-        result.stamp_data_add_field(f"cryptomatte/{pass_hash}/manifest", manifest)
+        result.stamp_data_add_field(f"cryptomatte/{pass_hash}/manifest", manifest.json)
 
     def _update_render_result_contour(self, tile_pos, tile_size, layer_name=""):
         def set_render_result(render_passes: bpy.types.RenderPasses):
@@ -276,16 +287,20 @@ class RenderEngine(Engine):
 
             self.rpr_context.set_parameter(pyrpr.CONTEXT_ITERATIONS, update_samples)
             self.rpr_context.set_parameter(pyrpr.CONTEXT_FRAMECOUNT, self.render_iteration)
-            self.rpr_context.render(restart=(self.current_sample == 0))
+            with self.metrics.measure('render_batch'):
+                self.rpr_context.render(restart=(self.current_sample == 0))
 
             self.current_sample += update_samples
 
-            self.rpr_context.resolve()
+            with self.metrics.measure('resolve'):
+                self.rpr_context.resolve()
             if self.background_filter:
-                self.update_background_filter_inputs()
-                self.background_filter.run()
-            self._update_render_result((0, 0), (self.width, self.height),
-                                       layer_name=self.render_layer_name)
+                with self.metrics.measure('filter'):
+                    self.update_background_filter_inputs()
+                    self.background_filter.run()
+            with self.metrics.measure('update_render_result'):
+                self._update_render_result((0, 0), (self.width, self.height),
+                                           layer_name=self.render_layer_name)
 
             # stop at whichever comes first:
             # max samples or max time if enabled or active_pixels == 0
@@ -307,19 +322,21 @@ class RenderEngine(Engine):
 
         if self.image_filter:
             self.notify_status(1.0, "Denoising final image")
-            self.update_image_filter_inputs()
-            self.image_filter.run()
-            color_source = self.image_filter.get_data()
-
-            # restore alpha channel
-            alpha_source = self.rpr_context.get_image()
-            color_source[:, :, 3] = alpha_source[:, :, 3]
-            if self.background_filter:
-                self.update_background_filter_inputs(color_image=color_source)
-                self.background_filter.run()
-            self._update_render_result((0, 0), (self.width, self.height),
-                                       layer_name=self.render_layer_name,
-                                       apply_image_filter=True)
+            with self.metrics.measure('filter'):
+                self.update_image_filter_inputs()
+                self.image_filter.run()
+                color_source = self.image_filter.get_data()
+
+                # restore alpha channel
+                alpha_source = self.rpr_context.get_image()
+                color_source[:, :, 3] = alpha_source[:, :, 3]
+                if self.background_filter:
+                    self.update_background_filter_inputs(color_image=color_source)
+                    self.background_filter.run()
+            with self.metrics.measure('update_render_result'):
+                self._update_render_result((0, 0), (self.width, self.height),
+                                           layer_name=self.render_layer_name,
+                                           apply_image_filter=True)
 
         # apply stamp data and metadata to render result
         self.stamp_data_add_field()
@@ -394,13 +411,16 @@ class RenderEngine(Engine):
 
                 self.rpr_context.set_parameter(pyrpr.CONTEXT_ITERATIONS, update_samples)
                 self.rpr_context.set_parameter(pyrpr.CONTEXT_FRAMECOUNT, render_iteration)
-                self.rpr_context.render(restart=(sample == 0))
+                with self.metrics.measure('render_batch'):
+                    self.rpr_context.render(restart=(sample == 0))
 
                 sample += update_samples
 
-                self.rpr_context.resolve()
-                self._update_render_result(tile_pos, tile_size,
-                                           layer_name=self.render_layer_name)
+                with self.metrics.measure('resolve'):
+                    self.rpr_context.resolve()
+                with self.metrics.measure('update_render_result'):
+                    self._update_render_result(tile_pos, tile_size,
+                                               layer_name=self.render_layer_name)
 
                 # store maximum actual number of used samples for render stamp info
                 self.current_sample = max(self.current_sample, sample)
@@ -447,15 +467,16 @@ class RenderEngine(Engine):
                 # we will update only Combined pass
                 if p.name == "Combined":
                     image = None
-                    if self.image_filter:
-                        self.image_filter.run()
-                        image = self.image_filter.get_data()
+                    with self.metrics.measure('filter'):
+                        if self.image_filter:
+                            self.image_filter.run()
+                            image = self.image_filter.get_data()
 
-                    if self.background_filter:
-                        if image is not None:
-                            self.background_filter.update_input('color', image)
-                        self.background_filter.run()
-                        image = self.background_filter.get_data()
+                        if self.background_filter:
+                            if image is not None:
+                                self.background_filter.update_input('color', image)
+                            self.background_filter.run()
+                            image = self.background_filter.get_data()
 
                     if image is not None:
                         images[pos: pos + length] = image.flatten()
@@ -533,13 +554,16 @@ class RenderEngine(Engine):
 
             self.rpr_context.set_parameter(pyrpr.CONTEXT_ITERATIONS, update_samples)
             self.rpr_context.set_parameter(pyrpr.CONTEXT_FRAMECOUNT, self.render_iteration)
-            self.rpr_context.render(restart=(self.current_sample == 0))
+            with self.metrics.measure('render_batch'):
+                self.rpr_context.render(restart=(self.current_sample == 0))
 
             self.current_sample += update_samples
 
-            self.rpr_context.resolve()
-            self._update_render_result_contour((0, 0), (self.width, self.height),
-                                               layer_name=self.render_layer_name)
+            with self.metrics.measure('resolve'):
+                self.rpr_context.resolve()
+            with self.metrics.measure('update_render_result'):
+                self._update_render_result_contour((0, 0), (self.width, self.height),
+                                                   layer_name=self.render_layer_name)
 
             if self.current_sample == self.contour_pass_samples:
                 break
@@ -577,6 +601,302 @@ class RenderEngine(Engine):
         self.notify_status(1, "Finish render")
         log('Finish render')
 
+        self._save_metrics()
+        self.dump_core_profile('render')
+
+    def _start_metrics(self, scene, view_layer):
+        """ Starts collecting metrics of view layer sync and render, sets path of metrics file if enabled """
+        self.metrics = render_metrics.RenderMetrics(
+            f"{scene.name}: {view_layer.name}, frame {scene.frame_current}")
+        render_metrics.set_active(self.metrics)
+
+        self.metrics_path = None
+        if scene.rpr.save_render_metrics:
+            # metrics file is placed next to render output: <output file>.<view layer>.metrics.json
+            output_path = bpy.path.abspath(scene.render.frame_path(frame=scene.frame_current))
+            self.metrics_path = f"{output_path}.{bpy.path.clean_name(view_layer.name)}.metrics.json"
+
+    def _finish_sync_metrics(self):
+        """ Stops collecting export timings and counts synced scene objects """
+        render_metrics.set_active(None)
+
+        metrics = self.metrics
+        metrics.set('sync_time', self.sync_time)
+
+        meshes = [obj for obj in self.rpr_context.objects.values() if isinstance(obj, pyrpr.Mesh)]
+        metrics.set('meshes', len(meshes))
+        metrics.set('polygons', sum(rpr_mesh.poly_count for rpr_mesh in meshes))
+        metrics.set('triangles', sum(rpr_mesh.triangle_count for rpr_mesh in meshes))
+        metrics.set('instances', sum(1 for obj in self.rpr_context.objects.values()
+                                     if isinstance(obj, pyrpr.Instance)))
+        metrics.set('material_nodes', len(self.rpr_context.material_nodes))
+
+        try:
+            metrics.set('texture_bytes', sum(image.size_byte for image in self.rpr_context.images.values()))
+        except pyrpr.CoreError as e:
+            log.warn("Unable to get texture size", e)
+
+    def _save_metrics(self):
+        """ Adds render counts and saves metrics to JSON file if enabled """
+        metrics = self.metrics
+        metrics.set('samples', self.current_sample)
+        metrics.set('render_time', self.current_render_time)
+
+        # VRAM usage is reported by core which provides render statistics
+        if hasattr(pyrpr, 'CONTEXT_RENDER_STATISTICS'):
+            try:
+                for name, value in self.rpr_context.context.get_render_statistics().items():
+                    metrics.set(name, value)
+
+            except pyrpr.CoreError as e:
+                log.warn("Unable to get render statistics", e)
+
+        log.info(f"Render metrics {metrics.title}:\n" + '\n'.join(metrics.report()))
+
+        if not self.metrics_path:
+            return
+
+        try:
+            # metrics are saved before Blender writes the frame and creates output directory
+            os.makedirs(os.path.dirname(self.metrics_path), exist_ok=True)
+            metrics.save(self.metrics_path)
+
+        except OSError as e:
+            log.error("Unable to save render metrics", self.metrics_path, e)
+
+    def _sync_particles(self, depsgraph):
+        """ Exports particles, returns False if syncing was stopped by user """
+        def emitters():
+            yield from self.depsgraph_objects(depsgraph)
+
+            # objects linked to scene as a collection are instanced, so walk thru them for particles
+            for entry in self.depsgraph_instances(depsgraph):
+                yield entry.instance_object
+
+        for obj in emitters():
+            self.particle_keys.update(particle.key(p_sys, obj) for p_sys in particle.emitter_p_sys(obj))
+            particle.sync(self.rpr_context, obj)
+            if self.rpr_engine.test_break():
+                return False
+
+        return True
+
+    def _remove_particles(self):
+        for particle_key in self.particle_keys:
+            if particle_key in self.rpr_context.objects:
+                self.rpr_context.remove_object(particle_key)
+
+        self.particle_keys.clear()
+
+    @staticmethod
+    def _get_border_and_screen_size(scene):
+        border = ((0, 0), (1, 1)) if not scene.render.use_border else \
+            ((scene.render.border_min_x, scene.render.border_min_y),
+             (scene.render.border_max_x - scene.render.border_min_x, scene.render.border_max_y - scene.render.border_min_y))
+
+        screen_width = int(scene.render.resolution_x * scene.render.resolution_percentage / 100)
+        screen_height = int(scene.render.resolution_y * scene.render.resolution_percentage / 100)
+
+        return border, screen_width, screen_height
+
+    def _sync_catchers(self, scene):
+        if scene.rpr.final_render_mode != 'FULL':
+            self.rpr_context.sync_catchers(False)
+            bg_filter_enabled = scene.render.film_transparent or self.rpr_context.use_reflection_catcher  # single Shadow Catcher AOV is handled by core
+            background_filter_settings = {
+                'enable': bg_filter_enabled,
+                'use_background': scene.render.film_transparent,
+                'use_shadow': self.rpr_context.use_shadow_catcher,
+                'use_reflection': self.rpr_context.use_reflection_catcher,
+                'resolution': (self.width, self.height),
+            }
+            self.setup_background_filter(background_filter_settings)
+        else:
+            self.rpr_context.sync_catchers(scene.render.film_transparent)
+
+    def _set_lazy_names(self, view_layer):
+        # object names are needed in core only for cryptomatte object AOVs and core calls logging
+        self.rpr_context.set_lazy_names(not config.pyrpr_log_calls and not (
+            self.cryptomatte_allowed and view_layer.rpr.crytomatte_aov_object))
+
+    def _can_share_scene(self, scene, view_layer):
+        """ Checks if synced scene could be reused by other view layers of the same frame """
+        # motion blur, tiles and contour render are exported by full sync of every view layer
+        return scene.rpr.final_render_mode in ('FULL', 'FULL2') and not self.rpr_context.do_motion_blur and \
+            not scene.rpr.is_tile_render_available and not view_layer.rpr.use_contour_render
+
+    @staticmethod
+    def _is_last_view_layer(scene, view_layer):
+        if scene.render.use_single_layer:
+            return True
+
+        view_layers = [layer for layer in scene.view_layers if layer.use]
+        return not view_layers or view_layers[-1].name == view_layer.name
+
+    def keep_context(self):
+        """ Checks if RPR context has to be kept after render for the next view layer """
+        return not self.is_last_view_layer and not self.rpr_engine.test_break()
+
+    def stop_render(self):
+        render_metrics.set_active(None)
+
+        if self.keep_context():
+            return
+
+        super().stop_render()
+
+    def can_sync_view_layer(self, depsgraph):
+        """ Checks if view layer could be rendered with the scene synced for previous view layer """
+        scene = depsgraph.scene
+        view_layer = depsgraph.view_layer
+
+        return self.is_synced and not self.is_last_view_layer and \
+            scene.frame_current == self.frame_current and view_layer.name != self.render_layer_name and \
+            self._can_share_scene(scene, view_layer)
+
+    def sync_view_layer(self, depsgraph):
+        """
+        Switches synced scene to another view layer: exports objects missing in the scene,
+        hides objects which aren't in view layer, updates visibility, material override and AOVs
+        """
+        log('Start sync_view_layer')
+
+        self.is_synced = False
+        self.sync_time = time.perf_counter()
+
+        scene = depsgraph.scene
+        view_layer = depsgraph.view_layer
+        material_override = view_layer.material_override
+
+        self.render_layer_name = view_layer.name
+        self.status_title = f"{scene.name}: {self.render_layer_name}"
+        self.notify_status(0, "Start syncing")
+        self._start_metrics(scene, view_layer)
+
+        self.rpr_context.blender_data['depsgraph'] = depsgraph
+        self._set_lazy_names(view_layer)
+
+        self._remove_particles()
+
+        # OBJECTS
+        layer_keys = set()
+        for obj in self.depsgraph_objects(depsgraph):
+            obj_key = object.key(obj)
+            layer_keys.add(obj_key)
+
+            indirect_only = obj.original.indirect_only_get(view_layer=view_layer)
+            rpr_obj = self.rpr_context.objects.get(obj_key, None)
+            if isinstance(rpr_obj, pyrpr.Shape) and obj.type in ('MESH', 'CURVE', 'FONT', 'SURFACE', 'META'):
+                mesh.sync_visibility(self.rpr_context, obj, rpr_obj, indirect_only)
+                mesh.assign_materials(self.rpr_context, rpr_obj, obj, material_override)
+
+                if obj_key in self.hidden_keys:
+                    # hair and smoke were removed with hiding object
+                    volume.sync(self.rpr_context, obj)
+                    hair.sync(self.rpr_context, obj)
+
+            else:
+                if obj_key in self.rpr_context.objects:
+                    self.rpr_context.remove_object(obj_key)
+
+                object.sync(self.rpr_context, obj, indirect_only=indirect_only,
+                            material_override=material_override, frame_current=self.frame_current)
+
+            if self.rpr_engine.test_break():
+                log.warn("Syncing stopped by user termination")
+                return
+
+        # INSTANCES
+        instances_batch = instance.InstancesBatch(self.rpr_context)
+        for inst in self.depsgraph_instances(depsgraph):
+            if not isinstance(inst.instance_object.original.data, type(inst.object.data)):
+                continue
+
+            inst_key = instance.key(inst)
+            layer_keys.add(inst_key)
+
+            indirect_only = inst.parent.original.indirect_only_get(view_layer=view_layer)
+            rpr_shape = self.rpr_context.objects.get(inst_key, None)
+            if isinstance(rpr_shape, pyrpr.Instance):
+                rpr_shape.set_visibility(True)
+                mesh.export_visibility(inst.object, rpr_shape, indirect_only)
+                mesh.assign_materials(self.rpr_context, rpr_shape, inst.object, material_override)
+                if inst_key in self.hidden_keys:
+                    hair.sync(self.rpr_context, inst)
+
+                continue
+
+            if rpr_shape:
+                self.rpr_context.remove_object(inst_key)
+
+            if not instances_batch.add(inst, indirect_only):
+                instance.sync(self.rpr_context, inst, indirect_only=indirect_only,
+                              material_override=material_override, frame_current=self.frame_current)
+
+        instances_batch.flush()
+
+        # shapes of other view layers are hidden to be shown again without geometry export, rest is removed
+        self.hidden_keys = set()
+        for key, rpr_obj in tuple(self.rpr_context.objects.items()):
+            if key in layer_keys or isinstance(rpr_obj, pyrpr.Camera):
+                continue
+
+            if not isinstance(rpr_obj, pyrpr.Shape):
+                self.rpr_context.remove_object(key)
+                continue
+
+            if not rpr_obj.is_visible:
+                continue
+
+            rpr_obj.set_visibility(False)
+            if isinstance(key, tuple):
+                # hair of instance is keyed by instance key and particle key
+                for curve_key in tuple(k for k in self.rpr_context.curves if k[:2] == key):
+                    self.rpr_context.scene.detach(self.rpr_context.curves.pop(curve_key))
+            else:
+                self.rpr_context.remove_curves(key)
+                self.rpr_context.remove_volumes(key)
+
+            self.hidden_keys.add(key)
+
+        # PARTICLES
+        self.notify_status(0, "Syncing particles")
+        if not self._sync_particles(depsgraph):
+            log.warn("Syncing stopped by user termination")
+            return
+
+        # AOVs and filters of view layer
+        self.rpr_context.reset_aovs()
+        self._disable_image_filter()
+        self._disable_background_filter()
+
+        enable_adaptive = scene.rpr.limits.noise_threshold > 0.0
+        view_layer.rpr.export_aovs(view_layer, self.rpr_context, self.rpr_engine, enable_adaptive, self.cryptomatte_allowed)
+        if enable_adaptive:
+            self.rpr_context.enable_aov(pyrpr.AOV_VARIANCE)
+
+        image_filter_settings = view_layer.rpr.denoiser.get_settings(scene)
+        image_filter_settings['resolution'] = (self.width, self.height)
+        self.setup_image_filter(image_filter_settings)
+
+        self._sync_catchers(scene)
+
+        if self.cryptomatte_allowed:
+            self.rpr_context.sync_cryptomatte_hash()
+
+        if scene.rpr.use_render_stamp:
+            self.render_stamp_text = self.prepare_scene_stamp_text(scene)
+
+        self.sync_time = time.perf_counter() - self.sync_time
+        self._finish_sync_metrics()
+
+        self.is_synced = True
+        self.is_last_view_layer = self._is_last_view_layer(scene, view_layer)
+        self.notify_status(0, "Finish syncing")
+        log.info(f"View layer {self.render_layer_name} synced in {self.sync_time:.3f} sec")
+
+        self.dump_core_profile('sync')
+
     def _init_rpr_context(self, scene):
         scene.rpr.init_rpr_context(self.rpr_context)
 
@@ -596,17 +916,16 @@ class RenderEngine(Engine):
 
         self.render_layer_name = view_layer.name
         self.status_title = f"{scene.name}: {self.render_layer_name}"
+        self.frame_current = scene.frame_current
 
         self.notify_status(0, "Start syncing")
+        self._start_metrics(scene, view_layer)
 
-        self._init_rpr_context(scene)
+        with self.metrics.measure('context_init'):
+            self._init_rpr_context(scene)
+        self._set_lazy_names(view_layer)
 
-        border = ((0, 0), (1, 1)) if not scene.render.use_border else \
-            ((scene.render.border_min_x, scene.render.border_min_y),
-             (scene.render.border_max_x - scene.render.border_min_x, scene.render.border_max_y - scene.render.border_min_y))
-
-        screen_width = int(scene.render.resolution_x * scene.render.resolution_percentage / 100)
-        screen_height = int(scene.render.resolution_y * scene.render.resolution_percentage / 100)
+        border, screen_width, screen_height = self._get_border_and_screen_size(scene)
 
         self.width = int(screen_width * border[1][0])
         self.height = int(screen_height * border[1][1])
@@ -652,6 +971,7 @@ class RenderEngine(Engine):
             last_instances_percent = 0
             self.notify_status(0, "Syncing instances 0%")
 
+            instances_batch = instance.InstancesBatch(self.rpr_context)
             for i, inst in enumerate(self.depsgraph_instances(depsgraph)):
                 # Blender creates instances for Curve, MetaBall object that is already synced via object sync
                 # exclude it to avoid sync it twice
@@ -664,14 +984,16 @@ class RenderEngine(Engine):
                     last_instances_percent = instances_percent
 
                 indirect_only = inst.parent.original.indirect_only_get(view_layer=view_layer)
-                instance.sync(self.rpr_context, inst,
-                              indirect_only=indirect_only, material_override=material_override,
-                              frame_current=scene.frame_current)
+                if not instances_batch.add(inst, indirect_only):
+                    instance.sync(self.rpr_context, inst,
+                                  indirect_only=indirect_only, material_override=material_override,
+                                  frame_current=scene.frame_current)
 
                 if self.rpr_engine.test_break():
                     log.warn("Syncing stopped by user termination")
                     return
 
+            instances_batch.flush()
             self.notify_status(0, "Syncing instances 100%")
 
             # EXPORT CAMERA
@@ -724,18 +1046,9 @@ class RenderEngine(Engine):
             # Note: particles should be exported after motion blur,
             #       otherwise prev_location of particle will be (0, 0, 0)
             self.notify_status(0, "Syncing particles")
-            for obj in self.depsgraph_objects(depsgraph):
-                particle.sync(self.rpr_context, obj)
-                if self.rpr_engine.test_break():
-                    log.warn("Syncing stopped by user termination")
-                    return
-
-            # objects linked to scene as a collection are instanced, so walk thru them for particles
-            for entry in self.depsgraph_instances(depsgraph):
-                particle.sync(self.rpr_context, entry.instance_object)
-                if self.rpr_engine.test_break():
-                    log.warn("Syncing stopped by user termination")
-                    return
+            if not self._sync_particles(depsgraph):
+                log.warn("Syncing stopped by user termination")
+                return
 
         finally:
             if self.rpr_context.do_motion_blur:
@@ -759,19 +1072,7 @@ class RenderEngine(Engine):
         self.setup_image_filter(image_filter_settings)
 
         # Shadow catcher
-        if scene.rpr.final_render_mode != 'FULL':
-            self.rpr_context.sync_catchers(False)
-            bg_filter_enabled = scene.render.film_transparent or self.rpr_context.use_reflection_catcher  # single Shadow Catcher AOV is handled by core
-            background_filter_settings = {
-                'enable': bg_filter_enabled,
-                'use_background': scene.render.film_transparent,
-                'use_shadow': self.rpr_context.use_shadow_catcher,
-                'use_reflection': self.rpr_context.use_reflection_catcher,
-                'resolution': (self.width, self.height),
-            }
-            self.setup_background_filter(background_filter_settings)
-        else:
-            self.rpr_context.sync_catchers(scene.render.film_transparent)
+        self._sync_catchers(scene)
 
         # SET rpr_context parameters
         self.rpr_context.set_parameter(pyrpr.CONTEXT_PREVIEW, False)
@@ -779,6 +1080,7 @@ class RenderEngine(Engine):
         scene.rpr.export_pixel_filter(self.rpr_context)
         scene.rpr.export_compatibility_settings(self.rpr_context)
         self.rpr_context.texture_compression = scene.rpr.texture_compression
+        self.rpr_context.volume_grid_epsilon = scene.rpr.volume_grid_epsilon
 
         self.render_samples, self.render_time = (scene.rpr.limits.max_samples, scene.rpr.limits.seconds)
         self.contour_pass_samples = scene.rpr.limits.contour_render_samples
@@ -795,11 +1097,16 @@ class RenderEngine(Engine):
             self.render_stamp_text = self.prepare_scene_stamp_text(scene)
 
         self.sync_time = time.perf_counter() - self.sync_time
+        self._finish_sync_metrics()
 
         self.is_synced = True
+        self.is_last_view_layer = not self._can_share_scene(scene, view_layer) or \
+            self._is_last_view_layer(scene, view_layer)
         self.notify_status(0, "Finish syncing")
         log('Finish sync')
 
+        self.dump_core_profile('sync')
+
     def athena_send(self, data: dict):
             return
 
@@ -90,9 +90,11 @@ class RenderEngine2(RenderEngine):
                 if is_finished or self.rpr_engine.test_break():
                     break
 
-                self.rpr_context.resolve()
-                self._update_render_result((0, 0), (self.width, self.height),
-                                           layer_name=self.render_layer_name)
+                with self.metrics.measure('resolve'):
+                    self.rpr_context.resolve()
+                with self.metrics.measure('update_render_result'):
+                    self._update_render_result((0, 0), (self.width, self.height),
+                                               layer_name=self.render_layer_name)
 
             log('Finish do_resolve')
 
@@ -22,6 +22,7 @@ import textwrap
 import bpy
 import numpy as np
 import gpu
+import mathutils
 
 from gpu_extras.presets import draw_texture_2d
 from bpy_extras import view3d_utils
@@ -29,9 +30,9 @@ from bpy_extras import view3d_utils
 import pyrpr
 from .engine import Engine
 
-from rprblender.export import camera, material, world, object, instance, volume
+from rprblender.export import camera, material, world, object, instance
 from rprblender.export.mesh import assign_materials
-from rprblender import utils
+from rprblender import utils, config
 from rprblender.utils.user_settings import get_user_settings
 
 from rprblender.utils import logging, BLENDER_VERSION
@@ -42,6 +43,13 @@ MIN_ADAPT_RATIO_DIFF = 0.2
 MIN_ADAPT_RESOLUTION_RATIO_DIFF = 0.1
 GPU_TEXTURE_CHANNELS = 4
 
+# progressive sync: scene keys are split into chunks sorted by screen coverage,
+# chunks which weren't synced in time limit are synced during render in not more
+# than PROGRESSIVE_SYNC_MAX_RESTARTS batches after every PROGRESSIVE_SYNC_ITERATIONS
+PROGRESSIVE_SYNC_CHUNKS = 32
+PROGRESSIVE_SYNC_MAX_RESTARTS = 3
+PROGRESSIVE_SYNC_ITERATIONS = 4
+
 
 @dataclass(init=False, eq=True)
 class ViewportSettings:
@@ -221,6 +229,15 @@ class ViewportEngine(Engine):
         self.selected_objects = None
         self.frame_current = None
 
+        # progressive sync data
+        self.progressive_sync_camera: camera.CameraData = None
+        self.progressive_sync_keys = set()
+        self.progressive_sync_batches = []
+
+        # materials which have to be re-exported on frame change,
+        # see _get_frame_dependent_materials()
+        self.frame_dependent_materials = None
+
         self.user_settings = get_user_settings()
 
     def stop_render(self):
@@ -249,6 +266,13 @@ class ViewportEngine(Engine):
         self.notify_status("Starting...", "Sync")
         time_begin = time.perf_counter()
 
+        if self.progressive_sync_camera:
+            self._do_progressive_sync(depsgraph, time_begin)
+            self._sync_catchers(depsgraph)
+            self.frame_dependent_materials = self._get_frame_dependent_materials(depsgraph)
+            self.is_synced = True
+            return
+
         # exporting objects
         material_override = depsgraph.view_layer.material_override
         objects_len = len(depsgraph.objects)
@@ -284,6 +308,11 @@ class ViewportEngine(Engine):
                           indirect_only=indirect_only, material_override=material_override,
                           frame_current=self.frame_current)
 
+        self._sync_catchers(depsgraph)
+        self.frame_dependent_materials = self._get_frame_dependent_materials(depsgraph)
+        self.is_synced = True
+
+    def _sync_catchers(self, depsgraph):
         # shadow catcher
         if depsgraph.scene.rpr.viewport_render_mode != 'FULL':  # non-Legacy modes
             self.rpr_context.sync_catchers(False)
@@ -299,7 +328,143 @@ class ViewportEngine(Engine):
         else:
             self.rpr_context.sync_catchers(depsgraph.scene.render.film_transparent)
 
-        self.is_synced = True
+    def _get_progressive_sync_keys(self, depsgraph):
+        """
+        Returns keys of depsgraph objects and instances sorted by estimated screen coverage.
+        Lights go first as they affect the whole image.
+        """
+        light_keys = []
+        keys = []
+        centers = []
+        radii = []
+
+        # local bounding spheres of source objects
+        bounds = {}
+
+        def add_bounds(key, obj, matrix_world):
+            bound = bounds.get(obj.name_full)
+            if bound is None:
+                box = np.array(obj.bound_box, dtype=np.float32).reshape(-1, 3)
+                box_min, box_max = box.min(axis=0), box.max(axis=0)
+                bound = bounds[obj.name_full] = (mathutils.Vector((box_min + box_max) * 0.5),
+                                                 float(np.linalg.norm(box_max - box_min)) * 0.5)
+
+            keys.append(key)
+            centers.append(matrix_world @ bound[0])
+            radii.append(bound[1] * max(abs(v) for v in matrix_world.to_scale()))
+
+        for obj in self.depsgraph_objects(depsgraph):
+            if obj.type == 'LIGHT':
+                light_keys.append(object.key(obj))
+            else:
+                add_bounds(object.key(obj), obj, obj.matrix_world)
+
+        for inst in self.depsgraph_instances(depsgraph):
+            if inst.object.type == 'LIGHT':
+                light_keys.append(instance.key(inst))
+            else:
+                add_bounds(instance.key(inst), inst.object, inst.matrix_world)
+
+        if not keys:
+            return light_keys
+
+        coverage = self.progressive_sync_camera.get_screen_coverage(
+            np.array(centers, dtype=np.float32).reshape(-1, 3), np.array(radii, dtype=np.float32))
+
+        return light_keys + [keys[i] for i in np.argsort(-coverage, kind='stable')]
+
+    def _do_progressive_sync(self, depsgraph, time_begin):
+        """
+        Syncs objects with the biggest screen coverage first till sync time limit is reached.
+        The rest of objects are split into batches which are synced during render.
+        """
+        self.notify_status("Sorting objects...", "Sync")
+
+        keys = self._get_progressive_sync_keys(depsgraph)
+        keys_len = len(keys)
+        chunks = [set(keys[keys_len * i // PROGRESSIVE_SYNC_CHUNKS:
+                           keys_len * (i + 1) // PROGRESSIVE_SYNC_CHUNKS])
+                  for i in range(PROGRESSIVE_SYNC_CHUNKS)]
+        chunks = [chunk for chunk in chunks if chunk]
+
+        self.progressive_sync_keys = set(keys)
+
+        sync_time_limit = self.user_settings.viewport_progressive_sync_time
+        synced_len = 0
+        while chunks:
+            if self.is_finished:
+                raise FinishRenderException
+
+            time_sync = time.perf_counter() - time_begin
+            # at least one chunk is synced before render
+            if synced_len > 0 and time_sync >= sync_time_limit:
+                break
+
+            self.notify_status(f"Time {time_sync:.1f} | Objects ({synced_len}/{keys_len})", "Sync")
+
+            chunk = chunks.pop(0)
+            self._sync_progressive_chunk(depsgraph, chunk)
+            synced_len += len(chunk)
+
+        batches_len = min(len(chunks), PROGRESSIVE_SYNC_MAX_RESTARTS)
+        self.progressive_sync_batches = [
+            chunks[len(chunks) * i // batches_len: len(chunks) * (i + 1) // batches_len]
+            for i in range(batches_len)
+        ]
+
+        log(f"Progressive sync: {synced_len}/{keys_len} objects synced before render, "
+            f"{batches_len} batches left")
+
+    def _sync_progressive_chunk(self, depsgraph, keys):
+        """ Syncs depsgraph objects and instances with keys which aren't synced yet """
+        material_override = depsgraph.view_layer.material_override
+
+        for obj in self.depsgraph_objects(depsgraph):
+            obj_key = object.key(obj)
+            if obj_key not in keys:
+                continue
+
+            indirect_only = obj.original.indirect_only_get(view_layer=depsgraph.view_layer)
+            rpr_obj = self.rpr_context.objects.get(obj_key, None)
+            if isinstance(rpr_obj, pyrpr.Shape) and not rpr_obj.is_visible:
+                # object was already exported as hidden master of synced instances
+                object.sync_update(self.rpr_context, obj, False, False,
+                                   indirect_only=indirect_only, material_override=material_override,
+                                   frame_current=self.frame_current)
+
+            elif obj_key not in self.rpr_context.objects:
+                object.sync(self.rpr_context, obj,
+                            indirect_only=indirect_only, material_override=material_override,
+                            frame_current=self.frame_current)
+
+        if any(isinstance(k, tuple) for k in keys):
+            for inst in self.depsgraph_instances(depsgraph):
+                instance_key = instance.key(inst)
+                if instance_key not in keys or instance_key in self.rpr_context.objects:
+                    continue
+
+                indirect_only = inst.parent.original.indirect_only_get(view_layer=depsgraph.view_layer)
+                instance.sync(self.rpr_context, inst,
+                              indirect_only=indirect_only, material_override=material_override,
+                              frame_current=self.frame_current)
+
+        self.progressive_sync_keys -= keys
+
+    def _sync_progressive_batch(self):
+        """ Syncs next batch of objects postponed by progressive sync """
+        depsgraph = self.rpr_context.blender_data['depsgraph']
+        batch = self.progressive_sync_batches.pop(0)
+
+        for chunk in batch:
+            if self.is_finished:
+                raise FinishRenderException
+
+            self.notify_status(f"Objects left: {len(self.progressive_sync_keys)}", "Sync")
+            with self.render_lock:
+                self._sync_progressive_chunk(depsgraph, chunk)
+
+        with self.render_lock:
+            self._sync_catchers(depsgraph)
 
     def _do_render(self):
         # RENDERING
@@ -419,6 +584,14 @@ class ViewportEngine(Engine):
                 if is_adaptive and active_pixels == 0:
                     is_last_iteration = True
 
+                if self.progressive_sync_batches and \
+                        (is_last_iteration or iteration >= PROGRESSIVE_SYNC_ITERATIONS):
+                    # exporting next batch of postponed objects and restarting render
+                    is_last_iteration = False
+                    self._sync_progressive_batch()
+                    self.restart_render_event.set()
+                    continue
+
                 if is_last_iteration:
                     break
 
@@ -487,9 +660,13 @@ class ViewportEngine(Engine):
         self.frame_current = depsgraph.scene.frame_current
 
         scene.rpr.init_rpr_context(self.rpr_context, is_final_engine=False)
+        self.rpr_context.set_lazy_names(not config.pyrpr_log_calls)
 
         self.rpr_context.blender_data['depsgraph'] = depsgraph
 
+        if self.user_settings.viewport_progressive_sync:
+            self.progressive_sync_camera = camera.CameraData.init_from_context(context)
+
         self.shading_data = ShadingData(context)
         self.view_layer_data = ViewLayerSettings(view_layer)
 
@@ -529,6 +706,7 @@ class ViewportEngine(Engine):
         scene.rpr.export_render_mode(self.rpr_context)
         scene.rpr.export_viewport_ray_depth(self.rpr_context)
         self.rpr_context.texture_compression = scene.rpr.texture_compression
+        self.rpr_context.volume_grid_epsilon = scene.rpr.volume_grid_epsilon
         scene.rpr.export_pixel_filter(self.rpr_context)
         scene.rpr.export_compatibility_settings(self.rpr_context)
 
@@ -574,30 +752,31 @@ class ViewportEngine(Engine):
             if len(updates) == 1 and isinstance(updates[0][0], bpy.types.Object) and updates[0][0].type == 'CAMERA':
                 return
 
+            # material, collection or object data changes could change the set of frame dependent materials
+            if sync_collection or any(isinstance(update[0], (bpy.types.Material, bpy.types.Collection)) or
+                                      (isinstance(update[0], bpy.types.Object) and update[1])
+                                      for update in updates):
+                self.frame_dependent_materials = None
+
             # despgraph doesn't provide updates for ShaderNodeTexImage with activated Auto Refresh option
-            # get materials which contain ShaderNodeTexImage with SEQUENCE source, to make force update
+            # force update of materials which contain ShaderNodeTexImage with SEQUENCE source
+            # and materials of smoke domains
             if isinstance(updates[0][0], bpy.types.Scene) and \
                     self.frame_current != depsgraph.scene.frame_current:
                 self.frame_current = depsgraph.scene.frame_current
 
-                materials = set(material_slot.material for obj in self.depsgraph_objects(depsgraph)
-                                for material_slot in obj.material_slots if material_slot.material)
-                materials -= set(update[0] for update in updates)
-                for mat in materials:
-                    image_nodes = material.get_material_nodes_by_type(mat, 'ShaderNodeTexImage')
-
-                    if image_nodes:
-                        use_auto_refresh = any(node.image_user.use_auto_refresh
-                                               for node in image_nodes
-                                               if node.image and node.image.source == 'SEQUENCE')
-                        if use_auto_refresh:
-                            updates.insert(1, (mat, None, None))
-
-                volume_domain_mat = set(material_slot.material for obj in self.depsgraph_objects(depsgraph) if volume.get_smoke_modifier(obj)
-                                  for material_slot in obj.material_slots if material_slot.material)
-                volume_domain_mat -= set(update[0] for update in updates)
-                for mat in volume_domain_mat:
-                    updates.append((mat, None, None))
+                if self.frame_dependent_materials is None:
+                    self.frame_dependent_materials = self._get_frame_dependent_materials(depsgraph)
+
+                sequence_materials, smoke_materials = self.frame_dependent_materials
+                updated_materials = set(update[0].original for update in updates
+                                        if isinstance(update[0], bpy.types.Material))
+
+                for mat in sequence_materials - updated_materials:
+                    updates.insert(1, (depsgraph.id_eval_get(mat), None, None))
+
+                for mat in smoke_materials - updated_materials:
+                    updates.append((depsgraph.id_eval_get(mat), None, None))
 
             # only a selection change
             if context.selected_objects != self.selected_objects \
@@ -910,8 +1089,9 @@ class ViewportEngine(Engine):
         # sets of objects keys to remove from rpr
         object_keys_to_remove = rpr_object_keys - depsgraph_keys
 
-        # sets of objects keys to export into rpr
-        object_keys_to_export = depsgraph_keys - rpr_object_keys
+        # sets of objects keys to export into rpr,
+        # objects postponed by progressive sync will be exported during render
+        object_keys_to_export = depsgraph_keys - rpr_object_keys - self.progressive_sync_keys
 
         if object_keys_to_remove:
             log("Object keys to remove", object_keys_to_remove)
@@ -995,44 +1175,6 @@ class ViewportEngine(Engine):
 
         return res
 
-    def update_material_on_scene_objects(self, mat, depsgraph):
-        """ Find all mesh material users and reapply material """
-        material_override = depsgraph.view_layer.material_override
-
-        if material_override and material_override.name == mat.name:
-            objects = self.depsgraph_objects(depsgraph)
-            active_mat = material_override
-        else:
-            # Geometry Nodes allowed to apply material via node tree, in that case slot name always ''
-            # it's needed to check material name instead
-            objects = tuple(obj for obj in self.depsgraph_objects(depsgraph)
-                            if mat.name in (getattr(ms.material, 'name', '') for ms in obj.material_slots))
-            active_mat = mat
-
-        updated = False
-        for obj in objects:
-            rpr_material = material.sync_update(self.rpr_context, active_mat, obj=obj)
-            rpr_volume = material.sync_update(self.rpr_context, active_mat, 'Volume', obj=obj)
-            rpr_displacement = material.sync_update(self.rpr_context, active_mat, 'Displacement', obj=obj)
-
-            if not rpr_material and not rpr_volume and not rpr_displacement:
-                continue
-
-            indirect_only = obj.original.indirect_only_get(view_layer=depsgraph.view_layer)
-
-            if object.key(obj) not in self.rpr_context.objects:
-                object.sync(self.rpr_context, obj, indirect_only=indirect_only,
-                            frame_current=self.frame_current)
-                updated = True
-                continue
-
-            updated |= object.sync_update(self.rpr_context, obj, False, False,
-                                          indirect_only=indirect_only,
-                                          material_override=material_override,
-                                          frame_current=self.frame_current)
-
-        return updated
-
     def update_render(self, scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer):
         ''' update settings if changed while live returns True if restart needed '''
         restart = scene.rpr.export_render_mode(self.rpr_context)
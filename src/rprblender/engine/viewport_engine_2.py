@@ -17,7 +17,12 @@ import threading
 
 import pyrpr
 
-from .viewport_engine import ViewportEngine, ViewportSettings, FinishRenderException
+from .viewport_engine import (
+    ViewportEngine,
+    ViewportSettings,
+    FinishRenderException,
+    PROGRESSIVE_SYNC_ITERATIONS,
+)
 from .context import RPRContext2
 
 from rprblender.utils import logging
@@ -209,6 +214,14 @@ class ViewportEngine2(ViewportEngine):
                 iteration += update_iterations
                 self.is_last_iteration = iteration >= self.render_iterations
 
+                if self.progressive_sync_batches and \
+                        (self.is_last_iteration or iteration >= PROGRESSIVE_SYNC_ITERATIONS):
+                    # exporting next batch of postponed objects and restarting render
+                    self.is_last_iteration = False
+                    self._sync_progressive_batch()
+                    self.restart_render_event.set()
+                    continue
+
                 if self.is_last_iteration:
                     break
 
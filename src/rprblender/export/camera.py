@@ -222,6 +222,61 @@ class CameraData:
 
         rpr_camera.set_transform(np.array(self.transform, dtype=np.float32))
 
+    def get_screen_coverage(self, centers: np.array, radii: np.array):
+        """
+        Estimates which part of the screen is covered by bounding spheres
+        :param centers: (N, 3) array of bounding spheres centers in world space
+        :param radii: (N,) array of bounding spheres radii
+        :return: (N,) array of covered screen parts in range [0.0, 1.0]
+        """
+
+        world_to_camera = np.linalg.inv(np.array(self.transform, dtype=np.float32).reshape(4, 4))
+        pos = centers @ world_to_camera[:3, :3].T + world_to_camera[:3, 3]
+        depth = -pos[:, 2]  # camera looks along -Z axis
+
+        if self.mode == pyrpr.CAMERA_MODE_PERSPECTIVE:
+            # half size of view frustum at distance 1.0
+            half_size = tuple(self.sensor_size[i] * 0.5 / self.focal_length for i in (0, 1))
+            distance = np.maximum(depth, max(self.clip_plane[0], 1e-6))
+            scale_x = 1.0 / (distance * half_size[0])
+            scale_y = 1.0 / (distance * half_size[1])
+
+        elif self.mode == pyrpr.CAMERA_MODE_ORTHOGRAPHIC:
+            scale_x = 2.0 / self.ortho_size[0]
+            scale_y = 2.0 / self.ortho_size[1]
+
+        else:
+            # panoramic camera sees all directions, using solid angle of bounding sphere
+            distance = np.maximum(np.linalg.norm(pos, axis=1), 1e-6)
+            return np.minimum((radii / distance) ** 2, 1.0)
+
+        x, y = pos[:, 0] * scale_x, pos[:, 1] * scale_y
+        rx, ry = radii * scale_x, radii * scale_y
+
+        # overlapping of sphere bounding square with screen square [-1, 1] x [-1, 1]
+        overlap_x = np.clip(np.minimum(x + rx, 1.0) - np.maximum(x - rx, -1.0), 0.0, 2.0)
+        overlap_y = np.clip(np.minimum(y + ry, 1.0) - np.maximum(y - ry, -1.0), 0.0, 2.0)
+        coverage = overlap_x * overlap_y * 0.25
+
+        # objects out of clip planes range aren't visible
+        coverage[(depth + radii < self.clip_plane[0]) | (depth - radii > self.clip_plane[1])] = 0.0
+
+        return coverage
+
+
+def get_views(depsgraph, cameras, ratio, subdivision_camera=None):
+    """
+    Returns views of camera objects for RPRContext.render_views():
+    list of (camera key, CameraData, subdivision CameraData).
+    If subdivision_camera is set then adaptive subdivision is calculated once from it for all views
+    """
+    def get_camera_data(obj):
+        obj = depsgraph.objects.get(object.key(obj), obj)
+        return CameraData.init_from_camera(obj.data, obj.matrix_world, ratio)
+
+    subdivision_data = get_camera_data(subdivision_camera) if subdivision_camera else None
+    return [(object.key(obj), get_camera_data(obj), subdivision_data) for obj in cameras]
+
 
 def sync(rpr_context: RPRContext, obj: bpy.types.Object):
     """
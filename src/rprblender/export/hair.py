@@ -20,6 +20,7 @@ import bpy
 from . import particle, object, instance, material
 from rprblender.utils import get_data_from_collection
 
+from rprblender.utils import render_metrics
 from rprblender.utils import logging
 log = logging.Log(tag='export.hair')
 
@@ -179,6 +180,7 @@ def hair_p_sys(emitter):
     return (p_sys for p_sys in emitter.particle_systems if p_sys.settings.type == 'HAIR')
 
 
+@render_metrics.timed('hair')
 def sync(rpr_context, emitter: bpy.types.Object):
     """ sync the particle system """
     from rprblender.engine.render_engine import RenderEngine
@@ -214,7 +216,7 @@ def sync(rpr_context, emitter: bpy.types.Object):
         rpr_hair = rpr_context.create_curve(hair_key, curve_data.points,
                                             curve_data.points_radii,
                                             curve_data.uvs)
-        rpr_hair.set_name(str(hair_key))
+        rpr_hair.set_name(hair_key)
         rpr_context.scene.attach(rpr_hair)
 
         rpr_material = particle.get_particle_system_material(rpr_context, p_sys, emitter)
@@ -253,7 +255,7 @@ def sync_curves(rpr_context, obj: bpy.types.Object):
     obj_key = object.key(obj)
 
     rpr_hair = rpr_context.create_curve_object(obj_key, curve_data.points, curve_data.points_radii, curve_data.uvs)
-    rpr_hair.set_name(str(obj_key))
+    rpr_hair.set_name(obj_key)
     rpr_context.scene.attach(rpr_hair)
 
     if obj.material_slots:
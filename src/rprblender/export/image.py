@@ -23,6 +23,7 @@ from rprblender import utils
 from rprblender.engine import context
 from rprblender.engine.context_hybridpro import RPRContext as RPRContextHybridPro
 
+from rprblender.utils import render_metrics
 from rprblender.utils import logging
 from rprblender.utils import get_sequence_frame_file_path
 
@@ -53,6 +54,12 @@ def key(image: bpy.types.Image, color_space, frame_number=None, UDIM_tile=0):
     return (image.name, color_space)
 
 
+def is_sequence_key(image_key):
+    """ Check if image key was generated for frame of image sequence """
+    return len(image_key) == 3
+
+
+@render_metrics.timed('image')
 def sync(rpr_context, image: bpy.types.Image, use_color_space=None, frame_number=None):
     """ Creates pyrpr.Image from bpy.types.Image """
     from rprblender.engine.export_engine import ExportEngine
@@ -84,11 +91,11 @@ def sync(rpr_context, image: bpy.types.Image, use_color_space=None, frame_number
 
                 tile_image = rpr_context.create_image_file(tile_key, tile_path)
                 set_image_gamma(tile_image, image, color_space, rpr_context)
-                tile_image.set_name(str(tile_key))
+                tile_image.set_name(tile_key)
 
                 rpr_image.set_udim_tile(tile.number, tile_image)
 
-            rpr_image.set_name(str(image_key))
+            rpr_image.set_name(image_key)
 
             return rpr_image
 
@@ -114,7 +121,7 @@ def sync(rpr_context, image: bpy.types.Image, use_color_space=None, frame_number
         data = np.flipud(data.reshape(image.size[1], image.size[0], image.channels))
         rpr_image = rpr_context.create_image_data(image_key, np.ascontiguousarray(data))
 
-    rpr_image.set_name(str(image_key))
+    rpr_image.set_name(image_key)
 
     set_image_gamma(rpr_image, image, color_space, rpr_context)
 
@@ -17,6 +17,7 @@ import bpy
 
 from . import object, light, mesh, hair
 from rprblender.engine.context import RPRContext
+from rprblender.utils import render_metrics
 from rprblender.utils import logging
 log = logging.Log(tag='export.instance')
 
@@ -29,6 +30,7 @@ def get_transform(instance: bpy.types.DepsgraphObjectInstance):
     return np.array(instance.matrix_world, dtype=np.float32).reshape(4, 4)
 
 
+@render_metrics.timed('instance')
 def sync(rpr_context, instance: bpy.types.DepsgraphObjectInstance, **kwargs):
     """ sync the blender instance """
 
@@ -52,7 +54,7 @@ def sync(rpr_context, instance: bpy.types.DepsgraphObjectInstance, **kwargs):
             rpr_mesh.set_visibility(False)
 
         rpr_shape = rpr_context.create_instance(instance_key, rpr_mesh)
-        rpr_shape.set_name(str(instance_key))
+        rpr_shape.set_name(instance_key)
 
         transform = get_transform(instance)
         rpr_shape.set_transform(transform)
@@ -69,13 +71,76 @@ def sync(rpr_context, instance: bpy.types.DepsgraphObjectInstance, **kwargs):
     elif obj.type == 'LIGHT':
         light.sync(rpr_context, obj, instance_key)
         rpr_light = rpr_context.objects[instance_key]
-        rpr_light.set_name(str(instance_key))
+        rpr_light.set_name(instance_key)
         rpr_light.set_transform(get_transform(instance))
 
     else:
         raise ValueError("Unsupported object type for instance", instance, obj, obj.type)
 
 
+class InstancesBatch:
+    """
+    Collects consecutive depsgraph instances of the same mesh object and exports them
+    with RPRContext.create_instances_batch(). Depsgraph instances can't be kept after iteration,
+    therefore only instance keys and transforms are stored.
+    """
+
+    MAX_SIZE = 65536
+
+    def __init__(self, rpr_context):
+        self.rpr_context = rpr_context
+        self.batch_key = None
+        self.rpr_mesh = None
+        self.visibility_flags = None
+        self.keys = []
+        self.transforms = []
+
+    def add(self, instance: bpy.types.DepsgraphObjectInstance, indirect_only=False):
+        """ Adds instance to batch, returns False if instance has to be exported by sync() """
+        obj = instance.instance_object if instance.parent.name != instance.object.name else instance.object
+        if obj.type not in ('MESH', 'CURVE', 'FONT', 'SURFACE', 'META'):
+            return False
+
+        # per instance settings and motion blur are exported by sync()
+        rpr_props = instance.object.rpr
+        if rpr_props.shadowcatcher or rpr_props.reflection_catcher or any(rpr_props.shadow_color) \
+                or next(hair.hair_p_sys(instance.object), None):
+            return False
+
+        instance_key = key(instance)
+        if instance_key in self.rpr_context.transform_cache:
+            return False
+
+        obj_key = object.key(obj)
+        rpr_mesh = self.rpr_context.objects.get(obj_key, None)
+        if not rpr_mesh:
+            return False
+
+        batch_key = (obj_key, instance.object.name, indirect_only)
+        if batch_key != self.batch_key or len(self.keys) >= self.MAX_SIZE:
+            self.flush()
+            self.batch_key = batch_key
+            self.rpr_mesh = rpr_mesh
+            self.visibility_flags = mesh.get_visibility_flags(instance.object, indirect_only)
+
+        self.keys.append(instance_key)
+        self.transforms.append(get_transform(instance))
+        return True
+
+    @render_metrics.timed('instance')
+    def flush(self):
+        """ Exports collected instances """
+        if self.keys:
+            log("sync batch", self.batch_key, len(self.keys))
+            self.rpr_context.create_instances_batch(self.keys, self.rpr_mesh, np.array(self.transforms),
+                                                    self.visibility_flags)
+
+        self.batch_key = None
+        self.rpr_mesh = None
+        self.keys = []
+        self.transforms = []
+
+
 def sync_update(rpr_context: RPRContext, instance: bpy.types.DepsgraphObjectInstance, is_updated_geometry, is_updated_transform, **kwargs):
     """ Update existing instance or create a new instance """
     log("sync_update", instance)
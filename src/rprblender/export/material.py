@@ -17,6 +17,7 @@ import bpy
 from rprblender.engine.context import RPRContext
 from rprblender.nodes.blender_nodes import ShaderNodeOutputMaterial
 
+from rprblender.utils import render_metrics
 from rprblender.utils import logging
 from . import object
 log = logging.Log(tag='export.Material')
@@ -67,6 +68,7 @@ def get_material_input_node(material, input_socket_key: str):
     return socket_in.links[0].from_node
 
 
+@render_metrics.timed('material')
 def sync(rpr_context: RPRContext, material: bpy.types.Material, input_socket_key='Surface', *,
          obj: bpy.types.Object = None):
     """
@@ -32,11 +32,49 @@ log = logging.Log(tag='export.mesh')
 
 NUM_TRIANGLES_WARNING = 1000000
 
+# deformation is usually found in sampled elements, rest of data is compared by chunks
+DEFORMATION_SAMPLES_COUNT = 1024
+DEFORMATION_CHUNK_SIZE = 1024 * 1024
+
 
 def key(obj):
     return f"{obj.data.name_full}_{obj.original.type}"
 
 
+def is_array_changed(data: np.array, next_data: np.array):
+    """ Compares arrays of the same shape, stops on first found difference """
+    data = data.reshape(-1)
+    next_data = next_data.reshape(-1)
+
+    step = max(len(data) // DEFORMATION_SAMPLES_COUNT, 1)
+    if np.any(data[::step] != next_data[::step]):
+        return True
+
+    for i in range(0, len(data), DEFORMATION_CHUNK_SIZE):
+        if np.any(data[i:i + DEFORMATION_CHUNK_SIZE] != next_data[i:i + DEFORMATION_CHUNK_SIZE]):
+            return True
+
+    return False
+
+
+def is_deformed(data, deformation_data):
+    """ Checks if mesh data is deformed at motion blur frame, deformed mesh has to keep its topology """
+    if data.vertices.shape != deformation_data.vertices.shape or \
+            data.normals.shape != deformation_data.normals.shape:
+        return False
+
+    return is_array_changed(data.vertices, deformation_data.vertices) and \
+        is_array_changed(data.normals, deformation_data.normals)
+
+
+def get_motion_array(data: np.array, next_data: np.array):
+    """ Returns contiguous array of 2 motion steps filled in place """
+    motion_data = np.empty((2 * len(data), *data.shape[1:]), dtype=np.float32)
+    motion_data[:len(data)] = data
+    motion_data[len(data):] = next_data
+    return motion_data
+
+
 @dataclass(init=False)
 class MeshData:
     """ Dataclass which holds all mesh settings. It is used also for area lights creation """
@@ -297,28 +335,35 @@ def assign_override_material(rpr_context, rpr_shape, obj, material_override) ->
     return bool(rpr_material or rpr_displacement)
 
 
-def export_visibility(obj, rpr_shape, indirect_only):
-    """ Exports visibility settings """
+def get_visibility_flags(obj, indirect_only):
+    """ Returns visibility settings as {visibility_type: visible} for pyrpr.Shape.set_visibility_ex() """
     if BLENDER_VERSION >= '3.0':
-        rpr_shape.set_visibility_primary_only(obj.visible_camera and not indirect_only)
-        rpr_shape.set_visibility_ex("visible.reflection", obj.visible_glossy)
-        rpr_shape.set_visibility_ex("visible.reflection.glossy", obj.visible_glossy)
-        rpr_shape.set_visibility_ex("visible.refraction", obj.visible_transmission)
-        rpr_shape.set_visibility_ex("visible.refraction.glossy", obj.visible_transmission)
-        rpr_shape.set_visibility_ex("visible.diffuse", obj.visible_diffuse)
-        rpr_shape.set_shadow(obj.visible_shadow)
-
+        camera, glossy, transmission, diffuse, shadow = \
+            obj.visible_camera, obj.visible_glossy, obj.visible_transmission, \
+            obj.visible_diffuse, obj.visible_shadow
     else:
         visibility = obj.cycles_visibility
-        rpr_shape.set_visibility_primary_only(visibility.camera and not indirect_only)
-        rpr_shape.set_visibility_ex("visible.reflection", visibility.glossy)
-        rpr_shape.set_visibility_ex("visible.reflection.glossy", visibility.glossy)
-        rpr_shape.set_visibility_ex("visible.refraction", visibility.transmission)
-        rpr_shape.set_visibility_ex("visible.refraction.glossy", visibility.transmission)
-        rpr_shape.set_visibility_ex("visible.diffuse", visibility.diffuse)
-        rpr_shape.set_shadow(visibility.shadow)
-
-    rpr_shape.set_visibility_ex("visible.receive_shadow", obj.rpr.receive_shadow)
+        camera, glossy, transmission, diffuse, shadow = \
+            visibility.camera, visibility.glossy, visibility.transmission, \
+            visibility.diffuse, visibility.shadow
+
+    return {
+        "visible.primary": camera and not indirect_only,
+        "visible.reflection": glossy,
+        "visible.reflection.glossy": glossy,
+        "visible.refraction": transmission,
+        "visible.refraction.glossy": transmission,
+        "visible.diffuse": diffuse,
+        "visible.shadow": shadow,
+        "visible.receive_shadow": obj.rpr.receive_shadow,
+    }
+
+
+def export_visibility(obj, rpr_shape, indirect_only):
+    """ Exports visibility settings """
+    for visibility_type, visible in get_visibility_flags(obj, indirect_only).items():
+        rpr_shape.set_visibility_ex(visibility_type, visible)
+
     obj.rpr.set_shadow_color(rpr_shape)
     obj.rpr.set_catchers(rpr_shape)
 
@@ -371,12 +416,22 @@ def sync(rpr_context: RPRContext, obj: bpy.types.Object, **kwargs):
         rpr_mesh = rpr_context.mesh_masters[mesh_key]
         rpr_shape = rpr_context.create_instance(obj_key, rpr_mesh)
     else:
-        data = MeshData.init_from_mesh(mesh, obj=obj)
+        collect_mesh_data = rpr_context.mesh_data_cache is not None and obj.rpr.deformation_blur and \
+            isinstance(rpr_context, RPRContext2)
+
+        # mesh data of animation frame could be already cached as motion blur data of previous frame
+        data = rpr_context.mesh_data_cache.get(obj_key) if collect_mesh_data else None
+        if data is None:
+            data = MeshData.init_from_mesh(mesh, obj=obj)
         if not data:
             rpr_context.create_empty_object(obj_key)
             return
 
-        deformation_data = rpr_context.deformation_cache.get(obj_key)
+        if collect_mesh_data:
+            rpr_context.mesh_data_cache[obj_key] = data
+
+        # deformation data is released as soon as it is exported
+        deformation_data = rpr_context.deformation_cache.pop(obj_key, None)
 
         if smoke_modifier and isinstance(rpr_context, RPRContext2):
             transform = volume.get_transform(obj)
@@ -388,13 +443,11 @@ def sync(rpr_context: RPRContext, obj: bpy.types.Object, **kwargs):
                 {pyrpr.MESH_VOLUME_FLAG: 1}
             )
 
-        elif deformation_data and np.any(data.vertices != deformation_data.vertices) and \
-                np.any(data.normals != deformation_data.normals):
-            vertices = np.concatenate((data.vertices, deformation_data.vertices))
-            normals = np.concatenate((data.normals, deformation_data.normals))
+        elif deformation_data and is_deformed(data, deformation_data):
             rpr_shape = rpr_context.create_mesh(
                 obj_key,
-                np.ascontiguousarray(vertices), np.ascontiguousarray(normals), data.uvs,
+                get_motion_array(data.vertices, deformation_data.vertices),
+                get_motion_array(data.normals, deformation_data.normals), data.uvs,
                 data.vertex_indices, data.normal_indices, data.uv_indices,
                 data.num_face_vertices,
                 {pyrpr.MESH_MOTION_DIMENSION: 2}
@@ -469,4 +522,5 @@ def cache_blur_data(rpr_context, obj: bpy.types.Object, mesh=None):
         rpr_context.transform_cache[obj_key] = object.get_transform(obj)
 
     if obj.rpr.deformation_blur and isinstance(rpr_context, RPRContext2):
-        rpr_context.deformation_cache[obj_key] = MeshData.init_from_mesh(mesh if mesh else obj.data)
+        # cached data could be exported by mesh.sync() of the next frame, see AnimationEngine.cache_blur_data()
+        rpr_context.deformation_cache[obj_key] = MeshData.init_from_mesh(mesh if mesh else obj.data, obj=obj)
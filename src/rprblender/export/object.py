@@ -18,6 +18,7 @@ import numpy as np
 import bpy
 
 from . import mesh, light, camera, to_mesh, volume, openvdb, particle, hair
+from rprblender.utils import render_metrics
 from rprblender.utils import logging
 log = logging.Log(tag='export.object')
 
@@ -30,6 +31,7 @@ def get_transform(obj: bpy.types.Object):
     return np.array(obj.matrix_world, dtype=np.float32).reshape(4, 4)
 
 
+@render_metrics.timed('object')
 def sync(rpr_context, obj: bpy.types.Object, **kwargs):
     """ sync the object and any data attached """
 
@@ -63,7 +63,7 @@ def sync(rpr_context, obj: bpy.types.Object, **kwargs):
             None,
             {pyrpr.MESH_VOLUME_FLAG: 1}
         )
-    rpr_mesh.set_name(str(obj_key))
+    rpr_mesh.set_name(obj_key)
     rpr_mesh.set_volume_material(volume_node)
     rpr_mesh.set_transform(get_transform(obj))
     rpr_context.scene.attach(rpr_mesh)
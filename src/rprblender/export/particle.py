@@ -83,28 +83,33 @@ def sync(rpr_context, emitter: bpy.types.Object):
             master_shape.set_material(rpr_material)
 
         # walk through particle list and create rpr_instances of ones that are ALIVE
+        instances_keys = []
+        transforms = []
+        prev_transforms = []
         for i, particle in p_sys.particles.items():
             if not particle.alive_state == 'ALIVE':
                 continue
 
-            instance_key = (particle_key, i)
-            instance = rpr_context.create_instance(instance_key, master_shape)
+            instances_keys.append((particle_key, i))
 
-            loc = mathutils.Matrix.Translation(particle.location)
             scale = mathutils.Matrix.Scale(particle.size, 4)
-            rot = mathutils.Quaternion(particle.rotation)
-            mat = np.array(loc @ rot.to_matrix().to_4x4() @ scale, dtype=np.float32).reshape(4, 4)
-
-            rpr_context.scene.attach(instance)
-            instance.set_transform(mat)
-            instance.set_visibility(True)
+            rot = mathutils.Quaternion(particle.rotation).to_matrix().to_4x4()
+            loc = mathutils.Matrix.Translation(particle.location)
+            transforms.append(np.array(loc @ rot @ scale, dtype=np.float32).reshape(4, 4))
 
             # do motion blur.
             if rpr_context.do_motion_blur:
                 prev_loc = mathutils.Matrix.Translation(particle.prev_location)
-                prev_mat = np.array(prev_loc @ rot.to_matrix().to_4x4() @ scale,
-                                    dtype=np.float32).reshape(4, 4)
-                instance.set_motion_transform(prev_mat)
+                prev_transforms.append(np.array(prev_loc @ rot @ scale, dtype=np.float32).reshape(4, 4))
+
+        if not instances_keys:
+            continue
+
+        instances = rpr_context.create_instances_batch(instances_keys, master_shape, np.array(transforms))
+        for i, instance in enumerate(instances):
+            instance.set_visibility(True)
+            if prev_transforms:
+                instance.set_motion_transform(prev_transforms[i])
 
 
 def sync_update(rpr_context, emitter: bpy.types.Object,
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #********************************************************************
+import os
+import re
+import threading
 
 import numpy as np
 
@@ -23,6 +26,7 @@ from rprblender.utils import BLENDER_VERSION, get_prop_array_data, is_zero
 from rprblender.engine.context import RPRContext2
 from rprblender.utils import helper_lib
 
+from rprblender.utils import render_metrics
 from rprblender.utils import logging
 log = logging.Log(tag='export.volume')
 
@@ -63,6 +67,267 @@ def get_domain_resolution(domain, grid_name):
     return x, y, z
 
 
+SMOKE_GRIDS = {
+    # grid name: (domain grid property, components per voxel)
+    'color': ('color_grid', 4),
+    'velocity': ('velocity_grid', 3),
+    'density': ('density_grid', 1),
+    'flame': ('flame_grid', 1),
+    'heat': ('heat_grid', 1),
+    'temperature': ('temperature_grid', 1),
+}
+
+
+VDB_FLOAT_GRID_TYPES = ('float', 'double')
+VDB_VECTOR_GRID_TYPES = ('vec3s', 'vec3d')
+
+# VDB grids are copied by slabs of whole leaf nodes of at most VDB_SLAB_VOXELS voxels
+VDB_LEAF_DIM = 8
+VDB_SLAB_VOXELS = 16 * 1024 ** 2
+
+
+def get_smoke_grid_data(rpr_context, obj, domain, grid_name):
+    """
+    Return sparse data of smoke domain grid as dict with 'size', 'values' and 'indices'.
+    Grid is fetched from Blender and converted once per frame, data is cached in rpr_context.
+    """
+    depsgraph = rpr_context.blender_data.get('depsgraph')
+    frame = depsgraph.scene.frame_current if depsgraph else None
+    if frame != rpr_context.volume_grids_frame:
+        rpr_context.volume_grids_cache.clear()
+        rpr_context.volume_grids_frame = frame
+
+    grid_key = (object.key(obj), grid_name)
+    data = rpr_context.volume_grids_cache.get(grid_key)
+    if data is not None:
+        return data
+
+    prop_name, components = SMOKE_GRIDS[grid_name]
+    size = tuple(get_domain_resolution(domain, grid_name))
+    dense_data = get_prop_array_data(getattr(domain, prop_name))
+    if components > 1:
+        # vector grids are averaged to float by first 3 components
+        dense_data = np.average(dense_data.reshape(-1, components)[:, :3], axis=1)
+
+    # Blender grids are stored with X index changing fastest
+    mask = np.abs(dense_data) > rpr_context.volume_grid_epsilon
+    flat_indices = np.flatnonzero(mask)
+    indices = np.stack(np.unravel_index(flat_indices, size, order='F'), axis=1).astype(np.uint32)
+    data = {
+        'size': size,
+        'values': np.ascontiguousarray(dense_data[flat_indices], dtype=np.float32),
+        'indices': np.ascontiguousarray(indices),
+    }
+
+    log(f"Smoke grid {grid_key}: {len(flat_indices)} of {dense_data.size} voxels, "
+        f"dense {dense_data.nbytes / 1024 ** 2:.2f} MB, "
+        f"sparse {(data['values'].nbytes + data['indices'].nbytes) / 1024 ** 2:.2f} MB")
+
+    rpr_context.volume_grids_cache[grid_key] = data
+    return data
+
+
+def create_smoke_grid(rpr_context, obj, domain, grid_name):
+    """ Create RPR grid from smoke domain grid, returns None for empty grid """
+    data = get_smoke_grid_data(rpr_context, obj, domain, grid_name)
+    if len(data['values']) == 0:
+        return None
+
+    return rpr_context.create_grid_from_array_indices(*data['size'], data['values'], data['indices'])
+
+
+def read_vdb_grid_data(vdb_file, grid_name):
+    """
+    Read sparse data of float or float vector VDB grid as dict with 'size', 'values' and 'indices'.
+    Leaf bounding box is copied by slabs of whole leaf nodes, so dense data of the whole grid isn't allocated,
+    vector values are averaged to float like smoke domain color grids.
+    """
+    import pyopenvdb as vdb
+
+    grids = vdb.readAllGridMetadata(vdb_file)
+    try:
+        grid = next((vdb.read(vdb_file, g.name) for g in grids if g.name == grid_name), None)
+
+    except Exception as err:
+        raise RuntimeError(err)
+
+    if grid is None:
+        return None
+
+    is_vector = grid.valueTypeName in VDB_VECTOR_GRID_TYPES
+    if not is_vector and grid.valueTypeName not in VDB_FLOAT_GRID_TYPES:
+        log.warn("Unsupported VDB grid type", grid_name, grid.valueTypeName)
+        return None
+
+    # indices are relative to leaf bounding box origin, otherwise grid becomes shifted.
+    # Tiles of upper level nodes are clipped by leaf bounding box like with dense copy of the whole grid
+    size = tuple(grid.evalLeafDim())
+    origin = tuple(grid.evalLeafBoundingBox()[0])
+
+    slab_depth = max(VDB_SLAB_VOXELS // max(size[1] * size[2], 1) // VDB_LEAF_DIM, 1) * VDB_LEAF_DIM
+    values_list = []
+    indices_list = []
+    for x in range(0, size[0], slab_depth):
+        shape = (min(slab_depth, size[0] - x), size[1], size[2])
+        slab = np.zeros((*shape, 3) if is_vector else shape, dtype=np.float32)
+        grid.copyToArray(slab, ijk=(origin[0] + x, origin[1], origin[2]))
+        if is_vector:
+            slab = np.average(slab, axis=3)
+
+        flat_indices = np.flatnonzero(slab)
+        if len(flat_indices) == 0:
+            continue
+
+        indices = np.stack(np.unravel_index(flat_indices, shape), axis=1).astype(np.uint32)
+        indices[:, 0] += x
+        indices_list.append(indices)
+        values_list.append(slab.reshape(-1)[flat_indices])
+
+    values = np.concatenate(values_list) if values_list else np.empty(0, dtype=np.float32)
+    indices = np.concatenate(indices_list) if indices_list else np.empty((0, 3), dtype=np.uint32)
+
+    log(f"VDB grid '{grid_name}': {len(values)} active voxels of {np.prod(size)}, "
+        f"sparse {(values.nbytes + indices.nbytes) / 1024 ** 2:.2f} MB")
+
+    return {
+        'size': size,
+        'values': np.ascontiguousarray(values),
+        'indices': np.ascontiguousarray(indices),
+    }
+
+
+def get_volume_frame_filepath(volume: bpy.types.Volume, scene_frame: int):
+    """ Return VDB file path of volume sequence at scene_frame, same as Blender calculates it """
+    duration = volume.frame_duration
+    if not volume.is_sequence or duration == 0:
+        return None
+
+    frame = scene_frame - volume.frame_start + 1
+    if volume.sequence_mode == 'CLIP':
+        if frame < 1 or frame > duration:
+            return None
+
+    elif volume.sequence_mode == 'EXTEND':
+        frame = min(max(frame, 1), duration)
+
+    elif volume.sequence_mode == 'REPEAT':
+        frame = frame % duration or duration
+
+    elif volume.sequence_mode == 'PING_PONG':
+        pingpong_duration = max(duration * 2 - 2, 1)
+        frame = frame % pingpong_duration or pingpong_duration
+        if frame > duration:
+            frame = duration * 2 - frame
+
+    frame += volume.frame_offset
+
+    # replace last number in file name with frame number keeping its digits count
+    filepath = bpy.path.abspath(volume.filepath, library=volume.library)
+    folder, file_name = os.path.split(filepath)
+    match = re.match(r'(.*\D|)(\d+)(\D*)$', file_name)
+    if not match:
+        return None
+
+    prefix, digits, suffix = match.groups()
+    return os.path.join(folder, f"{prefix}{frame:0{len(digits)}d}{suffix}")
+
+
+def normalize_filepath(filepath):
+    """ Normalizes file path to compare paths built by Blender and by python """
+    return os.path.normcase(os.path.normpath(filepath))
+
+
+class VdbPrefetcher:
+    """
+    Reads sparse data of VDB sequence grids for next animation frames in background thread
+    while current frame is rendered. Grids to prefetch are collected during frame sync.
+    """
+
+    def __init__(self):
+        self.cache = {}         # (vdb file, grid name) -> grid data
+        self.requests = []      # (vdb file, grid name) to read by thread
+        self.memory_limit = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+        # volume data name -> (volume, grid names) used during current sync
+        self.used_grids = None
+
+    def begin_sync(self):
+        """ Start collecting grids used by syncing frame """
+        self.used_grids = {}
+
+    def add_used_grid(self, volume: bpy.types.Volume, grid_name):
+        if self.used_grids is None or not volume.is_sequence:
+            return
+
+        self.used_grids.setdefault(volume.name_full, (volume, set()))[1].add(grid_name)
+
+    def end_sync(self, frames, memory_limit: int):
+        """ Start reading grids used by synced frame for next frames, drop not required cached data """
+        requests = []
+        for volume, grid_names in (self.used_grids or {}).values():
+            for frame in frames:
+                vdb_file = get_volume_frame_filepath(volume, frame)
+                if vdb_file and os.path.isfile(vdb_file):
+                    vdb_file = normalize_filepath(vdb_file)
+                    requests.extend((vdb_file, grid_name) for grid_name in sorted(grid_names))
+
+        self.used_grids = None
+
+        with self.lock:
+            self.cache = {key: self.cache[key] for key in requests if key in self.cache}
+            self.requests = [key for key in dict.fromkeys(requests) if key not in self.cache]
+            self.memory_limit = memory_limit
+
+            if not self.requests or (self.thread and self.thread.is_alive()):
+                return
+
+            self.thread = threading.Thread(target=self._read_grids, daemon=True)
+            self.thread.start()
+
+    def get(self, vdb_file, grid_name):
+        """ Return prefetched grid data or None if grid isn't read yet """
+        with self.lock:
+            return self.cache.get((normalize_filepath(vdb_file), grid_name))
+
+    def clear(self):
+        with self.lock:
+            self.cache = {}
+            self.requests = []
+
+    def _memory_size(self):
+        return sum(data['values'].nbytes + data['indices'].nbytes for data in self.cache.values())
+
+    def _read_grids(self):
+        while True:
+            with self.lock:
+                if not self.requests:
+                    break
+
+                if self._memory_size() >= self.memory_limit:
+                    log.warn(f"VDB prefetch memory limit {self.memory_limit / 1024 ** 2:.0f} MB is reached, "
+                             f"{len(self.requests)} grids are skipped")
+                    self.requests = []
+                    break
+
+                key = self.requests.pop(0)
+
+            try:
+                data = read_vdb_grid_data(*key)
+
+            except Exception as err:
+                log.warn("Unable to prefetch VDB grid", key, err)
+                continue
+
+            with self.lock:
+                if data is not None:
+                    self.cache[key] = data
+
+
+vdb_prefetcher = VdbPrefetcher()
+
+
 def create_grid_sampler_node(rpr_context, obj, grid_name, default_grid_name):
 
     grid = None
@@ -74,28 +339,12 @@ def create_grid_sampler_node(rpr_context, obj, grid_name, default_grid_name):
         if len(domain.density_grid) == 0:
             return None
 
-        data = None
-        if grid_name == 'color':
-            data = get_prop_array_data(domain.color_grid).reshape(*get_domain_resolution(domain, grid_name), -1)
-            data = np.average(data[:, :, :, :3], axis=3)
-        elif grid_name == 'velocity':
-            data = get_prop_array_data(domain.velocity_grid).reshape(*get_domain_resolution(domain, grid_name), -1)
-            data = np.average(data[:, :, :, :3], axis=3)
-        elif grid_name == 'density':
-            data = get_prop_array_data(domain.density_grid).reshape(*get_domain_resolution(domain, grid_name))
-        elif grid_name == 'flame':
-            data = get_prop_array_data(domain.flame_grid).reshape(*get_domain_resolution(domain, grid_name))
-        elif grid_name == 'heat':
-            data = get_prop_array_data(domain.heat_grid).reshape(*get_domain_resolution(domain, grid_name))
-        elif grid_name == 'temperature':
-            data = get_prop_array_data(domain.temperature_grid).reshape(*get_domain_resolution(domain, grid_name))
-        elif default_grid_name:
-            return create_grid_sampler_node(rpr_context, obj, default_grid_name, None)
-
-        if is_zero(data):
+        if grid_name not in SMOKE_GRIDS:
+            if default_grid_name:
+                return create_grid_sampler_node(rpr_context, obj, default_grid_name, None)
             return None
 
-        grid = rpr_context.create_grid_from_3d_array(data)
+        grid = create_smoke_grid(rpr_context, obj, domain, grid_name)
 
     elif obj.type == 'VOLUME':
         if not obj.data.grids.is_loaded:
@@ -108,35 +357,12 @@ def create_grid_sampler_node(rpr_context, obj, grid_name, default_grid_name):
         if BLENDER_VERSION >= '3.5':
             obj.data.grids.unload()
 
-            import pyopenvdb as vdb
-
-            grids = vdb.readAllGridMetadata(vdb_file)
-            try:
-                grid = next((vdb.read(vdb_file, g.name) for g in grids if g.name == grid_name), None)
-
-            except Exception as err:
-                raise RuntimeError(err)
-
-            if grid is None:
-                return None
-
-            # TODO: add support for float vector grid
-            if grid.valueTypeName != 'float':
-                return
-
-            size = grid.evalLeafDim()
-            values = np.zeros(shape=size, dtype=np.float32)
-
-            # ijk - specifies the index coordinates of the voxel to be copied to array index
-            # otherwise grid becomes shifted
-            grid.copyToArray(values, ijk=grid.evalLeafBoundingBox()[0])
-            indices = np.nonzero(values)
-
-            data = {
-                'size': size,
-                'values': values[indices],
-                'indices': np.ascontiguousarray(np.transpose(indices).astype('uint32')),
-            }
+            vdb_prefetcher.add_used_grid(obj.data, grid_name)
+            data = vdb_prefetcher.get(vdb_file, grid_name)
+            if data is None:
+                data = read_vdb_grid_data(vdb_file, grid_name)
+                if data is None:
+                    return None
 
         else:
             if not helper_lib.is_openvdb_support:
@@ -148,7 +374,7 @@ def create_grid_sampler_node(rpr_context, obj, grid_name, default_grid_name):
                 obj.data.grids.unload()
                 return None
 
-            # TODO: add support for float vector grid
+            # helper library reads float grids only
             if obj.data.grids[grid_name].channels != 1:
                 obj.data.grids.unload()
                 return None
@@ -167,6 +393,7 @@ def create_grid_sampler_node(rpr_context, obj, grid_name, default_grid_name):
     return node
 
 
+@render_metrics.timed('volume')
 def sync(rpr_context, obj: bpy.types.Object):
     """ sync any volume attached to the object.  
         Note that volumes don't currently use motion blur """
@@ -198,39 +425,35 @@ def sync(rpr_context, obj: bpy.types.Object):
     # creating rpr_volume
     volume_key = key(obj, smoke_modifier)
     rpr_volume = rpr_context.create_hetero_volume(volume_key)
-    rpr_volume.set_name(str(volume_key))
-
-    x, y, z = get_domain_resolution(domain)
-
-    color_grid = get_prop_array_data(domain.color_grid).reshape(x, y, z, -1)
+    rpr_volume.set_name(volume_key)
 
     # set albedo grid
-    albedo_data = np.average(color_grid[:, :, :, :3], axis=3)
-    albedo_grid = rpr_context.create_grid_from_3d_array(np.ascontiguousarray(albedo_data))
-    color = data['color']
-    albedo_lookup = np.array([0.0, 0.0, 0.0, *color],
-                             dtype=np.float32).reshape(-1, 3)
-    rpr_volume.set_grid('albedo', albedo_grid)
-    rpr_volume.set_lookup('albedo', albedo_lookup)
+    albedo_grid = create_smoke_grid(rpr_context, obj, domain, 'color')
+    if albedo_grid:
+        color = data['color']
+        albedo_lookup = np.array([0.0, 0.0, 0.0, *color],
+                                 dtype=np.float32).reshape(-1, 3)
+        rpr_volume.set_grid('albedo', albedo_grid)
+        rpr_volume.set_lookup('albedo', albedo_lookup)
 
     # set density grid
-    density_data = get_prop_array_data(domain.density_grid).reshape(x, y, z)
-    density_grid = rpr_context.create_grid_from_3d_array(np.ascontiguousarray(density_data))
-    density = data['density']
-    density_lookup = np.array([0.0, 0.0, 0.0, density, density, density],
-                              dtype=np.float32).reshape(-1, 3)
-    rpr_volume.set_grid('density', density_grid)
-    rpr_volume.set_lookup('density', density_lookup)
+    density_grid = create_smoke_grid(rpr_context, obj, domain, 'density')
+    if density_grid:
+        density = data['density']
+        density_lookup = np.array([0.0, 0.0, 0.0, density, density, density],
+                                  dtype=np.float32).reshape(-1, 3)
+        rpr_volume.set_grid('density', density_grid)
+        rpr_volume.set_lookup('density', density_lookup)
 
     emission_color = data['emission_color']
     if not is_zero(emission_color):
         # set emission grid
-        emission_data = get_prop_array_data(domain.flame_grid).reshape(x, y, z)
-        emission_grid = rpr_context.create_grid_from_3d_array(np.ascontiguousarray(emission_data))
-        emission_lookup = np.array([0.0, 0.0, 0.0, *emission_color],
-                                   dtype=np.float32).reshape(-1, 3)
-        rpr_volume.set_grid('emission', emission_grid)
-        rpr_volume.set_lookup('emission', emission_lookup)
+        emission_grid = create_smoke_grid(rpr_context, obj, domain, 'flame')
+        if emission_grid:
+            emission_lookup = np.array([0.0, 0.0, 0.0, *emission_color],
+                                       dtype=np.float32).reshape(-1, 3)
+            rpr_volume.set_grid('emission', emission_grid)
+            rpr_volume.set_lookup('emission', emission_lookup)
 
     # set volume transform
     rpr_volume.set_transform(get_transform(obj))
@@ -250,6 +473,11 @@ def sync_update(rpr_context, obj: bpy.types.Object, is_updated_geometry, is_upda
         rpr_context.remove_volumes(obj_key)
         updated = True
 
+    if is_updated_geometry:
+        # smoke simulation could be changed in the same frame, drop cached grids
+        for grid_key in tuple(k for k in rpr_context.volume_grids_cache if k[0] == obj_key):
+            del rpr_context.volume_grids_cache[grid_key]
+
     sync(rpr_context, obj)
 
     if rpr_context.has_volumes(obj_key):
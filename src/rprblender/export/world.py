@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #********************************************************************
-from dataclasses import dataclass, field
+import os
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field, astuple
 from typing import Tuple
 
 import numpy as np
@@ -28,7 +31,9 @@ from . import image
 from .image import ImagePixels
 from rprblender.engine.context import RPRContext
 from rprblender.engine.context_hybridpro import RPRContext as RPRContextHybridPro
+from rprblender import utils
 from rprblender.utils import helper_lib
+from rprblender.utils.user_settings import get_user_settings
 
 from rprblender.utils import logging
 log = logging.Log(tag='export.world')
@@ -37,6 +42,77 @@ log = logging.Log(tag='export.world')
 WARNING_IMAGE_NOT_DEFINED_COLOR = (1.0, 0.0, 1.0)
 STUDIO_LIGHT_DEFAULT_COLOR = (0.051, 0.051, 0.051)  # Blender's default background color in viewport
 
+SUN_SKY_CACHE_MEMORY_SIZE = 512 * 1024 ** 2
+
+
+class SunSkyImageCache:
+    """
+    Cache of generated Sun & Sky images keyed by sky parameters.
+    Recently used images are kept in memory, images are stored on disk if enabled in user settings.
+    """
+
+    def __init__(self, cache_dir, memory_size):
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+
+        self.images = OrderedDict()
+        self.images_size = 0
+
+    def _file_path(self, key):
+        return self.cache_dir / f"{hashlib.md5(repr(key).encode()).hexdigest()}.npy"
+
+    def _add_to_memory(self, key, image):
+        self.images[key] = image
+        self.images_size += image.nbytes
+
+        while self.images_size > self.memory_size and len(self.images) > 1:
+            _, removed_image = self.images.popitem(last=False)
+            self.images_size -= removed_image.nbytes
+
+    def get(self, key):
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+
+        if not get_user_settings().use_sun_sky_disk_cache:
+            return None
+
+        file_path = self._file_path(key)
+        if not file_path.is_file():
+            return None
+
+        try:
+            image = np.load(file_path, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            log.warn("Unable to load cached sky image", file_path, e)
+            return None
+
+        self._add_to_memory(key, image)
+        return image
+
+    def set(self, key, image):
+        self._add_to_memory(key, image)
+
+        if not get_user_settings().use_sun_sky_disk_cache:
+            return
+
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+
+            # writing to temporary file first, file is replaced only when fully written
+            file_path = self._file_path(key)
+            tmp_path = file_path.with_suffix(f".{utils.PID}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, image, allow_pickle=False)
+            os.replace(tmp_path, file_path)
+
+        except OSError as e:
+            log.warn("Unable to save cached sky image", key, e)
+
+
+sun_sky_cache = SunSkyImageCache(utils.sun_sky_cache_dir(), SUN_SKY_CACHE_MEMORY_SIZE)
+
 
 def set_light_image(rpr_context, rpr_light, image_name):
     image_obj = bpy.data.images[image_name]
@@ -184,6 +260,8 @@ class WorldData:
         filter_color: tuple
         ground_color: tuple
 
+        interpolation_step: float
+
         def __init__(self, sun_sky):
             self.resolution = int(sun_sky.resolution)
 
@@ -199,6 +277,33 @@ class WorldData:
             self.filter_color = tuple(sun_sky.filter_color)
             self.ground_color = tuple(sun_sky.ground_color)
 
+            self.interpolation_step = sun_sky.interpolation_step
+
+        def get_sky_image(self, altitude):
+            """
+            Return sky image for altitude from cache or generate it.
+            Sky image doesn't depend on sun azimuth, it is applied by environment light rotation
+            """
+            key = (self.resolution, altitude, self.turbidity, self.sun_glow, self.sun_disc,
+                   self.horizon_height, self.horizon_blur, self.saturation,
+                   self.filter_color, self.ground_color)
+            im = sun_sky_cache.get(key)
+            if im is not None:
+                return im
+
+            helper_lib.set_sun_horizontal_coordinate(self.azimuth, altitude)
+            helper_lib.set_sky_params(
+                self.turbidity, self.sun_glow, self.sun_disc,
+                self.horizon_height, self.horizon_blur, self.saturation,
+                self.filter_color, self.ground_color
+            )
+
+            im = helper_lib.generate_sky_image(self.resolution, self.resolution)
+            if im is not None:
+                sun_sky_cache.set(key, im)
+
+            return im
+
         def export(self, rpr_context, rotation):
             remove_environment_overrides(rpr_context)
 
@@ -207,17 +312,34 @@ class WorldData:
                 rpr_light = rpr_context.create_environment_light()
                 rpr_context.scene.add_environment_light(rpr_light)
 
-            helper_lib.set_sun_horizontal_coordinate(self.azimuth, self.altitude)
-            helper_lib.set_sky_params(
-                self.turbidity, self.sun_glow, self.sun_disc,
-                self.horizon_height, self.horizon_blur, self.saturation,
-                self.filter_color, self.ground_color
-            )
+            # RPR image is reused while sky settings except azimuth are unchanged
+            params = astuple(self)
+            image_key = ('SUN_SKY', params[0], *params[2:])
+            rpr_image = rpr_context.images.get(image_key)
+            if not rpr_image:
+                for key in tuple(k for k in rpr_context.images if isinstance(k, tuple) and k[0] == 'SUN_SKY'):
+                    del rpr_context.images[key]
+
+                if self.interpolation_step > 0.0:
+                    # blend images of nearest altitudes on interpolation step grid
+                    step = self.interpolation_step
+                    altitude0 = math.floor(self.altitude / step) * step
+                    t = (self.altitude - altitude0) / step
+                    im = self.get_sky_image(altitude0)
+                    if not math.isclose(t, 0.0, abs_tol=1e-4) and im is not None:
+                        im1 = self.get_sky_image(altitude0 + step)
+                        if im1 is not None:
+                            im = im * (1.0 - t) + im1 * t
+                else:
+                    im = self.get_sky_image(self.altitude)
 
-            im = helper_lib.generate_sky_image(self.resolution, self.resolution)
-            rpr_image = rpr_context.create_image_data(None, im)
-            if isinstance(rpr_context, RPRContextHybridPro):  # Requires colorspace to be set explicitly
-                image.set_image_gamma(rpr_image, None, DEFAULT_COLORSPACE, rpr_context)
+                if im is None:
+                    log.warn("Unable to generate Sun & Sky image")
+                    return
+
+                rpr_image = rpr_context.create_image_data(image_key, np.ascontiguousarray(im, dtype=np.float32))
+                if isinstance(rpr_context, RPRContextHybridPro):  # Requires colorspace to be set explicitly
+                    image.set_image_gamma(rpr_image, None, DEFAULT_COLORSPACE, rpr_context)
 
             rpr_light.set_image(rpr_image)
             set_light_rotation(rpr_light, (rotation[0], rotation[1], rotation[2] + self.azimuth))
@@ -13,6 +13,7 @@
 # limitations under the License.
 #********************************************************************
 import os
+import time
 
 import bpy
 import io
@@ -29,13 +30,18 @@ log = Log(tag="material_library")
 # The material library instance, referenced by the material browser properties and material import operator.
 rpr_material_library = None
 
+# Parsed material xml files cache: xml_path -> (file mtime, closure node, nodes by name, texture paths)
+parsed_materials = {}
 
-def import_xml_material(material: bpy.types.Material, name: str, xml_path: str, copy_textures: bool):
+
+def import_xml_material(material: bpy.types.Material, name: str, xml_path: str, copy_textures: bool,
+                        image_loader: MaterialImageLoader = None):
     """ Create RPR material at current material slot using xml.
     Nodes tree is cleaned if present, new created otherwise.
     New output node added if no output found.
     Change Blender material name to material library name.
     Copy textures locally if requested."""
+    time_begin = time.perf_counter()
 
     def clean_material_tree():
         """ Remove every node from material tree except for output """
@@ -71,11 +77,12 @@ def import_xml_material(material: bpy.types.Material, name: str, xml_path: str,
     clean_material_tree()
     output = create_output_node()
 
-    root_folder = rpr_material_library.path
-    material_folder = os.path.dirname(xml_path)
+    if not image_loader:
+        root_folder = rpr_material_library.path
+        material_folder = os.path.dirname(xml_path)
 
-    # create images loader
-    image_loader = MaterialImageLoader(root_folder, material_folder, copy_textures)
+        # create images loader
+        image_loader = MaterialImageLoader(root_folder, material_folder, copy_textures)
 
     # create material by xml
     closure = compile_material_from_xml(xml_path, material.node_tree, image_loader)
@@ -85,6 +92,38 @@ def import_xml_material(material: bpy.types.Material, name: str, xml_path: str,
         log("Linking closure {} to active output {}".format(closure, output))
         material.node_tree.links.new(closure.outputs[0], output.inputs[0])
 
+    log(f"Material '{name}' imported in {time.perf_counter() - time_begin:.3f} sec")
+    return material
+
+
+def import_xml_materials(materials_info, copy_textures: bool) -> list:
+    """ Bulk import of library materials, materials_info is iterable of (material, name, xml_path).
+    Xml files are parsed and textures of all materials are copied in parallel before nodes creation.
+    Return list of imported materials """
+    time_begin = time.perf_counter()
+    materials_info = tuple(materials_info)
+
+    image_loaders = []
+    for _, _, xml_path in materials_info:
+        material_folder = os.path.dirname(xml_path)
+        image_loader = MaterialImageLoader(rpr_material_library.path, material_folder, copy_textures)
+        parsed = parse_material_xml(xml_path)
+        if parsed:
+            image_loader.prefetch_images(parsed[2])
+        image_loaders.append(image_loader)
+
+    time_prepared = time.perf_counter()
+
+    materials = [import_xml_material(material, name, xml_path, copy_textures, image_loader)
+                 for (material, name, xml_path), image_loader in zip(materials_info, image_loaders)]
+
+    time_end = time.perf_counter()
+    log.info(f"Imported {len(materials)} materials in {time_end - time_begin:.3f} sec "
+        f"(parsing and textures {time_prepared - time_begin:.3f} sec, "
+        f"{len(materials) / max(time_end - time_begin, 1e-6):.1f} materials/sec)")
+
+    return materials
+
 
 def iter_materials(root):
     for material in root.iter(tag='material'):
@@ -92,11 +131,18 @@ def iter_materials(root):
         yield material_name, {node.get('name'): node for node in material.iter(tag='node')}
 
 
-def compile_material_from_xml(xml_path: str, node_tree, image_loader):
+def parse_material_xml(xml_path: str):
+    """ Return (closure node, nodes by name, texture paths) of first material in xml file.
+    Parsed data is cached by xml file modification time """
     if not xml_path or not os.path.isfile(xml_path):
         log.error("Unable to find material xml file '{}'".format(xml_path))
         return None
 
+    mtime = os.path.getmtime(xml_path)
+    cached = parsed_materials.get(xml_path)
+    if cached and cached[0] == mtime:
+        return cached[1:]
+
     # load material xml
     with open(xml_path) as data_file:
         if not data_file:
@@ -123,6 +169,24 @@ def compile_material_from_xml(xml_path: str, node_tree, image_loader):
     else:
         # MaterialLibrary 2.0 uses attribute "closure_node" to define at root node
         root_node = nodes.get(closure_name)
+
+    # collect textures to load them before nodes creation
+    texture_paths = tuple(param.get('value')
+                          for node in nodes.values() if node.get('type') == 'INPUT_TEXTURE'
+                          for param in node.iter(tag='param') if param.get('name') == 'path')
+
+    parsed_materials[xml_path] = (mtime, root_node, nodes, texture_paths)
+    return root_node, nodes, texture_paths
+
+
+def compile_material_from_xml(xml_path: str, node_tree, image_loader):
+    parsed = parse_material_xml(xml_path)
+    if not parsed:
+        return None
+
+    root_node, nodes, texture_paths = parsed
+    image_loader.prefetch_images(texture_paths)
+
     return RPRXMLMaterialCompiler(nodes, node_tree, image_loader).compile(root_node)
 
 
@@ -137,3 +201,4 @@ def unregister():
     global rpr_material_library
     rpr_material_library.clean_up()
     rpr_material_library = None
+    parsed_materials.clear()
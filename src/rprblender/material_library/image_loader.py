@@ -15,6 +15,7 @@
 import os
 import platform
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 import bpy
 
@@ -22,6 +23,9 @@ from rprblender.utils.logging import Log
 log = Log(tag="material_library")
 
 
+COPY_IMAGES_MAX_WORKERS = 8
+
+
 class MaterialImageLoader:
     """ Load images for material, copy it to scene file location if requested """
     def __init__(self, root_folder: str, material_folder: str, copy_locally=False):
@@ -30,9 +34,11 @@ class MaterialImageLoader:
         self.material_folder = material_folder
         self.copy_locally = copy_locally
 
-    def load_image(self, file_name: str) -> bpy.types.Image:
-        """ Load image from library by relative path or copy to scene location and load """
-        is_copy_allowed = self.copy_locally and bpy.path.abspath('//')  # copy enabled and scene is saved?
+        # source image path -> path of copied image, filled by prefetch_images()
+        self.copied_images = {}
+
+    def get_image_paths(self, file_name: str) -> (str, str):
+        """ Return full library path of image and path relative to scene location to copy image to """
         is_path_relative = '\\' in file_name or '/' in file_name  # is texture in common folder?
 
         if is_path_relative:
@@ -45,14 +51,6 @@ class MaterialImageLoader:
             file_path = file_path.replace('/', '\\')
             separator = '\\'
 
-        if not is_copy_allowed:
-            if is_path_relative:
-                path_full = self.root_folder + file_path
-            else:
-                path_full = self.material_folder + separator + file_path
-            return bpy.data.images.load(path_full)
-
-        # try to copy texture to scene location
         if is_path_relative:
             path_full = self.root_folder + file_path
             path_relative = file_path
@@ -60,23 +58,66 @@ class MaterialImageLoader:
             path_full = self.material_folder + separator + file_path
             path_relative = os.path.basename(self.material_folder) + separator + file_path
 
-        path_relative = 'rprmaterials' + separator + path_relative
+        return path_full, 'rprmaterials' + separator + path_relative
+
+    def is_copy_allowed(self):
+        return self.copy_locally and bpy.path.abspath('//')  # copy enabled and scene is saved?
+
+    def prefetch_images(self, file_names):
+        """ Copy images to scene location in parallel, so load_image() only loads already copied files """
+        if not self.is_copy_allowed():
+            return
+
+        # bpy.path functions aren't thread safe, resolve paths before running threads
+        scene_folder = bpy.path.native_pathsep(bpy.path.abspath('//'))
+        copy_list = {}
+        for file_name in file_names:
+            path_full, path_relative = self.get_image_paths(file_name)
+            src = bpy.path.native_pathsep(path_full)
+            if src not in self.copied_images:
+                copy_list[src] = (src, path_relative, scene_folder)
+
+        if not copy_list:
+            return
+
+        def copy(paths):
+            try:
+                return paths[0], self.copy_image(*paths)
+            except PermissionError:  # access denied, load_image() will use library image
+                return paths[0], None
+
+        with ThreadPoolExecutor(max_workers=COPY_IMAGES_MAX_WORKERS) as executor:
+            for src, copied_path in executor.map(copy, copy_list.values()):
+                if copied_path:
+                    self.copied_images[src] = copied_path
+
+    def load_image(self, file_name: str) -> bpy.types.Image:
+        """ Load image from library by relative path or copy to scene location and load """
+        path_full, path_relative = self.get_image_paths(file_name)
+
+        if not self.is_copy_allowed():
+            return bpy.data.images.load(path_full, check_existing=True)
+
+        # try to copy texture to scene location
+        copied_image_path = self.copied_images.get(bpy.path.native_pathsep(path_full))
+        if copied_image_path:
+            return bpy.data.images.load(copied_image_path, check_existing=True)
 
         try:
-            copied_image_path = self.copy_image(path_full, path_relative)
-            return bpy.data.images.load(copied_image_path)
+            copied_image_path = self.copy_image(bpy.path.native_pathsep(path_full), path_relative,
+                                                bpy.path.native_pathsep(bpy.path.abspath('//')))
+            return bpy.data.images.load(copied_image_path, check_existing=True)
         except PermissionError:  # access denied, most likely user hasn't saved new scene yet
             # TODO: inform user she should save scene .blend file first
-            return bpy.data.images.load(path_full)
+            return bpy.data.images.load(path_full, check_existing=True)
 
     @staticmethod
-    def copy_image(src: str, dst: str) -> str:
+    def copy_image(src: str, dst: str, scene_folder: str) -> str:
+        """ Copy image src to dst relative to scene_folder, doesn't use bpy so it's safe to call from threads """
         log.info('copy image:', src, dst)
-        dst_full_path = os.path.join(bpy.path.native_pathsep(bpy.path.abspath('//')), dst)
+        dst_full_path = os.path.join(scene_folder, dst)
         dst_folder = os.path.dirname(dst_full_path)
-        if not os.path.isdir(dst_folder):
-            os.makedirs(dst_folder)
+        os.makedirs(dst_folder, exist_ok=True)
         if not os.path.exists(dst_full_path):
-            source_path = bpy.path.native_pathsep(src)
-            shutil.copyfile(source_path, dst_full_path)
+            shutil.copyfile(src, dst_full_path)
         return '//' + dst.replace(os.path.sep, '/')
@@ -15,14 +15,28 @@
 from bpy.utils import previews  # for some reason Blender doesn't allow access via bpy.utils.previews
 import json
 import os
+import time
+from collections import deque
 from pathlib import Path
 
+import bpy
+
 from .path import get_library_path
 
 from rprblender.utils.logging import Log
 log = Log(tag="material_library")
 
 
+SEARCH_NGRAM_SIZES = (2, 3)     # n-gram sizes of search index, shorter search strings aren't allowed
+PLACEHOLDER_ICON = 'MATERIAL'   # icon shown till material preview is loaded
+PREVIEWS_BATCH_TIME = 0.02      # max time in seconds spent in main thread to create previews in one batch
+PREVIEWS_INTERVAL = 0.1         # time in seconds between previews batches
+
+
+def get_ngrams(text: str, size: int):
+    return set(text[i:i + size] for i in range(len(text) - size + 1))
+
+
 class MaterialEntry:
     """ Material entry info """
     def __init__(self, name: str, file_name: str, category: str):
@@ -44,14 +58,28 @@ class RPRMaterialLibrary:
         self.previews = previews.new()
         self.material_preview_cache = {}
 
+        # search index: n-gram -> set of material names which contain it in lower case
+        self.search_index = {}
+        self.material_order = {}
+
         # info for currently selected category
         self.active_category = ""  # current
         self.active_materials = {}
+        self.active_preview_keys = {}  # preview file path -> active_materials key
+
+        # previews loading: previews are created by timer in time limited batches
+        self.requested_previews = deque()
+        self.previews_timer = self._create_requested_previews
 
         self.is_valid = self.load_manifest()
 
     # Perform clean up operations before exiting.
     def clean_up(self):
+        # Stop previews loading
+        self.requested_previews.clear()
+        if bpy.app.timers.is_registered(self.previews_timer):
+            bpy.app.timers.unregister(self.previews_timer)
+
         # Remove previews.
         previews.remove(self.previews)
         self.material_preview_cache.clear()
@@ -89,18 +117,71 @@ class RPRMaterialLibrary:
             if entry_materials:
                 self.categories[category['name']] = entry_materials
 
+        self.build_search_index()
+
         return True
 
+    def build_search_index(self):
+        """ Index lower case material names by n-grams for fast substring search """
+        self.search_index = {}
+        self.material_order = {}
+
+        for i, name in enumerate(self.materials.keys()):
+            self.material_order[name] = i
+            name_lower = name.lower()
+            for size in SEARCH_NGRAM_SIZES:
+                for ngram in get_ngrams(name_lower, size):
+                    self.search_index.setdefault(ngram, set()).add(name)
+
+        log(f"Search index: {len(self.materials)} materials, {len(self.search_index)} n-grams")
+
+    def find_materials(self, search_string: str) -> tuple:
+        """ Return materials which names contain search_string, in library order """
+        search_lower = search_string.lower()
+        size = max(s for s in SEARCH_NGRAM_SIZES if s <= len(search_lower))
+
+        # materials must contain every n-gram of search string, substring check filters the rest
+        candidates = None
+        for ngram in sorted(get_ngrams(search_lower, size),
+                            key=lambda ngram: len(self.search_index.get(ngram, ()))):
+            names = self.search_index.get(ngram)
+            if not names:
+                return ()
+
+            candidates = set(names) if candidates is None else candidates & names
+            if not candidates:
+                return ()
+
+        names = sorted((name for name in candidates if search_lower in name.lower()),
+                       key=self.material_order.get)
+        return tuple(self.materials[name] for name in names)
+
     def get_categories_items(self) -> tuple:
         """ Enumerate library categories for UI using category name as ID, name and description """
         return tuple((name, name, name, i) for i, name in enumerate(self.categories.keys()))
 
     def prepare_active_materials_enum_entries(self, source):
-        """ Enumerate source for materials, store ready EnumProperty tuples"""
+        """
+        Enumerate source for materials, store ready EnumProperty tuples.
+        Not loaded previews are replaced by placeholder and requested to load by timer.
+        """
         self.active_materials = {}
+        self.active_preview_keys = {}
+        requested_previews = []
+
         for i, entry in enumerate(source):
-            preview = self.get_material_preview(entry)
-            self.active_materials[str(i)] = (entry.name, preview.icon_id, i)
+            key = str(i)
+            file_path = self.get_material_preview_path(entry)
+            preview = self.material_preview_cache.get(file_path)
+            if preview:
+                self.active_materials[key] = (entry.name, preview.icon_id, i)
+                continue
+
+            self.active_materials[key] = (entry.name, PLACEHOLDER_ICON, i)
+            self.active_preview_keys[file_path] = key
+            requested_previews.append(file_path)
+
+        self.request_previews(requested_previews)
 
     def set_active_category(self, category_name: str):
         """ If selected category was changed - prepare browsing data for new category """
@@ -123,7 +204,7 @@ class RPRMaterialLibrary:
             return
 
         # collect new active materials search group
-        filtered_materials = tuple(mat for mat in self.materials.values() if search_string.lower() in mat.name.lower())
+        filtered_materials = self.find_materials(search_string)
 
         # to prevent UI from spamming warning for empty search result don't do anything
         if not filtered_materials:
@@ -151,17 +232,23 @@ class RPRMaterialLibrary:
         info = self.materials[material_name]
         return str(Path(self.path).joinpath(info.file_name, info.file_name + ".xml")), material_name
 
+    def get_material_preview_path(self, material: MaterialEntry) -> str:
+        """ Return material preview image file path """
+        file_name = material.file_name
+        return self.path + "/" + file_name + "/" + file_name + ".jpg"
+
     def get_material_preview(self, material: MaterialEntry):
         """ Load preview image for material, return preview object """
-        # Find the icon file name.
-        file_name = material.file_name
-        file_path = self.path + "/" + file_name + "/" + file_name + ".jpg"
+        file_path = self.get_material_preview_path(material)
 
         # Return a cached preview if possible.
         if file_path in self.material_preview_cache:
             return self.material_preview_cache[file_path]
 
-        # Load a new preview.
+        return self._create_preview(file_path)
+
+    def _create_preview(self, file_path: str):
+        """ Create preview from image file, must be called from main thread """
         preview = self.previews.load(file_path, file_path, "IMAGE", False)
 
         # Inspect the preview size. Without this, the
@@ -173,3 +260,39 @@ class RPRMaterialLibrary:
 
         return preview
 
+    def request_previews(self, file_paths: list):
+        """ Replace requested previews queue, start previews timer if needed """
+        self.requested_previews = deque(file_paths)
+        if not self.requested_previews:
+            return
+
+        if not bpy.app.timers.is_registered(self.previews_timer):
+            bpy.app.timers.register(self.previews_timer, first_interval=PREVIEWS_INTERVAL)
+
+    def _create_requested_previews(self):
+        """
+        Timer function: creates requested previews, returns next call interval.
+        Previews are loaded by Blender from main thread only, so time spent in one call is limited
+        """
+        time_begin = time.perf_counter()
+        is_updated = False
+
+        while self.requested_previews and time.perf_counter() - time_begin < PREVIEWS_BATCH_TIME:
+            file_path = self.requested_previews.popleft()
+            preview = self.material_preview_cache.get(file_path)
+            if not preview:
+                preview = self._create_preview(file_path)
+
+            key = self.active_preview_keys.pop(file_path, None)
+            if key is not None:
+                name, _, i = self.active_materials[key]
+                self.active_materials[key] = (name, preview.icon_id, i)
+                is_updated = True
+
+        if is_updated:
+            for window in bpy.context.window_manager.windows:
+                for area in window.screen.areas:
+                    if area.type == 'PROPERTIES':
+                        area.tag_redraw()
+
+        return PREVIEWS_INTERVAL if self.requested_previews else None
@@ -33,6 +33,7 @@ from . import (
     material_library,
     export_scene,
     export_training_data,
+    render_cameras,
     light,
 )
 
@@ -40,6 +41,8 @@ register_operators, unregister_operators = bpy.utils.register_classes_factory([
     render.RPR_RENDER_OP_open_web_page,
     render.RPR_RENDER_OP_add_denoiser_node,
     render.RPR_RENDER_OP_clear_cache,
+    render.RPR_RENDER_OP_clear_preview_cache,
+    render.RPR_RENDER_OP_update_material_previews,
 
     world.RPR_WORLD_OP_create_fog_object,
 
@@ -54,6 +57,8 @@ register_operators, unregister_operators = bpy.utils.register_classes_factory([
 
     export_training_data.RPR_EXPORT_OP_export_training_data,
 
+    render_cameras.RPR_RENDER_OP_render_all_cameras,
+
     light.RPR_LIGHT_OP_open_IES_file,
 ])
 
@@ -63,6 +68,11 @@ def add_rpr_export_menu_item(self, context):
                          text="Radeon ProRender (.rpr)")
 
 
+def add_rpr_render_menu_item(self, context):
+    if context.engine == 'RPR':
+        self.layout.operator(render_cameras.RPR_RENDER_OP_render_all_cameras.bl_idname)
+
+
 def register():
     # property needed for baked nodes operator
     bpy.types.ShaderNode.rpr_baked_node_name = bpy.props.StringProperty(
@@ -72,11 +82,13 @@ def register():
         )
     register_operators()
     bpy.types.TOPBAR_MT_file_export.append(add_rpr_export_menu_item)
+    bpy.types.TOPBAR_MT_render.append(add_rpr_render_menu_item)
 
 
 
 
 def unregister():
+    bpy.types.TOPBAR_MT_render.remove(add_rpr_render_menu_item)
     bpy.types.TOPBAR_MT_file_export.remove(add_rpr_export_menu_item)
     unregister_operators()
     del bpy.types.ShaderNode.rpr_baked_node_name
@@ -17,6 +17,7 @@ Export scene in a specific RPR-compatible file format
 """
 import time
 import math
+import subprocess
 
 from bpy.props import StringProperty, BoolProperty, IntProperty, EnumProperty
 
@@ -29,7 +30,7 @@ from rprblender.utils.user_settings import get_user_settings
 
 from . import RPR_Operator
 
-from rprblender.utils import OS
+from rprblender.utils import OS, get_temp_pid_dir
 from rprblender.utils.logging import Log
 import pyrpr
 
@@ -87,11 +88,20 @@ class RPR_EXPORT_OP_export_rpr_scene(RPR_Operator, ExportHelper):
         name="End Frame"
     )
 
+    workers_count: IntProperty(
+        default=1,
+        min=1, max=64,
+        name="Parallel Workers",
+        description="Number of background Blender processes exporting animation, "
+                    "each process exports its own range of frames"
+    )
+
     def draw(self, context):
         self.layout.prop(self, 'export_animation')
         row = self.layout.row(align=True)
         row.prop(self, 'start_frame')
         row.prop(self, 'end_frame')
+        self.layout.prop(self, 'workers_count')
         self.layout.prop(self, 'export_as_single_file')
         self.layout.prop(self, 'compression')
         self.layout.prop(self, 'use_image_cache')
@@ -123,7 +133,16 @@ class RPR_EXPORT_OP_export_rpr_scene(RPR_Operator, ExportHelper):
         if self.use_image_cache:
             flags |= 1 << 6
 
-        if self.export_animation and self.start_frame <= self.end_frame:
+        if self.export_animation and self.workers_count > 1 and self.start_frame < self.end_frame:
+            log.info(f"Starting scene '{scene.name}' frames {self.start_frame}:{self.end_frame} RPR export "
+                     f"by {self.workers_count} workers")
+            time_started = time.time()
+
+            failed_ranges = self.export_animation_parallel()
+            if failed_ranges:
+                self.report({'ERROR'}, f"RPR export failed for frames {', '.join(failed_ranges)}")
+
+        elif self.export_animation and self.start_frame <= self.end_frame:
             orig_frame = scene.frame_current
             begin, end = self.filepath.rsplit('.', 1)
 
@@ -151,6 +170,55 @@ class RPR_EXPORT_OP_export_rpr_scene(RPR_Operator, ExportHelper):
 
         return {'FINISHED'}
 
+    def export_animation_parallel(self):
+        """
+        Exports animation frames by background Blender processes, every process exports its own range of frames.
+        Returns list of frames ranges failed to export
+        """
+        frames = range(self.start_frame, self.end_frame + 1)
+        workers_count = min(self.workers_count, len(frames))
+        frames_per_worker = math.ceil(len(frames) / workers_count)
+
+        # workers load the copy of current blend file to get the scene with unsaved changes
+        blend_filepath = str(get_temp_pid_dir() / "rpr_export_scene.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_filepath, copy=True)
+
+        workers = []
+        failed_ranges = []
+        try:
+            for i in range(0, len(frames), frames_per_worker):
+                worker_frames = frames[i:i + frames_per_worker]
+                python_expr = (
+                    "import bpy; bpy.ops.rpr.export_scene_rpr("
+                    f"filepath={self.filepath!r}, export_animation=True, "
+                    f"start_frame={worker_frames[0]}, end_frame={worker_frames[-1]}, "
+                    f"export_as_single_file={self.export_as_single_file}, compression={self.compression!r}, "
+                    f"use_image_cache={self.use_image_cache})"
+                )
+                process = subprocess.Popen([bpy.app.binary_path, '-b', blend_filepath, '--python-exit-code', '1',
+                                            '--python-expr', python_expr])
+                workers.append((f"{worker_frames[0]}:{worker_frames[-1]}", process))
+                log(f"Started export worker for frames {workers[-1][0]}, pid {process.pid}")
+
+            for frames_range, process in workers:
+                if process.wait() != 0:
+                    log.error(f"Export worker failed for frames {frames_range}, exit code {process.returncode}")
+                    failed_ranges.append(frames_range)
+                else:
+                    log.info(f"Finished frames {frames_range} export")
+
+        finally:
+            # stopping workers left after error, they hold temporary blend file open
+            for frames_range, process in workers:
+                if process.poll() is None:
+                    log.warn(f"Stopping export worker for frames {frames_range}")
+                    process.kill()
+                    process.wait()
+
+            os.remove(blend_filepath)
+
+        return failed_ranges
+
     def export_scene_to_file(self, context, scene, filepath, filepath_json, flags):
         if scene.rpr.final_render_mode == 'FULL':  # Export Legacy mode using RPR1
             exporter = ExportEngine()
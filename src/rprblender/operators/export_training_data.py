@@ -22,6 +22,7 @@ from bpy.props import BoolProperty, IntProperty, StringProperty
 import pyrpr
 from rprblender.export import object, camera
 from rprblender.engine.export_engine import ExportEngine, ExportEngine2
+from rprblender.utils.aov_writer import AOVWriter, WRITER_EXTENSIONS
 
 from . import RPR_Operator
 
@@ -52,7 +53,19 @@ class RPR_EXPORT_OP_export_training_data(RPR_Operator):
     extension: StringProperty(
         default='exr',
         name="Extension",
-        description="Filename extension for output file: png, bin, jpg, exr, tif, etc"
+        description="Filename extension for output file: png, bin, npy, npz, jpg, exr, tif, etc. "
+                    "bin, npy, npz and exr files are saved in background while rendering continues"
+    )
+    use_half_float: BoolProperty(
+        default=False,
+        name="Half Float",
+        description="Save bin, npy, npz and exr files with 16-bit float data"
+    )
+    writer_threads: IntProperty(
+        default=4,
+        name="Writer Threads",
+        description="Number of threads saving files in background",
+        min=1
     )
     width: IntProperty(
         default=800,
@@ -83,6 +96,12 @@ class RPR_EXPORT_OP_export_training_data(RPR_Operator):
         description="Last render frame",
         min=0
     )
+    use_shared_subdivision_camera: BoolProperty(
+        default=False,
+        name="Shared Subdivision Camera",
+        description="Calculate adaptive subdivision once from scene camera for all cameras, "
+                    "else adaptive subdivision is calculated for every camera"
+    )
     samples: StringProperty(
         default="1, 2, 4, 8, 4096",
         name="Samples",
@@ -131,17 +150,39 @@ class RPR_EXPORT_OP_export_training_data(RPR_Operator):
 
         log(f"Directory path: {self.output_path}")
 
+        if context.scene.rpr.final_render_mode == 'FULL':  # Export Legacy mode using RPR1
+            exporter = ExportEngine()
+        else:  # Other quality modes export using RPR2
+            exporter = ExportEngine2()
+
+        writer = AOVWriter(self.writer_threads) if self.extension in WRITER_EXTENSIONS else None
+        try:
+            self.export_frames(context, exporter, writer, frame_start, frame_end, cameras, AOVS, output_path)
+
+        finally:
+            if writer:
+                writer.stop()
+
+        if writer and writer.errors:
+            self.report({'ERROR'}, f"Unable to save {len(writer.errors)} files, please see log for more details")
+
+        log.info(f"Finish render for all cameras")
+
+        return {'FINISHED'}
+
+    def export_frames(self, context, exporter, writer, frame_start, frame_end, cameras, aovs, output_path):
+        """ Renders frames from every camera and saves AOVs of every samples count """
         for frame in range(frame_start, frame_end + 1):
             context.scene.frame_set(frame, subframe=0.0)
             depsgraph = context.evaluated_depsgraph_get()
             scene = depsgraph.scene
 
-            if scene.rpr.final_render_mode == 'FULL':  # Export Legacy mode using RPR1
-                exporter = ExportEngine()
-            else:  # Other quality modes export using RPR2
-                exporter = ExportEngine2()
+            # RPR context is created for the first frame, next frames are exported to it
+            if frame == frame_start:
+                exporter.sync(context)
+            else:
+                exporter.sync_frame(context)
 
-            exporter.sync(context)
             rpr_context = exporter.rpr_context
 
             if self.use_scene_resolution:
@@ -154,38 +195,28 @@ class RPR_EXPORT_OP_export_training_data(RPR_Operator):
                 rpr_context.height = self.height
 
             # clear exported and enable predefined AOVs
-            rpr_context.disable_aovs()
-            for aov in AOVS:
-                rpr_context.enable_aov(aov_type=aov[0])
+            if frame == frame_start:
+                rpr_context.disable_aovs()
+                for aov in aovs:
+                    rpr_context.enable_aov(aov_type=aov[0])
 
             if rpr_context.do_motion_blur and scene.rpr.final_render_mode == 'FULL2':
                 flag = not bool(scene.rpr.motion_blur_in_velocity_aov)
                 rpr_context.set_parameter(pyrpr.CONTEXT_BEAUTY_MOTION_BLUR, flag)
 
-            for cam in cameras:
-                # EXPORT CAMERA
-                camera_key = object.key(cam)  # current camera key
-                rpr_camera = rpr_context.create_camera(camera_key)
-                rpr_context.scene.set_camera(rpr_camera)
-                camera_obj = depsgraph.objects.get(camera_key, None)
-                camera_data = camera.CameraData.init_from_camera(camera_obj.data, camera_obj.matrix_world,
-                                                                 rpr_context.width / rpr_context.height)
-                camera_data.export(rpr_camera)
+            samples = sorted(tuple(int(s) for s in self.samples.split(',')))
 
+            def render_view(view_index, rpr_camera):
+                cam = cameras[view_index]
                 if rpr_context.do_motion_blur:
                     rpr_camera.set_exposure(scene.camera.data.rpr.motion_blur_exposure)
-                    object.export_motion_blur(rpr_context, camera_key,
-                                              object.get_transform(camera_obj))
-
-                # adaptive subdivision will be limited to the current scene render size
-                rpr_context.sync_auto_adapt_subdivision()
+                    camera_obj = depsgraph.objects.get(object.key(cam), cam)
+                    object.export_motion_blur(rpr_context, object.key(cam), object.get_transform(camera_obj))
 
                 # render part
                 log.info(f"Start render, camera: {cam.name}, "
                          f"resolution: [{rpr_context.width}, {rpr_context.height}], frame: {frame}")
 
-                samples = sorted(tuple(int(s) for s in self.samples.split(',')))
-
                 for i, sample in enumerate(samples):
                     update_samples = (sample - samples[i - 1]) if i > 0 else sample
                     rpr_context.set_parameter(pyrpr.CONTEXT_ITERATIONS, update_samples)
@@ -193,25 +224,22 @@ class RPR_EXPORT_OP_export_training_data(RPR_Operator):
                     rpr_context.resolve()
                     log(f"Render sample {sample}, frame {frame}")
 
-                    for aov in AOVS:
+                    for aov in aovs:
                         aov_type, aov_name, aov_channels = aov
                         filepath = str(output_path /
                                        f"{cam.name}.{aov_name}.{sample:04d}.{frame:04d}.{self.extension}")
                         fb = rpr_context.get_frame_buffer(aov_type)
 
-                        if self.extension == 'bin':
-                            data = fb.get_data()
-                            data = data[:, :, :aov_channels]
-                            data.tofile(filepath)
+                        if writer:
+                            # frame buffer data is copied, file is saved in background
+                            writer.write(fb, filepath, self.extension, aov_channels, self.use_half_float)
                         else:
                             fb.save_to_file(file_path=filepath)
+                            log.info(f"File saved at {sample} samples, {filepath}")
 
-                        log.info(f"File saved at {sample} samples, {filepath}")
+                log(f"Finish render, camera: {cam.name}")
 
-                    # clearing scene after finishing render
-                    log(f"Finish render, camera: {cam.name}")
-            rpr_context.clear_scene()
-
-        log.info(f"Finish render for all cameras")
-
-        return {'FINISHED'}
+            # adaptive subdivision will be limited to the current scene render size
+            views = camera.get_views(depsgraph, cameras, rpr_context.width / rpr_context.height,
+                                     scene.camera if self.use_shared_subdivision_camera else None)
+            rpr_context.render_views(views, render_view)
@@ -62,6 +62,36 @@ class RPR_RENDER_OP_clear_cache(RPR_Operator):
         return {'FINISHED'}
 
 
+class RPR_RENDER_OP_clear_preview_cache(RPR_Operator):
+    '''
+    Clear rendered material previews cache
+    '''
+
+    bl_idname = "rpr.op_clear_preview_cache"
+    bl_label = "Clear Preview Cache"
+    bl_description = "Clear rendered material previews cache"
+
+    def execute(self, context):
+        from rprblender.engine.preview_engine import preview_cache
+        preview_cache.clear()
+        return {'FINISHED'}
+
+
+class RPR_RENDER_OP_update_material_previews(RPR_Operator):
+    '''
+    Request previews of all materials in batches
+    '''
+
+    bl_idname = "rpr.op_update_material_previews"
+    bl_label = "Update Material Previews"
+    bl_description = "Render previews of all materials in background"
+
+    def execute(self, context):
+        from rprblender.engine.preview_engine import update_material_previews
+        update_material_previews(bpy.data.materials)
+        return {'FINISHED'}
+
+
 class RPR_RENDER_OP_add_denoiser_node(RPR_Operator):
     '''
     Operator to add blender denoiser compositor node
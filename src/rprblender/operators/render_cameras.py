@@ -0,0 +1,120 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Render current frame from all scene cameras with one scene export
+"""
+import time
+from pathlib import Path
+
+from bpy.props import BoolProperty, StringProperty
+
+import pyrpr
+from rprblender.export import object, camera
+from rprblender.engine.export_engine import ExportEngine, ExportEngine2
+from rprblender.utils.aov_writer import AOVWriter, WRITER_EXTENSIONS
+
+from . import RPR_Operator
+
+from rprblender.utils.logging import Log
+log = Log(tag='operators.render_cameras')
+
+
+class RPR_RENDER_OP_render_all_cameras(RPR_Operator):
+    bl_idname = "rpr.render_all_cameras"
+    bl_label = "Render All Cameras"
+    bl_description = "Render current frame from every scene camera and save images to output directory. " \
+                     "Scene is exported once for all cameras. Filename example: {camera}.{frame}.{extension}"
+
+    output_path: StringProperty(
+        default='',
+        name="Output Path",
+        subtype='DIR_PATH',
+        description="Directory for output files"
+    )
+    extension: StringProperty(
+        default='png',
+        name="Extension",
+        description="Filename extension for output file: png, jpg, exr, bin, npy, npz, etc"
+    )
+    use_shared_subdivision_camera: BoolProperty(
+        default=False,
+        name="Shared Subdivision Camera",
+        description="Calculate adaptive subdivision once from scene camera for all cameras, "
+                    "else adaptive subdivision is calculated for every camera"
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        output_path = Path(self.output_path)
+        if not output_path.is_dir():
+            self.report({'ERROR'}, f"No such directory: {self.output_path}")
+            return {'CANCELLED'}
+
+        cameras = tuple(obj for obj in context.scene.objects if obj.type == 'CAMERA')
+        if not cameras or not context.scene.camera:
+            self.report({'ERROR'}, "No camera in scene")
+            return {'CANCELLED'}
+
+        time_started = time.perf_counter()
+
+        if context.scene.rpr.final_render_mode == 'FULL':
+            exporter = ExportEngine()
+        else:
+            exporter = ExportEngine2()
+
+        exporter.sync(context)
+        log.info(f"Scene synced in {time.perf_counter() - time_started:.3f} sec")
+
+        depsgraph = context.evaluated_depsgraph_get()
+        scene = depsgraph.scene
+        rpr_context = exporter.rpr_context
+        rpr_context.set_parameter(pyrpr.CONTEXT_ITERATIONS, scene.rpr.limits.max_samples)
+
+        writer = AOVWriter() if self.extension in WRITER_EXTENSIONS else None
+
+        def render_view(view_index, rpr_camera):
+            cam = cameras[view_index]
+            if rpr_context.do_motion_blur:
+                rpr_camera.set_exposure(scene.camera.data.rpr.motion_blur_exposure)
+                camera_obj = depsgraph.objects.get(object.key(cam), cam)
+                object.export_motion_blur(rpr_context, object.key(cam), object.get_transform(camera_obj))
+
+            render_time = time.perf_counter()
+            rpr_context.render(restart=True)
+            rpr_context.resolve()
+
+            filepath = str(output_path / f"{cam.name}.{scene.frame_current:04d}.{self.extension}")
+            fb = rpr_context.get_frame_buffer(pyrpr.AOV_COLOR)
+            if writer:
+                writer.write(fb, filepath, self.extension, 3)
+            else:
+                fb.save_to_file(file_path=filepath)
+
+            log.info(f"Camera {cam.name} rendered in {time.perf_counter() - render_time:.3f} sec, {filepath}")
+
+        try:
+            views = camera.get_views(depsgraph, cameras, rpr_context.width / rpr_context.height,
+                                     scene.camera if self.use_shared_subdivision_camera else None)
+            rpr_context.render_views(views, render_view)
+
+        finally:
+            if writer:
+                writer.stop()
+
+        log.info(f"Rendered {len(cameras)} cameras in {time.perf_counter() - time_started:.3f} sec")
+
+        return {'FINISHED'}
@@ -305,6 +305,20 @@ class RPR_UserSettings(bpy.types.PropertyGroup):
         min=5, max=100, default=25,
     )
 
+    viewport_progressive_sync: BoolProperty(
+        name="Progressive Sync",
+        description="Export objects which cover the biggest part of the viewport first and start "
+                    "rendering before the whole scene is exported",
+        default=False,
+    )
+
+    viewport_progressive_sync_time: FloatProperty(
+        name="Sync Time Limit",
+        description="Time in seconds to export the most visible objects before the first render. "
+                    "The rest of objects are exported in batches during rendering",
+        min=0.0, soft_max=10.0, default=1.0,
+    )
+
     viewport_denoiser_upscale: BoolProperty(
         name="Viewport Denoising and Upscaling",
         description="Denoise rendered image with Machine Learning denoiser.\n"
@@ -313,6 +327,21 @@ class RPR_UserSettings(bpy.types.PropertyGroup):
         default=True if not utils.IS_MAC else False,  # TODO remove when macos upscaler fixed
     )
 
+    use_preview_cache: BoolProperty(
+        name="Preview Cache",
+        description="Store rendered material previews on disk and reuse them "
+                    "while material and preview settings are unchanged",
+        default=True,
+        update=on_settings_changed,
+    )
+
+    use_sun_sky_disk_cache: BoolProperty(
+        name="Sun & Sky Disk Cache",
+        description="Store generated Sun & Sky images on disk and reuse them between sessions",
+        default=False,
+        update=on_settings_changed,
+    )
+
 
 class RPR_RenderProperties(RPR_Properties):
     """ Main render properties. Available from scene.rpr """
@@ -326,11 +355,12 @@ class RPR_RenderProperties(RPR_Properties):
 
     # DEBUG OPTIONS
     def update_log_min_level(self, context):
-        logging.limit_log('default', getattr(logging, self.log_min_level))
+        level = getattr(logging, self.log_min_level)
+        logging.limit_log('default', level, level)
 
     log_min_level: EnumProperty(
         name="Log Min Level",
-        description="Log minimum level",
+        description="Log minimum level, records with lower level are skipped in console and log file",
         items=(
             ('DEBUG', "Debug", "Show all log: Debug, Info, Warning, Error"),
             ('INFO', "Info", "Show log: Info, Warning, Error"),
@@ -406,6 +436,13 @@ class RPR_RenderProperties(RPR_Properties):
         min=1.0, default=1.0,
     )
 
+    # RENDER METRICS
+    save_render_metrics: BoolProperty(
+        name="Save Render Metrics",
+        description="Save render phases timings and scene statistics to JSON file next to render output",
+        default=False
+    )
+
     # RENDER EFFECTS
     use_render_stamp: BoolProperty(
         name="Render Stamp",
@@ -598,6 +635,30 @@ class RPR_RenderProperties(RPR_Properties):
         default=False,
     )
 
+    volume_grid_epsilon: FloatProperty(
+        name="Volume Grid Epsilon",
+        description="Smoke domain voxels with values not greater than this threshold are considered empty "
+                    "and aren't exported",
+        min=0.0, soft_max=0.1,
+        precision=5,
+        default=0.0,
+    )
+
+    vdb_prefetch_frames: IntProperty(
+        name="VDB Prefetch Frames",
+        description="Number of next frames of VDB sequences to read in background during animation render, "
+                    "0 to disable",
+        min=0, soft_max=10,
+        default=2,
+    )
+
+    vdb_prefetch_memory: IntProperty(
+        name="VDB Prefetch Memory (MB)",
+        description="Memory limit of prefetched VDB sequences grids",
+        min=0, soft_max=16384,
+        default=2048,
+    )
+
     motion_blur_in_velocity_aov: BoolProperty(
         name="Only in Velocity AOV",
         description="Apply Motion Blur in Velocity AOV only\nOnly for Full render quality",
@@ -174,6 +174,15 @@ class RPR_EnvironmentSunSky(bpy.types.PropertyGroup):
         default='1024',
     )
 
+    interpolation_step: FloatProperty(
+        name="Interpolation Step",
+        description="Altitude step of generated sky images, sky images for altitudes in between "
+                    "are interpolated. Speeds up animations of sun altitude or time of day, 0 to disable",
+        subtype='ANGLE',
+        min=0.0, soft_max=math.radians(5),
+        default=0.0,
+    )
+
 
 class RPR_EnvironmentIbl(bpy.types.PropertyGroup):
     color: FloatVectorProperty(
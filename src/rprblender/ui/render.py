@@ -19,6 +19,7 @@ from . import RPR_Panel
 from rprblender import bl_info
 from rprblender import utils
 from rprblender.utils.user_settings import get_user_settings
+from rprblender.utils import render_metrics
 
 
 class RPR_RENDER_PT_devices(RPR_Panel):
@@ -205,6 +206,11 @@ class RPR_RENDER_PT_viewport_limits(RPR_Panel):
         col1.prop(settings, 'viewport_samples_per_sec', slider=True)
         col1.prop(settings, 'min_viewport_resolution_scale', slider=True)
 
+        col.prop(settings, 'viewport_progressive_sync')
+        col1 = col.column()
+        col1.enabled = settings.viewport_progressive_sync
+        col1.prop(settings, 'viewport_progressive_sync_time')
+
         if rpr.viewport_render_mode == 'HYBRIDPRO':
             col1 = col.column()
             col1.enabled = rpr.viewport_upscale and rpr.viewport_denoiser
@@ -249,6 +255,20 @@ class RPR_RENDER_PT_settings(RPR_Panel):
         self.layout.use_property_split = True
         self.layout.use_property_decorate = False
 
+        rpr = context.scene.rpr
+
+        row = self.layout.row()
+        row.enabled = rpr.final_render_mode in ('FULL', 'FULL2')
+        row.prop(context.scene.render, 'use_persistent_data', text="Persistent Data")
+
+        self.layout.prop(rpr, 'volume_grid_epsilon')
+
+        col = self.layout.column(align=True)
+        col.prop(rpr, 'vdb_prefetch_frames')
+        row = col.row()
+        row.enabled = rpr.vdb_prefetch_frames > 0
+        row.prop(rpr, 'vdb_prefetch_memory')
+
 
 class RPR_RENDER_PT_max_ray_depth(RPR_Panel):
     bl_label = "Ray Depth"
@@ -398,6 +418,34 @@ class RPR_RENDER_PT_motion_blur(RPR_Panel):
         col.prop(context.scene.rpr, "motion_blur_in_velocity_aov")
 
 
+class RPR_RENDER_PT_render_metrics(RPR_Panel):
+    bl_label = "Render Metrics"
+    bl_context = 'render'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene.rpr, 'save_render_metrics', text="")
+
+    def draw(self, context):
+        layout = self.layout
+        metrics = render_metrics.last_metrics
+        if not metrics:
+            layout.label(text="No render metrics collected yet")
+            return
+
+        # metrics could be updated by render threads while panel is drawn
+        metrics_data = metrics.to_dict()
+
+        col = layout.column(align=True)
+        col.label(text=metrics_data['title'])
+        for line in render_metrics.report_lines(metrics_data):
+            col.label(text=line)
+
+        col = layout.column(align=True)
+        for name, value in metrics_data['counts'].items():
+            col.label(text=f"{name}: {value:,}")
+
+
 class RPR_RENDER_PT_film_transparency(RPR_Panel):
     bl_label = "Film"
     bl_options = {'DEFAULT_CLOSED'}
@@ -483,3 +531,10 @@ class RPR_RENDER_PT_debug(RPR_Panel):
         layout.row().prop(rpr, 'texture_cache_dir')
         layout.row().operator('rpr.op_clear_tex_cache', text='Clear Cache')
 
+        layout.prop(settings, 'use_preview_cache')
+        row = layout.row(align=True)
+        row.operator('rpr.op_update_material_previews')
+        row.operator('rpr.op_clear_preview_cache')
+
+        layout.prop(settings, 'use_sun_sky_disk_cache')
+
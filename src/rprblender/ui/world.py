@@ -65,6 +65,7 @@ class RPR_WORLD_PT_environment(RPR_Panel):
             col.prop(sun_sky, 'altitude')
 
             layout.prop(sun_sky, 'resolution')
+            layout.prop(sun_sky, 'interpolation_step')
 
         row = layout.row()
         row.prop(rpr, 'group')
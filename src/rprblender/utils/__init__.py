@@ -41,6 +41,14 @@ def core_cache_dir():
     return package_root_dir() / ".cache"
 
 
+def preview_cache_dir():
+    return package_root_dir() / ".preview_cache"
+
+
+def sun_sky_cache_dir():
+    return package_root_dir() / ".sun_sky_cache"
+
+
 def hipbin_dir():
     if IS_DEBUG_MODE:
         hipdir = package_root_dir().parent.parent / '.sdk/rpr/hipbin'
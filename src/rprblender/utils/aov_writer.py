@@ -0,0 +1,164 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Background writer of AOV images, encodes and writes files in separate threads while rendering continues
+"""
+import struct
+import queue
+import threading
+
+import numpy as np
+
+from rprblender.utils.logging import Log
+log = Log(tag='utils.aov_writer')
+
+
+# file formats which are encoded by AOVWriter, others are saved by core with FrameBuffer.save_to_file()
+WRITER_EXTENSIONS = ('bin', 'npy', 'npz', 'exr')
+
+EXR_MAGIC = 20000630
+EXR_PIXEL_TYPE_HALF = 1
+EXR_PIXEL_TYPE_FLOAT = 2
+
+
+def _exr_attribute(name, type_name, value: bytes):
+    return name.encode() + b'\0' + type_name.encode() + b'\0' + struct.pack('<i', len(value)) + value
+
+
+def save_exr(filepath, data: np.ndarray, use_half=False):
+    """ Saves (height, width, channels) image to uncompressed single part scanline OpenEXR file """
+    height, width, channels = data.shape
+    names = ('Y',) if channels == 1 else ('R', 'G', 'B', 'A')[:channels]
+    # channels are stored in alphabetical order of their names
+    order = sorted(range(channels), key=lambda i: names[i])
+    dtype = np.dtype('<f2' if use_half else '<f4')
+    pixel_type = EXR_PIXEL_TYPE_HALF if use_half else EXR_PIXEL_TYPE_FLOAT
+
+    channel_list = b''.join(names[i].encode() + b'\0' + struct.pack('<iB3xii', pixel_type, 0, 1, 1)
+                            for i in order) + b'\0'
+    window = struct.pack('<4i', 0, 0, width - 1, height - 1)
+    header = b''.join((
+        struct.pack('<ii', EXR_MAGIC, 2),
+        _exr_attribute('channels', 'chlist', channel_list),
+        _exr_attribute('compression', 'compression', b'\0'),
+        _exr_attribute('dataWindow', 'box2i', window),
+        _exr_attribute('displayWindow', 'box2i', window),
+        _exr_attribute('lineOrder', 'lineOrder', b'\0'),
+        _exr_attribute('pixelAspectRatio', 'float', struct.pack('<f', 1.0)),
+        _exr_attribute('screenWindowCenter', 'v2f', struct.pack('<2f', 0.0, 0.0)),
+        _exr_attribute('screenWindowWidth', 'float', struct.pack('<f', 1.0)),
+        b'\0',
+    ))
+
+    # every scanline block: y coordinate, pixel data size, then scanline of each channel
+    line_size = width * channels * dtype.itemsize
+    blocks = np.empty((height, 8 + line_size), dtype=np.uint8)
+    blocks[:, :4] = np.arange(height, dtype='<i4').view(np.uint8).reshape(height, 4)
+    blocks[:, 4:8] = np.full(height, line_size, dtype='<i4').view(np.uint8).reshape(height, 4)
+    blocks[:, 8:] = np.ascontiguousarray(data[:, :, order].transpose(0, 2, 1), dtype=dtype)\
+        .view(np.uint8).reshape(height, line_size)
+
+    offsets = len(header) + 8 * height + np.arange(height, dtype='<u8') * blocks.shape[1]
+
+    with open(filepath, 'wb') as f:
+        f.write(header)
+        f.write(offsets.tobytes())
+        f.write(blocks.tobytes())
+
+
+def save_image(filepath, data: np.ndarray, extension, use_half=False):
+    """ Saves image data to file of WRITER_EXTENSIONS format """
+    if extension == 'exr':
+        save_exr(filepath, data, use_half)
+        return
+
+    if use_half:
+        data = data.astype(np.float16)
+
+    if extension == 'bin':
+        data.tofile(filepath)
+    elif extension == 'npy':
+        np.save(filepath, data)
+    elif extension == 'npz':
+        np.savez_compressed(filepath, data=data)
+    else:
+        raise ValueError("Unsupported file format", extension)
+
+
+class AOVWriter:
+    """
+    Reads frame buffers to reusable buffers and saves them to files by pool of writer threads.
+    Queue of write tasks is bounded, so reading frame buffers waits for writers if they can't keep up
+    """
+
+    def __init__(self, workers_count=4, queue_size=8):
+        self.tasks = queue.Queue(maxsize=queue_size)
+        self.free_buffers = {}
+        self.lock = threading.Lock()
+        self.errors = []
+
+        self.workers = [threading.Thread(target=self._run, daemon=True) for _ in range(workers_count)]
+        for worker in self.workers:
+            worker.start()
+
+    def _get_buffer(self, shape):
+        with self.lock:
+            buffers = self.free_buffers.get(shape)
+            if buffers:
+                return buffers.pop()
+
+        return np.empty(shape, dtype=np.float32)
+
+    def _release_buffer(self, buf):
+        with self.lock:
+            self.free_buffers.setdefault(buf.shape, []).append(buf)
+
+    def write(self, frame_buffer, filepath, extension, channels, use_half=False):
+        """ Reads frame buffer data and puts its saving to queue, waits if queue is full """
+        buf = self._get_buffer((frame_buffer.height, frame_buffer.width, frame_buffer.channels))
+        frame_buffer.get_data(buf.ctypes.data)
+        self.tasks.put((buf, filepath, extension, channels, use_half))
+
+    def _run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                self.tasks.task_done()
+                return
+
+            buf, filepath, extension, channels, use_half = task
+            try:
+                save_image(filepath, buf[:, :, :channels], extension, use_half)
+                log(f"File saved {filepath}")
+
+            except Exception as e:
+                log.error("Unable to save file", filepath, e)
+                self.errors.append((filepath, e))
+
+            finally:
+                self._release_buffer(buf)
+                self.tasks.task_done()
+
+    def wait(self):
+        """ Waits until all queued files are saved """
+        self.tasks.join()
+
+    def stop(self):
+        """ Saves queued files and stops writer threads """
+        for _ in self.workers:
+            self.tasks.put(None)
+
+        for worker in self.workers:
+            worker.join()
@@ -13,6 +13,9 @@
 # limitations under the License.
 #********************************************************************
 import math
+import json
+
+import numpy as np
 
 
 def convert_kelvins_to_rgb_bartlett(color_temperature: float) -> tuple:
@@ -145,9 +148,127 @@ def murmurh3_32(key, seed=0x0):
     return unsigned_val
 
 
+def murmurh3_32_batch(keys, seed=0x0) -> np.array:
+    """
+    Vectorized version of murmurh3_32() for list of strings, returns uint32 array of hashes.
+    Keys are encoded to zero padded rows of 4 bytes blocks, every block column is hashed for all keys at once
+    """
+    keys = [key.encode() for key in keys]
+    if not keys:
+        return np.empty(0, dtype=np.uint32)
+
+    lengths = np.fromiter((len(key) for key in keys), dtype=np.uint32, count=len(keys))
+
+    # extra zero block is always added, so tail block of every key is inside the array
+    width = (int(lengths.max()) // 4 + 1) * 4
+    blocks = np.frombuffer(b''.join(key.ljust(width, b'\0') for key in keys), dtype='<u4').reshape(len(keys), -1)
+    nblocks = lengths // 4
+
+    c1 = np.uint32(0xcc9e2d51)
+    c2 = np.uint32(0x1b873593)
+
+    def rotl(x, r):
+        return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
+
+    def fmix(h):
+        h ^= h >> np.uint32(16)
+        h *= np.uint32(0x85ebca6b)
+        h ^= h >> np.uint32(13)
+        h *= np.uint32(0xc2b2ae35)
+        h ^= h >> np.uint32(16)
+        return h
+
+    h1 = np.full(len(keys), seed, dtype=np.uint32)
+
+    # body
+    for i in range(int(nblocks.max())):
+        k1 = rotl(blocks[:, i] * c1, 15) * c2
+        h1_block = rotl(h1 ^ k1, 13) * np.uint32(5) + np.uint32(0xe6546b64)
+        h1 = np.where(i < nblocks, h1_block, h1)
+
+    # tail, padding bytes are zero, so tail block is the same as tail bytes combination
+    k1 = rotl(blocks[np.arange(len(keys)), nblocks] * c1, 15) * c2
+    h1 = np.where(lengths & np.uint32(3), h1 ^ k1, h1)
+
+    unsigned_val = fmix(h1 ^ lengths)
+
+    # hash modified to match core results, same as in murmurh3_32()
+    exponent = (unsigned_val >> np.uint32(23)) & np.uint32(255)
+    return np.where(exponent == 0, unsigned_val ^ np.uint32(1 << 23), unsigned_val)
+
+
 def get_cryptomatte_name(name: str) -> str:
     return name.replace("(", "").replace(")", "").replace(", ", "_").replace("'", "")
 
 
+# name -> hash cache, names repeat every render and every animation frame.
+# Cache is cleared when it reaches CRYPTOMATTE_HASHES_MAX names
+cryptomatte_hashes = {}
+CRYPTOMATTE_HASHES_MAX = 100000
+
+
+def _limit_cryptomatte_hashes(new_names_count):
+    if len(cryptomatte_hashes) + new_names_count > CRYPTOMATTE_HASHES_MAX:
+        cryptomatte_hashes.clear()
+
+
 def get_cryptomatte_hash(name: str) -> str:
-    return "%08x" % murmurh3_32(str(name))
+    name = str(name)
+    name_hash = cryptomatte_hashes.get(name)
+    if name_hash is None:
+        name_hash = "%08x" % murmurh3_32(name)
+        _limit_cryptomatte_hashes(1)
+        cryptomatte_hashes[name] = name_hash
+
+    return name_hash
+
+
+def get_cryptomatte_hashes(names) -> list:
+    """ Return hashes for names, not cached names are hashed in one batch """
+    names = [str(name) for name in names]
+    hashes = {}
+    new_names = []
+    for name in dict.fromkeys(names):
+        name_hash = cryptomatte_hashes.get(name)
+        if name_hash is None:
+            new_names.append(name)
+        else:
+            hashes[name] = name_hash
+
+    if new_names:
+        new_hashes = dict(zip(new_names, ("%08x" % h for h in murmurh3_32_batch(new_names))))
+        _limit_cryptomatte_hashes(len(new_hashes))
+        cryptomatte_hashes.update(new_hashes)
+        hashes.update(new_hashes)
+
+    return [hashes[name] for name in names]
+
+
+class CryptomatteManifest:
+    """
+    Cryptomatte manifest of cryptomatte names to hashes, updated incrementally by keys of synced objects.
+    Manifest JSON is rebuilt only when keys are added or removed
+    """
+
+    def __init__(self):
+        self.entries = {}   # cryptomatte name -> JSON entry
+        self.json = "{}"
+
+    def update(self, keys):
+        names = {get_cryptomatte_name(key): key for key in (str(key) for key in keys)}
+
+        removed_names = self.entries.keys() - names.keys()
+        added_names = [name for name in names if name not in self.entries]
+        if not removed_names and not added_names:
+            return
+
+        for name in removed_names:
+            del self.entries[name]
+
+        for name, name_hash in zip(added_names, get_cryptomatte_hashes(names[name] for name in added_names)):
+            self.entries[name] = f"{json.dumps(name)}: {json.dumps(name_hash)}"
+
+        self.json = "{" + ", ".join(self.entries.values()) + "}"
+
+    def __len__(self):
+        return len(self.entries)
@@ -13,27 +13,83 @@
 # limitations under the License.
 #********************************************************************
 import sys
+import atexit
+import queue
 import logging
+import logging.handlers
 from logging import *
 
 from . import package_root_dir
 
 
-file = logging.FileHandler(filename=str(package_root_dir()/'rprblender.log'),  # TODO: Add creation time to this log name. Could be configurable.
-                           mode='w',
-                           encoding='utf-8')
+LOG_FILE_MAX_BYTES = 50 * 1024 ** 2
+LOG_FILE_BACKUP_COUNT = 2
+
+
+# file is written by background thread, records are passed to it through queue.
+# Rotating handler always appends to existing file, new log is started by rollover on first start of file log
+file = logging.handlers.RotatingFileHandler(
+    filename=str(package_root_dir()/'rprblender.log'),  # TODO: Add creation time to this log name. Could be configurable.
+    maxBytes=LOG_FILE_MAX_BYTES,
+    backupCount=LOG_FILE_BACKUP_COUNT,
+    encoding='utf-8',
+    delay=True)
 file.setFormatter(logging.Formatter('%(asctime)s %(name)s [%(thread)d]: %(levelname)s %(message)s'))
 
+file_queue = queue.SimpleQueue()
+file_listener = logging.handlers.QueueListener(file_queue, file)
+file_listener_started = False
+file_rolled_over = False
+
+
+def start_file_log():
+    """ Starts background thread writing log file, previous session log is kept as backup """
+    global file_listener_started, file_rolled_over
+    if file_listener_started:
+        return
+
+    if not file_rolled_over:
+        file_rolled_over = True
+        try:
+            file.doRollover()
+        except OSError:
+            # log file could be opened by other Blender instance on Windows, appending to it then
+            pass
+
+    file_listener.start()
+    file_listener_started = True
+
+
+def stop_file_log():
+    """ Writes queued records and stops background thread, log file is closed """
+    global file_listener_started
+    if not file_listener_started:
+        return
+
+    file_listener.stop()
+    file_listener_started = False
+    file.close()
+
+
+start_file_log()
+atexit.register(stop_file_log)
+
 
 console = logging.StreamHandler(stream=sys.stdout)
 logger = logging.getLogger('rpr')  # root logger for the addon
 logger.addHandler(console)
 console.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s [%(thread)d]:  %(message)s'))
 
-logging.basicConfig(level=logging.DEBUG, handlers=[file])
+# message is rendered in calling thread by queue handler, file handler adds the rest of record info
+queue_handler = logging.handlers.QueueHandler(file_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.DEBUG, handlers=[queue_handler])
 
 console_filter = None
 
+# records with lower level are dropped before message formatting
+min_level = logging.NOTSET
+
 
 class Filter(logging.Filter):
 
@@ -52,31 +108,57 @@ class Filter(logging.Filter):
 
 
 def is_level_allowed(levelno):
-    if not console_filter:
-        return True
-    if console_filter.level_show_min is not None:
-        if levelno < console_filter.level_show_min:
-            return False
-    return True
+    return levelno >= min_level
 
 
 def limit_log(name, level_show_always=logging.INFO, level_show_min=logging.DEBUG):
-    global console_filter
+    global console_filter, min_level
     if console_filter:
         console.removeFilter(console_filter)
         console_filter = None
+    min_level = logging.NOTSET
     if name is not None:
         console_filter = Filter('rpr.'+name, level_show_always, level_show_min)
         console.addFilter(console_filter)
+        if level_show_min is not None:
+            min_level = level_show_min
+
+    # addon logger drops records below min_level too, for direct calls of get_logger() loggers
+    logger.setLevel(min_level)
+
+    # records below min_level aren't written to log file too, noting it there
+    if min_level > logging.DEBUG:
+        queue_handler.handle(logging.makeLogRecord({
+            'name': logger.name, 'levelno': logging.INFO, 'levelname': logging.getLevelName(logging.INFO),
+            'msg': f"Log records below {logging.getLevelName(min_level)} level are skipped",
+        }))
+
+
+loggers = {}
 
 
 def get_logger(tag):
-    return logger.getChild(tag) if tag else logger
+    log_obj = loggers.get(tag)
+    if log_obj is None:
+        log_obj = logger.getChild(tag) if tag else logger
+        loggers[tag] = log_obj
+
+    return log_obj
+
+
+class LazyMessage:
+    """ Log message arguments joined to string only when record is formatted by handler """
+    __slots__ = ('args',)
+
+    def __init__(self, args):
+        self.args = args
+
+    def __str__(self):
+        return ' '.join(str(arg) for arg in self.args)
 
 
 def _log(log_fun, args):
-    msg = ' '.join(str(arg) for arg in args)
-    log_fun(msg)
+    log_fun(LazyMessage(args))
 
 
 def debug(*args, tag='default'):
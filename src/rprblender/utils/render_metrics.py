@@ -0,0 +1,131 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Render metrics: per phase timings and scene counts collected during final render
+"""
+import json
+import time
+import functools
+import threading
+import contextlib
+
+from rprblender.utils.logging import Log
+log = Log(tag='utils.render_metrics')
+
+
+# phases in order of showing in report and UI panel
+PHASES = ('context_init', 'object', 'instance', 'material', 'image', 'volume', 'hair',
+          'render_batch', 'resolve', 'filter', 'update_render_result')
+
+# collector of scene synced by current thread, export functions decorated with timed() report to it.
+# It is thread local, so viewport sync in other thread isn't counted in final render metrics
+_local = threading.local()
+
+# metrics of last final render, they are shown in UI panel
+last_metrics = None
+
+
+class RenderMetrics:
+    """
+    Collects time and calls count of render phases and scene counts.
+    Time of nested phases is excluded from outer phase, e.g. material export time isn't counted in object export
+    """
+
+    def __init__(self, title=""):
+        self.title = title
+        self.timings = {}   # phase: [time, calls]
+        self.counts = {}
+
+        # phases could be measured from several threads, e.g. resolve thread of RenderEngine2
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    @contextlib.contextmanager
+    def measure(self, phase):
+        stack = getattr(self.local, 'stack', None)     # [begin time, nested phases time]
+        if stack is None:
+            stack = self.local.stack = []
+
+        entry = [time.perf_counter(), 0.0]
+        stack.append(entry)
+        try:
+            yield
+
+        finally:
+            stack.pop()
+            duration = time.perf_counter() - entry[0]
+            if stack:
+                stack[-1][1] += duration
+
+            with self.lock:
+                timing = self.timings.setdefault(phase, [0.0, 0])
+                timing[0] += duration - entry[1]
+                timing[1] += 1
+
+    def set(self, name, value):
+        with self.lock:
+            self.counts[name] = value
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'title': self.title,
+                'timings': {phase: {'time': t, 'calls': calls} for phase, (t, calls) in self.timings.items()},
+                'counts': dict(self.counts),
+            }
+
+    def save(self, filepath):
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+        log.info("Render metrics saved to", filepath)
+
+    def report(self):
+        """ Return report lines of phase timings in PHASES order """
+        return report_lines(self.to_dict())
+
+
+def report_lines(metrics_data):
+    """ Return report lines of phase timings in PHASES order from RenderMetrics.to_dict() data """
+    timings = metrics_data['timings']
+    phases = sorted(timings, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES))
+    return [f"{phase}: {timings[phase]['time']:.3f} sec, {timings[phase]['calls']} calls"
+            for phase in phases]
+
+
+def set_active(metrics):
+    """ Sets metrics collector of current thread, None stops collecting """
+    global last_metrics
+
+    _local.metrics = metrics
+    if metrics:
+        last_metrics = metrics
+
+
+def timed(phase):
+    """ Decorator, measures function time as phase of active metrics, does nothing if no metrics are collected """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = getattr(_local, 'metrics', None)
+            if not metrics:
+                return func(*args, **kwargs)
+
+            with metrics.measure(phase):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,52 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Tests of cryptomatte hashes cache, rprblender.utils.conversion is loaded by file path
+as rprblender package requires Blender
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def conversion():
+    path = Path(__file__).parent.parent/'src/rprblender/utils/conversion.py'
+    spec = importlib.util.spec_from_file_location('rpr_conversion', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_hashes_match_single_hash(conversion):
+    names = ["Cube", "Sphere", "Cube", ("Plane", 1)]
+    assert conversion.get_cryptomatte_hashes(names) == \
+        [conversion.get_cryptomatte_hash(name) for name in names]
+
+
+def test_hashes_with_full_cache(conversion):
+    conversion.CRYPTOMATTE_HASHES_MAX = 4
+    cached_names = [f"Object{i}" for i in range(conversion.CRYPTOMATTE_HASHES_MAX)]
+    cached_hashes = conversion.get_cryptomatte_hashes(cached_names)
+    assert len(conversion.cryptomatte_hashes) == conversion.CRYPTOMATTE_HASHES_MAX
+
+    names = cached_names[:2] + ["New0", "New1"] + cached_names[:1]
+    hashes = conversion.get_cryptomatte_hashes(names)
+
+    assert hashes[:2] == cached_hashes[:2]
+    assert hashes[4] == cached_hashes[0]
+    assert hashes[2:4] == ["%08x" % conversion.murmurh3_32(name) for name in names[2:4]]
+    assert len(conversion.cryptomatte_hashes) <= conversion.CRYPTOMATTE_HASHES_MAX